@@ -0,0 +1,90 @@
+"""
+Compare the XML backends on a large synthetic course file, see
+'generate_course.py'.
+
+Usage (from any directory):
+    python benchmarks/bench_backends.py [exercises] [repeats]
+"""
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"
+))
+
+from generate_course import build_course  # noqa: E402
+
+import task_manager.parser as tp  # noqa: E402
+import task_manager.writer as tw  # noqa: E402
+from task_manager.lessons import LESSONS_ENV  # noqa: E402
+from task_manager.tasknames import get_all_tasks  # noqa: E402
+from task_manager.attributes import (  # noqa: E402
+    collect_data, replace_values, update_all
+)
+
+
+def run_parse(source: str, backend: str) -> float:
+    """
+    Return the time of parsing the source file on the given backend.
+    """
+    start = time.perf_counter()
+    tp.get_xml_root(source, backend)
+    return time.perf_counter() - start
+
+
+def run_pipeline(source: str, output: str, backend: str) -> float:
+    """
+    Return the time of the whole attribute pipeline on the given backend.
+    """
+    start = time.perf_counter()
+    tree = tp.get_xml_root(source, backend)
+    exercises = get_all_tasks(tree.getroot(), "exercise")
+    update_all(exercises, replace_values(collect_data(exercises)))
+    tw.write_tree(tree, output)
+    return time.perf_counter() - start
+
+
+def main(count: int, repeats: int) -> None:
+    backends = ["stdlib"] + (["lxml"] if tp.LXML_AVAILABLE else [])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        course = build_course(tmp, count)
+        source = course.source
+        os.environ[LESSONS_ENV] = course.lessons
+        print(f"{count} exercises, {os.path.getsize(source)} bytes")
+
+        outputs, parsing, results = {}, {}, {}
+        for backend in backends:
+            outputs[backend] = os.path.join(tmp, f"output_{backend}.xml")
+            parsing[backend] = min(
+                run_parse(source, backend) for _ in range(repeats)
+            )
+            results[backend] = min(
+                run_pipeline(source, outputs[backend], backend)
+                for _ in range(repeats)
+            )
+            print(
+                f"{backend:>8}: parse {parsing[backend]:.3f} s, "
+                f"pipeline {results[backend]:.3f} s"
+            )
+
+        if "lxml" in results:
+            with open(outputs["stdlib"], "rb") as std, \
+                    open(outputs["lxml"], "rb") as lxm:
+                identical = std.read() == lxm.read()
+            print(f"identical output: {identical}")
+            print(
+                f" speedup: parse {parsing['stdlib'] / parsing['lxml']:.2f}x, "
+                f"pipeline {results['stdlib'] / results['lxml']:.2f}x"
+            )
+        else:
+            print("lxml is not installed, only the stdlib backend was run")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 10000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    )
@@ -0,0 +1,101 @@
+"""
+Measure the throughput and the filesystem calls of 'task_content_processor'
+on synthetic repositories, see 'generate_repo.py'.
+
+Usage (from the root of the repository):
+    PYTHONPATH=src python benchmarks/bench_cleaner.py [tasks] [repeats]
+
+The numbers of tasks per lesson are separated by commas, the default is
+20,100,500.
+"""
+import os
+import sys
+import time
+import tempfile
+import collections
+from typing import Any, Counter, List, Tuple
+
+from generate_repo import build_repo
+
+from task_manager.lessons import LESSONS_ENV
+from task_manager.processor import task_content_processor
+
+
+CALLS: Counter[str] = collections.Counter()
+COUNTING = False
+
+
+def audit(event: str, args: Tuple[Any, ...]) -> None:
+    """
+    Count the audited filesystem events while the counting is on.
+    """
+    if COUNTING and (event == "open" or event.startswith(("os.", "shutil."))):
+        CALLS[event] += 1
+
+
+def count_stat(stat: Any) -> Any:
+    """
+    Return the 'os.stat' that is counted too, it has no audit event.
+    """
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        if COUNTING:
+            CALLS["os.stat"] += 1
+        return stat(*args, **kwargs)
+
+    return wrapper
+
+
+def run_cleaner(directory: str, tasks: int) -> Tuple[float, Counter[str]]:
+    """
+    Return the time and the filesystem calls of processing the first lesson
+    of a freshly generated repository.
+    """
+    global COUNTING
+
+    repo = build_repo(directory, tasks)
+    os.environ[LESSONS_ENV] = repo.lessons
+    cwd = os.getcwd()
+    os.chdir(repo.engeto)
+    CALLS.clear()
+
+    try:
+        COUNTING = True
+        start = time.perf_counter()
+        task_content_processor(repo.engeto, "lesson01")
+        elapsed = time.perf_counter() - start
+    finally:
+        COUNTING = False
+        os.chdir(cwd)
+
+    return elapsed, collections.Counter(CALLS)
+
+
+def main(sizes: List[int], repeats: int) -> None:
+    sys.addaudithook(audit)
+    os.stat = count_stat(os.stat)  # type: ignore
+
+    for size in sizes:
+        results = []
+        for _ in range(repeats):
+            with tempfile.TemporaryDirectory() as tmp:
+                results.append(run_cleaner(tmp, size))
+
+        best, calls = min(results, key=lambda result: result[0])
+        print(
+            f"{size:>5} tasks/lesson: {best * 1000:8.1f}ms, "
+            f"{size / best:8.0f} tasks/s, {sum(calls.values())} calls"
+        )
+        for event, count in calls.most_common():
+            print(f"{'':>8}{event:<20} {count:>8}")
+
+
+if __name__ == "__main__":
+    main(
+        [
+            int(size)
+            for size in (
+                sys.argv[1] if len(sys.argv) > 1 else "20,100,500"
+            ).split(",")
+        ],
+        int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    )
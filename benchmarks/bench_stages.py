@@ -0,0 +1,139 @@
+"""
+Time and memory-profile every stage of the pipelines and both processors on
+synthetic courses, see 'generate_course.py'.
+
+Usage (from the root of the repository):
+    PYTHONPATH=src python benchmarks/bench_stages.py [sizes] [repeats]
+
+The sizes are separated by commas, the default is 100,1000,10000 (100000
+takes a few minutes).
+"""
+import os
+import sys
+import time
+import tempfile
+import functools
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+from generate_course import build_course
+
+from task_manager.lessons import LESSONS_ENV
+from task_manager.parser import get_xml_root
+from task_manager.tasknames import get_all_tasks, get_task_names
+from task_manager.tasknames import create_task_data
+from task_manager.attributes import collect_data, replace_values, update_all
+from task_manager.description import replace_descriptions
+from task_manager.processor import task_desc_processor, task_attr_processor
+
+
+def measure(
+        setup: Callable[[], Tuple[Any, ...]],
+        stage: Callable[..., Any],
+        repeats: int
+        ) -> Tuple[float, int]:
+    """
+    Return the best time of the stage and its peak of the allocated memory.
+    The 'setup' prepares fresh arguments for every run, it is not measured.
+    """
+    best = float("inf")
+
+    for _ in range(repeats):
+        args = setup()
+        start = time.perf_counter()
+        stage(*args)
+        best = min(best, time.perf_counter() - start)
+
+    args = setup()
+    tracemalloc.start()
+    stage(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return best, peak
+
+
+def get_stages(
+        source: str, package: str, directory: str
+        ) -> Dict[str, Tuple[Callable[[], Tuple[Any, ...]], Callable]]:
+    """
+    Return the setup and the stage functions of the benchmark by name. The
+    outputs are written into the given directory.
+    """
+    output = os.path.join(directory, "output_desc.xml")
+
+    def parsed() -> Tuple[Any, ...]:
+        tree = get_xml_root(source)
+        return tree, get_all_tasks(tree.getroot(), "exercise")
+
+    def described() -> Tuple[Any, ...]:
+        tree, exercises = parsed()
+        task_data = create_task_data(get_task_names(
+            tree.getroot(), "solution", "sourceDir", "exercises/"
+        ))
+        return tree, task_data, exercises, package
+
+    def replaced() -> Tuple[Any, ...]:
+        _, exercises = parsed()
+        return exercises, replace_values(collect_data(exercises))
+
+    return {
+        "get_xml_root": (lambda: (source,), get_xml_root),
+        "get_all_tasks": (
+            lambda: (parsed()[0].getroot(), "exercise"), get_all_tasks
+        ),
+        "get_task_names": (
+            lambda: (
+                parsed()[0].getroot(), "solution", "sourceDir", "exercises/"
+            ),
+            get_task_names
+        ),
+        "collect_data": (lambda: (parsed()[1],), collect_data),
+        "replace_values": (
+            lambda: (collect_data(parsed()[1]),), replace_values
+        ),
+        "update_all": (replaced, update_all),
+        "replace_descriptions": (
+            described, functools.partial(replace_descriptions, output=output)
+        ),
+        "task_desc_processor": (
+            lambda: (os.path.dirname(source), package),
+            functools.partial(task_desc_processor, output=output)
+        ),
+        "task_attr_processor": (
+            lambda: (output,),
+            functools.partial(
+                task_attr_processor,
+                output=os.path.join(directory, "output_attr.xml")
+            )
+        ),
+    }
+
+
+def main(sizes: List[int], repeats: int) -> None:
+    print(f"{'exercises':>9}  {'stage':<22} {'time':>10} {'peak':>10}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            course = build_course(os.path.join(tmp, str(size)), size)
+            os.environ[LESSONS_ENV] = course.lessons
+
+            stages = get_stages(course.source, course.package, tmp)
+            for name, (setup, stage) in stages.items():
+                best, peak = measure(setup, stage, repeats)
+                print(
+                    f"{size:>9}  {name:<22} {best * 1000:>8.1f}ms "
+                    f"{peak / 1024 / 1024:>8.1f}MB"
+                )
+
+
+if __name__ == "__main__":
+    main(
+        [
+            int(size)
+            for size in (
+                sys.argv[1] if len(sys.argv) > 1 else "100,1000,10000"
+            ).split(",")
+        ],
+        int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    )
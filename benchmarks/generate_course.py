@@ -0,0 +1,198 @@
+"""
+Generate a realistic synthetic course: the course XML file, the tasks
+package with README files and the lesson mapping for the renamed tasks.
+
+Usage (from the root of the repository):
+    PYTHONPATH=src python benchmarks/generate_course.py <directory> [exercises]
+"""
+import os
+import sys
+import json
+import random
+from typing import NamedTuple
+from xml.sax.saxutils import quoteattr
+
+
+LESSONS = [f"L{number:02}" for number in range(1, 13)]
+
+PEREX = """
+  Už nebudeš muset v hlavě kalkulovat převody jednotek č. {number}.
+  Napiš si na to program!
+"""
+
+DESCRIPTION = """Cílem této úlohy bude vytvořit **převaděč** č. {number}.
+
+  1. Na začátek máš předepsané **převodní poměry** k jednotkám.
+  2. Vytvoř proměnné `kg_pocet`, `km_pocet` a `l_pocet`.
+  3. Nakonec výsledky přehledně vypiš.
+"""
+
+SOLUTION = """1. Na začátek máš předepsané **převodní poměry** k jednotkám.
+  ```python
+  kg_lb = 2.20
+  km_mile = 0.62
+  ```
+
+  <br>
+
+  2. Výsledky přehledně vypiš.
+  ```python
+  print(f"{{kg_pocet}} kg je {{kg_pocet * kg_lb}} lb")  # {number}
+  ```
+"""
+
+README = """# Úloha {number}
+
+Zadání je v repozitáři kurzu.
+
+---
+```python
+# ukázka {number}
+```
+
+Vytvoř program, který převede jednotky v úloze č. {number}.
+{body}
+---
+
+Řešení najdeš ve složce `solution`.
+"""
+
+
+class SyntheticCourse(NamedTuple):
+    """
+    Paths of the generated course.
+    """
+    engeto: str
+    source: str
+    package: str
+    lessons: str
+
+
+def build_course(
+        directory: str, count: int, seed: int = 0, readme_lines: int = 20
+        ) -> SyntheticCourse:
+    """
+    Write the course with the given number of exercises into the directory.
+
+    The exercises are spread over the lessons L01-L12 in chapters of ten.
+    Every exercise has the CDATA perex, description and solution, three of
+    four tasks are renamed in the lesson mapping and have their README file
+    in the package, the rest keeps the original name.
+
+    :param directory: a folder for the generated files.
+    :type directory: str
+    :param count: a number of exercises.
+    :type count: int
+    :param seed: a seed of the random generator.
+    :type seed: int
+    :param readme_lines: an average number of lines in the README body.
+    :type readme_lines: int
+    :return: paths of the repository, the XML file, the package and the
+        lesson mapping (see the variable 'TASK_MANAGER_LESSONS').
+    :rtype: SyntheticCourse
+    """
+    generator = random.Random(seed)
+    engeto = os.path.join(directory, "engeto")
+    package = os.path.join(directory, "package")
+    course = SyntheticCourse(
+        engeto, os.path.join(engeto, "course_engeto.xml"), package,
+        os.path.join(directory, "lessons.json")
+    )
+    folders = {code: f"lesson{code[1:]}" for code in LESSONS}
+    tasks: dict = {folder: {} for folder in folders.values()}
+    os.makedirs(engeto, exist_ok=True)
+
+    with open(course.source, "w", encoding="utf-8") as out:
+        out.write('<?xml version="1.0" encoding="UTF-8"?>\n<course>\n')
+
+        for position, code in enumerate(LESSONS):
+            numbers = range(
+                position * count // len(LESSONS),
+                (position + 1) * count // len(LESSONS)
+            )
+            out.write("  <lesson>\n")
+
+            for number in numbers:
+                if (number - numbers.start) % 10 == 0:
+                    if number != numbers.start:
+                        out.write("    </chapter>\n")
+                    out.write("    <chapter>\n")
+
+                if generator.random() < 0.75:
+                    tasks[folders[code]][f"task_{number}"] = f"uloha_{number}"
+                    write_readme(
+                        os.path.join(
+                            package, "tasks", folders[code], f"uloha_{number}"
+                        ),
+                        number, generator.randrange(1, 2 * readme_lines)
+                    )
+                out.write(
+                    format_exercise(code, f"task_{number}", number, generator)
+                )
+
+            out.write("    </chapter>\n  </lesson>\n" if numbers else
+                      "  </lesson>\n")
+        out.write("</course>\n")
+
+    with open(course.lessons, "w", encoding="utf-8") as out:
+        json.dump(
+            {"format": 1, "lessons": folders, "tasks": tasks}, out,
+            ensure_ascii=False
+        )
+
+    return course
+
+
+def format_exercise(
+        code: str, name: str, number: int, generator: random.Random
+        ) -> str:
+    """
+    Return the exercise element with all its children as a string.
+    """
+    path = f"exercises/{code}/{name}"
+    attrs = {
+        "uuid": f"{generator.getrandbits(128):032x}",
+        "name": f"Úloha {number}",
+        "difficulty": str(generator.randrange(1, 4)),
+        "timeEstimate": str(generator.randrange(5, 60, 5)),
+        "type": "programming",
+        "language": "python3"
+    }
+    return (
+        "      <exercise"
+        + "".join(f" {key}={quoteattr(value)}" for key, value in attrs.items())
+        + ">\n"
+        f"        <perex><![CDATA[{PEREX.format(number=number)}]]></perex>\n"
+        f'        <skeleton sourceDir="{path}/skeleton"/>\n'
+        f'        <unit-tests src="{path}/tests.py"/>\n'
+        f'        <description sourceDir="{path}/skeleton"><![CDATA['
+        f"{DESCRIPTION.format(number=number)}]]></description>\n"
+        f'        <solution sourceDir="{path}/solution"><![CDATA['
+        f"{SOLUTION.format(number=number)}]]></solution>\n"
+        "      </exercise>\n"
+    )
+
+
+def write_readme(folder: str, number: int, lines: int) -> None:
+    """
+    Write the README file of the task with the given number of body lines.
+    """
+    os.makedirs(folder, exist_ok=True)
+    body = "\n".join(
+        f"- krok {line}: `hodnota_{line} = {line * number}`"
+        if line % 5 else "\n```python\nprint('ahoj')\n```"
+        for line in range(lines)
+    )
+
+    with open(
+        os.path.join(folder, "README.md"), "w", encoding="utf-8"
+    ) as out:
+        out.write(README.format(number=number, body=body))
+
+
+if __name__ == "__main__":
+    result = build_course(
+        sys.argv[1], int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    )
+    print(f"export TASK_MANAGER_LESSONS={result.lessons}")
+    print(f"source: {result.source}, package: {result.package}")
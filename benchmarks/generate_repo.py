@@ -0,0 +1,136 @@
+"""
+Generate a synthetic engeto repository with the 'exercises' folder and the
+matching tasks package for the benchmarks of the cleaner.
+
+Usage (from the root of the repository):
+    PYTHONPATH=src python benchmarks/generate_repo.py <directory> [tasks]
+"""
+import os
+import sys
+import json
+from typing import NamedTuple
+
+
+LESSONS = [f"L{number:02}" for number in range(1, 13)]
+
+
+class SyntheticRepo(NamedTuple):
+    """
+    Paths of the generated repository and package.
+    """
+    engeto: str
+    package: str
+    lessons: str
+
+
+def build_repo(
+        directory: str,
+        tasks: int = 20,
+        files: int = 3,
+        missing: int = 2,
+        lessons: int = len(LESSONS)
+        ) -> SyntheticRepo:
+    """
+    Write the repository 'engeto/exercises/Lxx/<task>/{solution,skeleton}'
+    and the package 'engeto_tasks/tasks/lessonNN/<task>' into the directory.
+
+    Every task of the repository is renamed in the lesson mapping. The
+    package has the renamed tasks with their solution, tests, README and
+    the given number of other files, plus 'missing' tasks that are not in
+    the repository yet. The repository has the same number of files in the
+    'solution' and 'skeleton' folders of every task.
+
+    :param directory: a folder for the generated files.
+    :type directory: str
+    :param tasks: a number of tasks in every lesson.
+    :type tasks: int
+    :param files: a number of other files in every task folder.
+    :type files: int
+    :param missing: a number of package tasks without the repository task.
+    :type missing: int
+    :param lessons: a number of lessons.
+    :type lessons: int
+    :return: paths of the repository, the package with the 'tasks' folder
+        and the lesson mapping (see the variable 'TASK_MANAGER_LESSONS').
+    :rtype: SyntheticRepo
+    """
+    repo = SyntheticRepo(
+        os.path.join(directory, "engeto"),
+        os.path.join(directory, "engeto_tasks"),
+        os.path.join(directory, "lessons.json")
+    )
+    folders = {code: f"lesson{code[1:]}" for code in LESSONS[:lessons]}
+    mapping: dict = {folder: {} for folder in folders.values()}
+
+    for code, folder in folders.items():
+        lesson = os.path.join(repo.package, "tasks", folder)
+        write_file(os.path.join(lesson, "__init__.py"), "")
+
+        for number in range(tasks + missing):
+            name = f"uloha_{code}_{number}"
+            write_task(os.path.join(lesson, name), name, files)
+
+            if number < tasks:
+                mapping[folder][f"task_{number}"] = name
+                write_exercise(
+                    os.path.join(
+                        repo.engeto, "exercises", code, f"task_{number}"
+                    ),
+                    files
+                )
+
+    with open(repo.lessons, "w", encoding="utf-8") as out:
+        json.dump({"format": 1, "lessons": folders, "tasks": mapping}, out)
+
+    return repo
+
+
+def write_exercise(folder: str, files: int) -> None:
+    """
+    Write the task folder of the repository.
+    """
+    write_file(os.path.join(folder, "tests.py"), "import unittest\n")
+
+    for subfolder in "solution", "skeleton":
+        write_file(
+            os.path.join(folder, subfolder, "main.py"), "print('hello')\n"
+        )
+        for number in range(files):
+            write_file(
+                os.path.join(folder, subfolder, f"data_{number}.txt"),
+                "data\n" * 20
+            )
+
+
+def write_task(folder: str, name: str, files: int) -> None:
+    """
+    Write the task folder of the package.
+    """
+    write_file(os.path.join(folder, f"{name}.py"), "print('ahoj')\n" * 10)
+    write_file(
+        os.path.join(folder, f"test_{name}.py"), "def test():\n    pass\n"
+    )
+    write_file(
+        os.path.join(folder, "README.md"), f"# {name}\n---\ntext\n---\n"
+    )
+
+    for number in range(files):
+        write_file(os.path.join(folder, f"data_{number}.txt"), "data\n" * 20)
+
+
+def write_file(path: str, content: str) -> None:
+    """
+    Write the file, the missing folders are created.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    with open(path, "w", encoding="utf-8") as out:
+        out.write(content)
+
+
+if __name__ == "__main__":
+    result = build_repo(
+        sys.argv[1], int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    )
+    print(f"export TASK_MANAGER_LESSONS={result.lessons}")
+    print(f"repository: {result.engeto}, package: {result.package}")
@@ -1,14 +1,18 @@
 import xml.etree.ElementTree
-from typing import List, Dict, Union
+from typing import List, Dict, Optional, Tuple, Union
 
-import task_manager.utils as tu
-from task_manager.description import load_lesson_tasks
+from task_manager.index import ExerciseIndex, index_exercise
+from task_manager.instrument import stage
+from task_manager.lessons import get_table
+from task_manager.writer import Sink, write_tree
 
 
 def replace_attributes(
         tree: xml.etree.ElementTree.ElementTree,
         exercises: List[xml.etree.ElementTree.Element],
-        new_path: Dict[str, Dict[str, str]]
+        new_path: Dict[str, Dict[str, str]],
+        index: Optional[ExerciseIndex] = None,
+        output: Sink = "output_attr.xml"
         ) -> None:
     """
     Replace attributes in the given exercise elements.
@@ -19,22 +23,32 @@ def replace_attributes(
     :type exercises: list
     :param new_path: an updated value of relative path.
     :type new_path: str
+    :param index: an index of the exercises, see 'index.build_index'.
+    :type index: ExerciseIndex
+    :param output: a path, a file descriptor or a file object for the tree.
+    :type output: str, os.PathLike, int or file object
     """
-    update_all(exercises, new_path)
-    tree.write("output_attr.xml", encoding="utf-8")
+    with stage("attributes.rewrite", len(exercises)):
+        update_all(exercises, new_path, index)
+    write_tree(tree, output)
 
 
 def update_all(
         exercises: List[xml.etree.ElementTree.Element],
-        new_path: Dict[str, Dict[str, str]]
+        new_path: Dict[str, Dict[str, str]],
+        index: Optional[ExerciseIndex] = None
 ) -> None:
     """
     In the list of exercises, update the specific attribute with new value.
+    If the index is given, its entries are updated instead of the list, the
+    children are then taken from the index without searching the tree.
 
     :param exercises: a sequence of exercises from the XML source.
     :type exercises: list
     :param new_path: an updated value of relative path.
     :type new_path: str
+    :param index: an index of the exercises, see 'index.build_index'.
+    :type index: ExerciseIndex
 
     :Example:
     >>> import xml.etree.ElementTree as te
@@ -56,18 +70,47 @@ def update_all(
     >>> exercises[1].find("skeleton").attrib["sourceDir"]
     'exercises/L01/spojovani_stringu/skeleton'
     """
-    for exercise in exercises:
+    entries = index.entries if index else map(index_exercise, exercises)
+
+    for exercise, table in entries:
         update_exercise(
             exercise, new_path[exercise.attrib["name"]],  # type: ignore
-            "sourceDir", "skeleton", "unit-tests", "description", "solution"
+            "sourceDir", "skeleton", "unit-tests", "description", "solution",
+            table=table
         )
 
 
+def rewrite_exercise(exercise: xml.etree.ElementTree.Element) -> None:
+    """
+    Replace the relative paths in a single 'exercise' tag. It is the handler
+    for the streaming mode of the attribute processor.
+
+    :param exercise: an object that represents specific task element.
+    :type exercise: xml.etree.ElementTree.Element
+
+    :Example:
+    >>> import xml.etree.ElementTree as te
+    >>> tree = te.parse("src/tests/bar.xml")
+    >>> exercises = [exercise for exercise in tree.getroot().iter("exercise")]
+    >>> rewrite_exercise(exercises[0])
+    >>> exercises[0].find("skeleton").attrib["sourceDir"]
+    'exercises/L01/rozdeleni_stringu/skeleton'
+    """
+    name = exercise.attrib.get("name", "nan_name")
+    new_path = replace_values({name: collect_task_data(exercise)})
+    update_exercise(
+        exercise, new_path[name],
+        "sourceDir", "skeleton", "unit-tests", "description", "solution",
+        table=index_exercise(exercise).children
+    )
+
+
 def update_exercise(
         exercise: xml.etree.ElementTree.Element,
         new_path: Dict[str, str],
         attr_name: str,
-        *children
+        *children,
+        table: Optional[Dict[str, xml.etree.ElementTree.Element]] = None
         ) -> None:
     """
     Update all the attribute values in a single 'exercise' tag.
@@ -80,6 +123,9 @@ def update_exercise(
     :type attr_name: str
     :param children: a sequence of children elements.
     :type children: tuple
+    :param table: the children of the exercise by their tags, see
+        'index.index_exercise'. Without it the children are searched.
+    :type table: dict
 
     :Example:
     >>> import xml.etree.ElementTree as te
@@ -105,14 +151,13 @@ def update_exercise(
     'nan_sourceDir'
     """
     for child in children:
+        element = table.get(child) if table is not None \
+            else exercise.find(child)
+
         if child == "unit-tests":
-            update_attribute(
-                exercise.find(child), "src", new_path.get(child)
-            )
+            update_attribute(element, "src", new_path.get(child))
         else:
-            update_attribute(
-                exercise.find(child), attr_name, new_path.get(child)
-            )
+            update_attribute(element, attr_name, new_path.get(child))
 
 
 def update_attribute(
@@ -146,7 +191,8 @@ def update_attribute(
     except BaseException:
         output = "Cannot find the element"
     else:
-        output = task_element.attrib[attr_name] if task_element else ""
+        output = task_element.attrib[attr_name] \
+            if task_element is not None else ""
     finally:
         return output
 
@@ -222,7 +268,6 @@ def replace_values(
     :rtype: dict
 
     :Example:
-    >>> from task_manager.utils import lesson01
     >>> out = {'Rozdělení stringu': {'perex': 'nan_sourceDir',
     ...     'description': 'exercises/L01/rozdeleni_stringu/skeleton'},
     ...     'Spojování stringů': {'perex': 'nan_sourceDir',
@@ -231,18 +276,70 @@ def replace_values(
     >>> replace_values(out)['Rozdělení stringu']['description']
     'exericses/L01/rozdeleni_stringu/skeleton'
     """
-    for key_out, value in data.items():
-        for key_in, val in value.items():
+    names = get_table().names
+    cache: Dict[str, str] = {}
+
+    for value in data.values():
+        for key, val in value.items():
             if val != "nan_sourceDir":
-                root, lesson, name, subdir = val.split("/")
-                updated = load_lesson_tasks(
-                    tu.lessons.get(lesson, "nan_lesson")
-                ).get(name, "nan_name")
-
-                if updated == "nan_name":
-                    continue
-                data[key_out][key_in] = "/".join(
-                    (root, lesson, updated, subdir)
-                )
+                value[key] = rewrite_path(val, names, cache)
+
     return data
 
+
+def rewrite_path(
+        path: str,
+        names: Dict[Tuple[str, str], str],
+        cache: Dict[str, str]
+        ) -> str:
+    """
+    Return the path with the current name of the task. The task is the third
+    segment of the path, the paths with fewer segments and the unknown tasks
+    are returned unchanged.
+
+    :param path: a relative path, e.g. 'exercises/<lesson>/<task>/skeleton'.
+    :type path: str
+    :param names: the current task names by the lessons and the old names,
+        see 'lessons.LessonTable'.
+    :type names: dict
+    :param cache: the rewritten parent folders of the paths, it is shared
+        by all the paths of the course.
+    :type cache: dict
+    :return: an updated path.
+    :rtype: str
+
+    :Example:
+    >>> names = {("L01", "slicing_string"): "rozdeleni_stringu"}
+    >>> cache = {}
+    >>> rewrite_path("exercises/L01/slicing_string/tests.py", names, cache)
+    'exercises/L01/rozdeleni_stringu/tests.py'
+    >>> rewrite_path("exercises/L01/slicing_string/solution/a.py", names, cache)
+    'exercises/L01/rozdeleni_stringu/solution/a.py'
+    >>> rewrite_path("exercises/L01/slicing_string", names, cache)
+    'exercises/L01/rozdeleni_stringu'
+    >>> rewrite_path("exercises/L01", names, cache)
+    'exercises/L01'
+    """
+    parent, _, last = path.rpartition("/")
+    updated = cache.get(parent)
+
+    if updated is None:
+        parts = path.split("/", 3)
+
+        if len(parts) < 3:
+            return path
+
+        name = names.get((parts[1], parts[2]))
+
+        if name is not None:
+            parts[2] = name
+
+        if len(parts) == 3:
+            return "/".join(parts)
+
+        folder = parts[3].rpartition("/")[0]
+        updated = "/".join(parts[:3] + [folder] if folder else parts[:3])
+        cache[parent] = updated
+
+    return f"{updated}/{last}"
+
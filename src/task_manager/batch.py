@@ -0,0 +1,181 @@
+import os
+import time
+import logging
+import traceback
+import concurrent.futures
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from task_manager.instrument import add_events, capture, get_state, stage
+from task_manager.processor import task_desc_processor, task_attr_processor
+
+
+class CourseResult(NamedTuple):
+    """
+    A result of the description and the attribute pipelines of one course.
+    The 'events' are the spans recorded in the worker while tracing, see
+    'instrument.tracing'.
+    """
+    course: str
+    output: str
+    error: Optional[str]
+    timings: Dict[str, float]
+    stats: Dict[str, int]
+    events: Tuple[Dict[str, Any], ...] = ()
+
+
+def batch_processor(
+        repos: List[str],
+        task_p: str,
+        output_dir: str = "batch_output",
+        max_workers: Optional[int] = None,
+        **options: Any
+        ) -> List[CourseResult]:
+    """
+    Run the description and the attribute pipelines for many course
+    repositories, every course in a separate worker process.
+
+    The outputs of every course are written into its own folder
+    '<output_dir>/<course name>'. The errors do not stop the other courses,
+    they are returned in the results.
+
+    :param repos: a sequence of paths to the engeto repositories.
+    :type repos: list
+    :param task_p: a relative path to the tasks package.
+    :type task_p: str
+    :param output_dir: a folder for the outputs of all the courses.
+    :type output_dir: str
+    :param max_workers: a maximum number of courses processed at once.
+    :type max_workers: int
+    :param options: other arguments for 'task_desc_processor'. The
+        'cache_dir' is shared by all the courses, the relative 'manifest' is
+        kept in the output folder of every course.
+    :type options: dict
+    :return: the results in the same order as the repositories.
+    :rtype: list
+    """
+    if options.get("cache_dir"):
+        options["cache_dir"] = os.path.abspath(options["cache_dir"])
+
+    jobs = [
+        (
+            os.path.abspath(repo),
+            os.path.abspath(task_p),
+            os.path.abspath(os.path.join(output_dir, os.path.basename(repo))),
+            options,
+            get_state()
+        )
+        for repo in repos
+    ]
+    results = []
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers) as pool:
+        futures = [pool.submit(run_course, *job) for job in jobs]
+
+        for (repo, _, output, _, _), future in zip(jobs, futures):
+            try:
+                results.append(future.result())
+                add_events(list(results[-1].events))
+
+            except Exception as error:
+                results.append(
+                    CourseResult(
+                        os.path.basename(repo), output,
+                        f"{type(error).__name__}: {error}", {}, {}
+                    )
+                )
+
+    logging.info(f"Batch summary:\n{format_summary(results)}")
+    return results
+
+
+def run_course(
+        engeto: str,
+        task_p: str,
+        output: str,
+        options: Dict[str, Any],
+        state: Tuple[bool, bool] = (False, False)
+        ) -> CourseResult:
+    """
+    Run both pipelines for a single course inside the worker process. Both
+    outputs are written into the output folder of the course. The 'state'
+    of the instrumentation is taken from the parent process.
+    """
+    with capture(state) as events, \
+            stage("course", course=os.path.basename(engeto)):
+        result = run_pipelines(engeto, task_p, output, options)
+
+    return result._replace(events=tuple(events))
+
+
+def run_pipelines(
+        engeto: str,
+        task_p: str,
+        output: str,
+        options: Dict[str, Any]
+        ) -> CourseResult:
+    """
+    Run both pipelines for a single course and measure them.
+    """
+    course = os.path.basename(engeto)
+    timings: Dict[str, float] = {}
+    stats: Dict[str, int] = {}
+    error = None
+    start = time.perf_counter()
+
+    options = dict(options, output=os.path.join(output, "output_desc.xml"))
+
+    if options.get("manifest"):
+        options["manifest"] = os.path.join(output, options["manifest"])
+
+    try:
+        os.makedirs(output, exist_ok=True)
+
+        stats = task_desc_processor(engeto, task_p, **options)
+        timings["description"] = time.perf_counter() - start
+
+        task_attr_processor(
+            options["output"],
+            stream=options.get("stream", False),
+            backend=options.get("backend"),
+            cache_dir=options.get("cache_dir"),
+            output=os.path.join(output, "output_attr.xml")
+        )
+        timings["attributes"] = time.perf_counter() - start \
+            - timings["description"]
+
+    except Exception:
+        error = traceback.format_exc()
+
+    timings["total"] = time.perf_counter() - start
+    return CourseResult(course, output, error, timings, stats)
+
+
+def format_summary(results: List[CourseResult]) -> str:
+    """
+    Return the table with the timings of every course.
+
+    :Example:
+    >>> print(format_summary([CourseResult(
+    ...     "python-uvod", "out", None,
+    ...     {"description": 1.5, "attributes": 0.5, "total": 2.0}, {}
+    ... )]))
+    course                         descr.    attr.    total  status
+    python-uvod                     1.50s    0.50s    2.00s  ok
+    """
+    lines = [
+        f"{'course':<28} {'descr.':>8} {'attr.':>8} {'total':>8}  status"
+    ]
+
+    for result in results:
+        timings = [
+            f"{result.timings[key]:.2f}s" if key in result.timings else "-"
+            for key in ("description", "attributes", "total")
+        ]
+        status = "ok" if result.error is None \
+            else result.error.strip().splitlines()[-1]
+        lines.append(
+            f"{result.course:<28} {timings[0]:>8} {timings[1]:>8} "
+            f"{timings[2]:>8}  {status}"
+        )
+
+    return "\n".join(lines)
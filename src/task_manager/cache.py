@@ -0,0 +1,319 @@
+import os
+import sys
+import time
+import hashlib
+import logging
+import marshal
+import tempfile
+import xml.etree.ElementTree
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from task_manager.attributes import collect_data
+from task_manager.digest import get_digest
+from task_manager.index import ExerciseIndex, build_index, index_elements
+from task_manager.index import get_exercises, get_solution_paths
+from task_manager.instrument import stage
+from task_manager.parser import get_backend, get_root, get_xml_root
+from task_manager.tasknames import create_task_data
+
+
+CACHE_FORMAT = 1
+DEFAULT_CACHE_SIZE = 512 * 1024 * 1024
+
+# The temporary files older than this (in seconds) were left by the
+# interrupted writes, the newer ones may be still written by another process.
+STALE_TEMP_AGE = 60 * 60
+
+
+class CourseData(NamedTuple):
+    """
+    A parsed and indexed course with the data collected from its exercises.
+    """
+    tree: xml.etree.ElementTree.ElementTree
+    exercise_index: ExerciseIndex
+    task_data: Dict[str, Dict[str, Optional[str]]]
+    attr_data: Dict[str, Dict[str, str]]
+
+
+def load_course(
+        filename: str,
+        cache_dir: Optional[str] = None,
+        backend: Optional[str] = None,
+        max_size: int = DEFAULT_CACHE_SIZE
+        ) -> CourseData:
+    """
+    Return the parsed course. With the cache directory, the parsed course is
+    stored there and the next call with the unchanged file loads it back
+    instead of parsing the XML again.
+
+    The entry is valid if the size and the mtime of the file are the same.
+    If only the mtime differs, the content hash decides. The directory is
+    kept under 'max_size' bytes, the least recently used entries are removed.
+
+    :param filename: a name of the xml file.
+    :type filename: str
+    :param cache_dir: a directory with the cached courses.
+    :type cache_dir: str
+    :param backend: a name of the backend, see 'parser.get_backend'.
+    :type backend: str
+    :param max_size: a maximum size of the cache directory in bytes.
+    :type max_size: int
+    :return: an object with the tree, the index and the collected data.
+    :rtype: CourseData
+    """
+    if not cache_dir:
+        return parse_course(filename, backend)
+
+    entry = get_entry_path(cache_dir, filename)
+    stat = os.stat(filename)
+    header = read_header(entry)
+    digest = None
+
+    if header and header["size"] == stat.st_size:
+        if header["mtime"] == stat.st_mtime_ns:
+            course = read_entry(entry, backend)
+            if course:
+                os.utime(entry)
+                return course
+        else:
+            digest = get_digest(filename)
+
+        if digest is not None and header["digest"] == digest:
+            course = read_entry(entry, backend)
+            if course:
+                header["mtime"] = stat.st_mtime_ns
+                write_entry(entry, header, course)
+                return course
+
+    course = parse_course(filename, backend)
+    write_entry(
+        entry,
+        {
+            "format": CACHE_FORMAT,
+            "python": sys.version_info[:2],
+            "size": stat.st_size,
+            "mtime": stat.st_mtime_ns,
+            "digest": digest or get_digest(filename)
+        },
+        course
+    )
+    evict_entries(cache_dir, max_size)
+    return course
+
+
+def parse_course(filename: str, backend: Optional[str] = None) -> CourseData:
+    """
+    Parse and index the course and collect the data from its exercises.
+    """
+    with stage("parse", file=filename):
+        tree = get_xml_root(filename, backend)
+
+    with stage("index") as current:
+        index = build_index(get_root(tree))
+        current.add(len(index.entries))
+
+    with stage("collect", len(index.entries)):
+        task_names = get_solution_paths(index, "exercises/")
+
+        return CourseData(
+            tree, index,
+            create_task_data(task_names),  # type: ignore
+            collect_data(get_exercises(index))
+        )
+
+
+def get_entry_path(cache_dir: str, filename: str) -> str:
+    """
+    Return the path of the cache entry for the given file.
+    """
+    key = hashlib.sha256(os.path.abspath(filename).encode()).hexdigest()
+    return os.path.join(cache_dir, f"{key}.course")
+
+
+def read_header(entry: str) -> Optional[Dict[str, Any]]:
+    """
+    Return the header of the cache entry or None, if it is missing or it was
+    written by another format or Python version.
+    """
+    try:
+        with open(entry, "rb") as source:
+            header = marshal.load(source)
+
+    except (OSError, EOFError, ValueError, TypeError):
+        output = None
+    else:
+        valid = isinstance(header, dict) \
+            and header.get("format") == CACHE_FORMAT \
+            and header.get("python") == sys.version_info[:2]
+        output = header if valid else None
+    finally:
+        return output
+
+
+def read_entry(
+        entry: str, backend: Optional[str] = None
+        ) -> Optional[CourseData]:
+    """
+    Return the course stored in the cache entry.
+    """
+    with stage("cache.read"):
+        try:
+            with open(entry, "rb") as source:
+                marshal.load(source)
+                nodes, positions, task_data, attr_data = marshal.loads(
+                    source.read()
+                )
+
+        except (OSError, EOFError, ValueError, TypeError):
+            logging.warning(f"Cannot read the cache entry: {entry}")
+            return None
+
+        elements = rebuild_elements(nodes, get_backend(backend))
+        index = index_elements(elements[position] for position in positions)
+
+        return CourseData(
+            get_backend(backend).ElementTree(elements[0]),
+            index, task_data, attr_data
+        )
+
+
+def write_entry(
+        entry: str, header: Dict[str, Any], course: CourseData
+        ) -> None:
+    """
+    Write the course into the cache entry. The file is replaced at once, so
+    the readers never see a half written entry.
+    """
+    with stage("cache.write"):
+        root = get_root(course.tree)
+        nodes = flatten_elements(root)
+        positions = get_positions(root, course.exercise_index)
+        cache_dir = os.path.dirname(entry)
+        os.makedirs(cache_dir, exist_ok=True)
+
+        try:
+            handle, temp = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+            with os.fdopen(handle, "wb") as target:
+                marshal.dump(header, target)
+                marshal.dump(
+                    (nodes, positions, course.task_data, course.attr_data),
+                    target
+                )
+            os.replace(temp, entry)
+
+        except (OSError, ValueError) as error:
+            logging.warning(f"Cannot write the cache entry {entry}: {error}")
+
+
+def flatten_elements(
+        root: xml.etree.ElementTree.Element
+        ) -> Tuple[List[str], List[Dict[str, str]], List[Optional[str]],
+                   List[Optional[str]], List[int]]:
+    """
+    Return the tree as the lists of tags, attributes, texts, tails and
+    numbers of children in the document order.
+
+    :Example:
+    >>> root = xml.etree.ElementTree.fromstring("<a>x<b c='d'/>y</a>")
+    >>> flatten_elements(root)
+    (['a', 'b'], [{}, {'c': 'd'}], ['x', None], [None, 'y'], [1, 0])
+    """
+    tags, attrs, texts, tails, counts = [], [], [], [], []
+
+    for element in root.iter():
+        tags.append(element.tag)
+        attrs.append(dict(element.attrib))
+        texts.append(element.text)
+        tails.append(element.tail)
+        counts.append(len(element))
+
+    return tags, attrs, texts, tails, counts
+
+
+def rebuild_elements(
+        nodes: Tuple[List[str], List[Dict[str, str]], List[Optional[str]],
+                     List[Optional[str]], List[int]],
+        module: Any = xml.etree.ElementTree
+        ) -> List[xml.etree.ElementTree.Element]:
+    """
+    Return the elements created from the flattened tree in the document
+    order. The first one is the root.
+
+    :Example:
+    >>> elements = rebuild_elements(
+    ...     (['a', 'b'], [{}, {'c': 'd'}], ['x', None], [None, 'y'], [1, 0])
+    ... )
+    >>> xml.etree.ElementTree.tostring(elements[0])
+    b'<a>x<b c="d" />y</a>'
+    """
+    tags, attrs, texts, tails, counts = nodes
+    elements = []
+    parents: List[xml.etree.ElementTree.Element] = []
+    remaining: List[int] = []
+
+    for tag, attrib, text, tail, count in zip(
+            tags, attrs, texts, tails, counts
+    ):
+        element = module.Element(tag, attrib)
+        element.text, element.tail = text, tail
+        elements.append(element)
+
+        if parents:
+            parents[-1].append(element)
+            remaining[-1] -= 1
+            while parents and not remaining[-1]:
+                parents.pop()
+                remaining.pop()
+        if count:
+            parents.append(element)
+            remaining.append(count)
+
+    return elements
+
+
+def get_positions(
+        root: xml.etree.ElementTree.Element, index: ExerciseIndex
+        ) -> List[int]:
+    """
+    Return the positions of the indexed exercises in the document order.
+    """
+    positions = {
+        id(element): position
+        for position, element in enumerate(root.iter())
+    }
+    return [positions[id(entry.element)] for entry in index.entries]
+
+
+def evict_entries(cache_dir: str, max_size: int) -> None:
+    """
+    Remove the least recently used entries until the directory fits into the
+    given size. The temporary files left by the interrupted writes are
+    always removed. The entries removed by another process in the meantime
+    are skipped.
+    """
+    entries = []
+    stale = time.time() - STALE_TEMP_AGE
+
+    for name in os.listdir(cache_dir):
+        if not name.endswith((".course", ".tmp")):
+            continue
+        try:
+            stat = os.stat(os.path.join(cache_dir, name))
+            if name.endswith(".tmp"):
+                if stat.st_mtime < stale:
+                    os.remove(os.path.join(cache_dir, name))
+                continue
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, name))
+
+    total = sum(size for _, size, _ in entries)
+
+    for _, size, name in sorted(entries):
+        if total <= max_size:
+            break
+        try:
+            os.remove(os.path.join(cache_dir, name))
+        except FileNotFoundError:
+            pass
+        total -= size
@@ -2,17 +2,30 @@ import os
 import shutil
 import logging
 import xml.etree.ElementTree
-from typing import List, Set, Tuple
+from typing import Dict, List, Optional, Sequence, Set, Tuple
 
 from task_manager.description import load_lesson_tasks
-
-
-def select_names(exercises: List[xml.etree.ElementTree.Element]) -> Set[str]:
+from task_manager.index import ExerciseIndex
+from task_manager.instrument import stage
+from task_manager.copier import CopyJob, CopySummary, copy_files
+from task_manager.copier import merge_summaries
+from task_manager.copier import DEFAULT_COPY_WORKERS, DEFAULT_STRATEGIES
+from task_manager.fsindex import Snapshot, exists, listdir, refresh_snapshot
+from task_manager.trash import Trash, discard
+
+
+def select_names(
+        exercises: List[xml.etree.ElementTree.Element],
+        index: Optional[ExerciseIndex] = None
+        ) -> Set[str]:
     """
     Return an object of task names.
 
     :param exercises: a sequence of XML elements.
     :type exercises: list
+    :param index: an index of the exercises, see 'index.build_index'. If it
+        is given, the names are read from it instead of the exercises.
+    :type index: ExerciseIndex
     :return: an object with the names.
     :rtype: set
 
@@ -24,6 +37,13 @@ def select_names(exercises: List[xml.etree.ElementTree.Element]) -> Set[str]:
     >>> print(select_names(exercises))
     {'string_operations', 'slicing_string'}
     """
+    if index:
+        return {
+            split_name(
+                select_attr(element, "solution", "sourceDir", children)
+            )
+            for element, children in index.entries
+        }
 
     return {
         split_name(
@@ -36,7 +56,8 @@ def select_names(exercises: List[xml.etree.ElementTree.Element]) -> Set[str]:
 def select_attr(
         element: xml.etree.ElementTree.Element,
         child: str,
-        attr_name: str
+        attr_name: str,
+        table: Optional[Dict[str, xml.etree.ElementTree.Element]] = None
 ) -> str:
     """
     Return a string from the attribute with a path.
@@ -47,6 +68,9 @@ def select_attr(
     :type child: str
     :param attr_name:
     :type attr_name:
+    :param table: the children of the exercise by their tags, see
+        'index.index_exercise'. Without it the child is searched.
+    :type table: dict
     :return:
     :rtype:
 
@@ -58,7 +82,7 @@ def select_attr(
     >>> print(select_attr(exercises[0], "solution", "sourceDir"))
     exercises/L01/slicing_string/solution
     """
-    solution = element.find(child)
+    solution = table.get(child) if table is not None else element.find(child)
     return solution.attrib.get(attr_name, "nan_path")  # type: ignore
 
 
@@ -88,7 +112,10 @@ def split_name(path: str) -> str:
 
 
 def remove_unused_lessons(
-    lessons: List[str], target: str, rel_path: str
+    lessons: List[str],
+    target: str,
+    rel_path: str,
+    trash: Optional[Trash] = None
         ) -> None:
     """
     Remove all the directories in the given sequence except of the target.
@@ -99,13 +126,21 @@ def remove_unused_lessons(
     :type target: str
     :param rel_path: a relative path to the lesson.
     :type target: str
+    :param trash: a trash for the removed directories, they are purged in
+        the background, see 'trash.open_trash'.
+    :type trash: Trash
     """
     for folder in lessons:
         if folder != target:
-            shutil.rmtree(os.path.join(rel_path, folder))
+            remove_dir(os.path.join(rel_path, folder), trash)
 
 
-def rename_dirs(dirs: Tuple[str, ...], pattern: str, package: str) -> None:
+def rename_dirs(
+        dirs: Tuple[str, ...],
+        pattern: str,
+        package: str,
+        trash: Optional[Trash] = None
+        ) -> None:
     """
     Rename the given sequence of directories according to the pattern.
 
@@ -115,20 +150,44 @@ def rename_dirs(dirs: Tuple[str, ...], pattern: str, package: str) -> None:
     :type pattern: dict
     :param package: a relative path of the package.
     :type package: str
+    :param trash: a trash for the unmapped directories, see
+        'trash.open_trash'.
+    :type trash: Trash
     """
+    names = load_lesson_tasks(pattern)
+
     for folder in dirs:
         if not os.path.exists(os.path.join(package, folder)):
             continue
-        updated = load_lesson_tasks(pattern).get(folder)
+        updated = names.get(folder)
 
-        if not updated:
-            shutil.rmtree(os.path.join(package, folder))
-            continue
-        os.rename(os.path.join(package, folder),
-                  os.path.join(package, updated))
+        with stage("rename", 1, task=folder, lesson=pattern):
+            if not updated:
+                remove_dir(os.path.join(package, folder), trash)
+                continue
+            os.rename(os.path.join(package, folder),
+                      os.path.join(package, updated))
 
 
-def move_content(lesson_path: str, engeto_repo: str, package: str) -> None:
+def remove_dir(path: str, trash: Optional[Trash] = None) -> None:
+    """
+    Remove the directory, or move it to the trash.
+    """
+    if trash is None:
+        shutil.rmtree(path)
+    else:
+        discard(trash, path)
+
+
+def move_content(
+        lesson_path: str,
+        engeto_repo: str,
+        package: str,
+        workers: int = DEFAULT_COPY_WORKERS,
+        sync: bool = False,
+        strategies: Sequence[str] = DEFAULT_STRATEGIES,
+        snapshot: Optional[Snapshot] = None
+        ) -> CopySummary:
     """
     Move the content of the task folder from the package to the repository.
 
@@ -138,27 +197,43 @@ def move_content(lesson_path: str, engeto_repo: str, package: str) -> None:
     :type engeto_repo: str
     :param package: a relative path to the package.
     :type package: str
+    :param workers: a maximum number of the files copied at once.
+    :type workers: int
+    :param sync: copy only the changed files, see 'copier.copy_files'.
+    :type sync: bool
+    :param strategies: the ways of copying, see 'copier.copy_file'.
+    :type strategies: tuple
+    :param snapshot: the scanned repository and package, see
+        'fsindex.take_snapshot'. Without it the disk is checked.
+    :type snapshot: Snapshot
+    :return: an object with the numbers of the copied and skipped files.
+    :rtype: CopySummary
     """
-    lesson = os.path.basename(lesson_path)
-
-    for folder in os.listdir(lesson_path):
-        enge_solution = os.path.join(
-            engeto_repo, "exercises", lesson, folder, "solution"
-        )
-        pack_solution = os.path.join(package, folder)
-
-        if not os.path.exists(enge_solution) \
-                or not os.path.exists(pack_solution):
-            continue
-        shutil.copyfile(
-            os.path.join(pack_solution, f"{folder}.py"),
-            os.path.join(enge_solution, "main.py")
-        )
-
-    add_missing_tasks(lesson_path, package)
-
-
-def move_tests(lesson_path: str, engeto_repo: str, package: str) -> None:
+    summary = copy_files(
+        collect_jobs(
+            lesson_path, engeto_repo, package, "{}.py", "solution/main.py",
+            snapshot
+        ),
+        workers,
+        sync,
+        strategies
+    )
+
+    return merge_summaries(
+        summary,
+        add_missing_tasks(lesson_path, package, sync, strategies, snapshot)
+    )
+
+
+def move_tests(
+        lesson_path: str,
+        engeto_repo: str,
+        package: str,
+        workers: int = DEFAULT_COPY_WORKERS,
+        sync: bool = False,
+        strategies: Sequence[str] = DEFAULT_STRATEGIES,
+        snapshot: Optional[Snapshot] = None
+        ) -> CopySummary:
     """
     Move the tests of the task from the package to the repository.
 
@@ -168,24 +243,86 @@ def move_tests(lesson_path: str, engeto_repo: str, package: str) -> None:
     :type engeto_repo: str
     :param package: a relative path to the package.
     :type package: str
+    :param workers: a maximum number of the files copied at once.
+    :type workers: int
+    :param sync: copy only the changed files, see 'copier.copy_files'.
+    :type sync: bool
+    :param strategies: the ways of copying, see 'copier.copy_file'.
+    :type strategies: tuple
+    :param snapshot: the scanned repository and package, see
+        'fsindex.take_snapshot'. Without it the disk is checked.
+    :type snapshot: Snapshot
+    :return: an object with the numbers of the copied and skipped files.
+    :rtype: CopySummary
     """
+    return copy_files(
+        collect_jobs(
+            lesson_path, engeto_repo, package, "test_{}.py", "tests.py",
+            snapshot
+        ),
+        workers,
+        sync,
+        strategies
+    )
+
+
+def collect_jobs(
+        lesson_path: str,
+        engeto_repo: str,
+        package: str,
+        source: str,
+        target: str,
+        snapshot: Optional[Snapshot] = None
+        ) -> List[CopyJob]:
+    """
+    Return the copy jobs of the tasks that are both in the lesson and in the
+    package. The folder of the target file has to exist in the repository.
 
+    :param lesson_path: a relative path of exercises
+    :type lesson_path: str
+    :param engeto_repo: a relative path to the repository.
+    :type engeto_repo: str
+    :param package: a relative path to the package.
+    :type package: str
+    :param source: a name of the package file, '{}' is the task name.
+    :type source: str
+    :param target: a path of the file relative to the repository task.
+    :type target: str
+    :param snapshot: the scanned repository and package, see
+        'fsindex.take_snapshot'. Without it the disk is checked.
+    :type snapshot: Snapshot
+    :return: a sequence of the copied files.
+    :rtype: list
+    """
     lesson = os.path.basename(lesson_path)
+    jobs = []
 
-    for folder in os.listdir(lesson_path):
-        enge_tests = os.path.join(engeto_repo, "exercises", lesson, folder)
-        pack_tests = os.path.join(package, folder)
+    for folder in listdir(snapshot, lesson_path):
+        enge_target = os.path.join(
+            engeto_repo, "exercises", lesson, folder, target
+        )
+        pack_task = os.path.join(package, folder)
 
-        if not os.path.exists(enge_tests) \
-                or not os.path.exists(pack_tests):
+        if not exists(snapshot, os.path.dirname(enge_target)) \
+                or not exists(snapshot, pack_task):
             continue
-        shutil.copyfile(
-            os.path.join(pack_tests, f"test_{folder}.py"),
-            os.path.join(enge_tests, "tests.py")
+        jobs.append(
+            CopyJob(
+                os.path.join(pack_task, source.format(folder)),
+                enge_target, folder, lesson
+            )
         )
 
+    return jobs
 
-def add_missing_tasks(engeto_tasks: str, package_tasks: str) -> None:
+
+def add_missing_tasks(
+        engeto_tasks: str,
+        package_tasks: str,
+        sync: bool = False,
+        strategies: Sequence[str] = DEFAULT_STRATEGIES,
+        snapshot: Optional[Snapshot] = None
+        ) -> CopySummary:
     """
     Create a task folder with content if the task is not part of current
     repository.
@@ -194,19 +331,44 @@ def add_missing_tasks(engeto_tasks: str, package_tasks: str) -> None:
     :type engeto_tasks: str
     :param package_tasks: a relative path of the new folder.
     :type package_tasks: str
+    :param sync: copy only the changed files, see 'copier.copy_files'.
+    :type sync: bool
+    :param strategies: the ways of copying, see 'copier.copy_file'.
+    :type strategies: tuple
+    :param snapshot: the scanned repository and package, it is refreshed
+        after the new folders are created.
+    :type snapshot: Snapshot
+    :return: an object with the numbers of the copied and skipped files.
+    :rtype: CopySummary
     """
-    repository = set(os.listdir(engeto_tasks))
-    package = set(os.listdir(package_tasks))
+    repository = set(listdir(snapshot, engeto_tasks))
+    package = set(listdir(snapshot, package_tasks))
     diff = package.difference(repository)
+    summaries = []
 
     for file in diff:
         rel_path_repo = os.path.join(package_tasks, file)
 
         if file != "__init__.py":
-            create_task_folder(file, rel_path_repo, engeto_tasks)
+            summaries.append(
+                create_task_folder(
+                    file, rel_path_repo, engeto_tasks, sync, strategies
+                )
+            )
+
+            if snapshot is not None:
+                refresh_snapshot(snapshot, os.path.join(engeto_tasks, file))
+
+    return merge_summaries(*summaries)
 
 
-def create_task_folder(name: str, rel_path: str, repository: str) -> None:
+def create_task_folder(
+        name: str,
+        rel_path: str,
+        repository: str,
+        sync: bool = False,
+        strategies: Sequence[str] = DEFAULT_STRATEGIES
+        ) -> CopySummary:
     """
     Create a new folder for the missing task. Then create subfolders 'skeleton'
     'solution' and the file 'skeleton/main.py'.
@@ -217,18 +379,33 @@ def create_task_folder(name: str, rel_path: str, repository: str) -> None:
     :type repository: str
     :param package: a relative path of the pattern task folder.
     :type package: str
+    :param sync: copy only the changed files, see 'copier.copy_files'.
+    :type sync: bool
+    :param strategies: the ways of copying, see 'copier.copy_file'.
+    :type strategies: tuple
+    :return: an object with the numbers of the copied and skipped files.
+    :rtype: CopySummary
     """
     try:
         os.mkdir(os.path.join(repository, name))
 
     except Exception:
         logging.warning(f"Folder '{repository}' already exists")
+        return CopySummary(0, 0, [])
     else:
         for subfolder in "skeleton", "solution":
             os.mkdir(os.path.join(repository, name, subfolder))
 
         os.mknod(os.path.join(repository, name, "skeleton", "main.py"))
-        shutil.copyfile(
-            os.path.join(rel_path, f"{os.path.basename(rel_path)}.py"),
-            os.path.join(repository, name, "solution", "main.py")
+        return copy_files(
+            [
+                CopyJob(
+                    os.path.join(rel_path, f"{os.path.basename(rel_path)}.py"),
+                    os.path.join(repository, name, "solution", "main.py"),
+                    name, os.path.basename(repository)
+                )
+            ],
+            1,
+            sync,
+            strategies
         )
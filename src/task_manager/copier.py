@@ -0,0 +1,404 @@
+import os
+import errno
+import shutil
+import logging
+import collections
+import concurrent.futures
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore
+
+from task_manager.digest import get_digest
+from task_manager.instrument import stage
+
+
+DEFAULT_COPY_WORKERS = 16
+
+# Linux 'FICLONE' ioctl, it shares the blocks of the file on Btrfs and XFS.
+FICLONE = 0x40049409
+
+DEFAULT_STRATEGIES = ("reflink", "copy_file_range", "sendfile", "copy")
+LINK_STRATEGIES = ("hardlink",) + DEFAULT_STRATEGIES
+
+# The errors of an unsupported strategy, the next one is used instead.
+FALLBACK_ERRORS = {
+    errno.EXDEV, errno.EINVAL, errno.ENOSYS, errno.ENOTTY, errno.EBADF,
+    errno.EOPNOTSUPP, errno.ENOTSUP, errno.EPERM, errno.ETXTBSY
+}
+
+
+class CopyJob(NamedTuple):
+    """
+    A single file copied from the package to the repository.
+    """
+    source: str
+    target: str
+    task: str
+    lesson: str
+
+
+class CopySummary(NamedTuple):
+    """
+    The numbers of the copied files and bytes with the failed copy jobs and
+    their errors. The skipped files were already the same in the target,
+    the 'strategies' count the copied files by the used strategy.
+    """
+    files: int
+    bytes: int
+    errors: List[Tuple[CopyJob, str]]
+    skipped: int = 0
+    strategies: Optional[Dict[str, int]] = None
+
+
+class CopyResult(NamedTuple):
+    """
+    The size and the strategy of the copied file, None for the skipped file,
+    or the error of the failed copy.
+    """
+    size: Optional[int]
+    strategy: Optional[str] = None
+    error: Optional[str] = None
+
+
+def copy_files(
+        jobs: List[CopyJob],
+        workers: int = DEFAULT_COPY_WORKERS,
+        sync: bool = False,
+        strategies: Sequence[str] = DEFAULT_STRATEGIES
+        ) -> CopySummary:
+    """
+    Copy all the files with a pool of threads. The failed copies are logged
+    and reported in the summary, they do not stop the other ones.
+
+    :param jobs: a sequence of the copied files.
+    :type jobs: list
+    :param workers: a maximum number of the files copied at once.
+    :type workers: int
+    :param sync: skip the files that are the same in the target, see
+        'is_unchanged'. The copies get the modification time of the source,
+        so the next run can skip them without reading the content.
+    :type sync: bool
+    :param strategies: the ways of copying in the order they are tried, see
+        'copy_file'. The summary counts the files copied by each of them.
+    :type strategies: tuple
+    :return: an object with the numbers of the copied files and bytes.
+    :rtype: CopySummary
+
+    :Example:
+    >>> copy_files([CopyJob("missing.py", "main.py", "task", "L01")])
+    CopySummary(files=0, bytes=0, errors=[(CopyJob(source='missing.py', \
+target='main.py', task='task', lesson='L01'), "FileNotFoundError: [Errno 2] \
+No such file or directory: 'missing.py'")], skipped=0, strategies={})
+    """
+    if workers <= 1 or len(jobs) < 2:
+        results = [copy_job(job, sync, strategies) for job in jobs]
+    else:
+        with concurrent.futures.ThreadPoolExecutor(workers) as pool:
+            results = list(
+                pool.map(
+                    copy_job, jobs, [sync] * len(jobs),
+                    [strategies] * len(jobs)
+                )
+            )
+
+    summary = CopySummary(0, 0, [])
+    used: Dict[str, int] = collections.Counter()
+
+    for job, result in zip(jobs, results):
+        if result.error is not None:
+            logging.warning(f"Cannot copy {job.source}: {result.error}")
+            summary.errors.append((job, result.error))
+        elif result.size is None:
+            summary = summary._replace(skipped=summary.skipped + 1)
+        else:
+            used[result.strategy] += 1  # type: ignore
+            summary = summary._replace(
+                files=summary.files + 1, bytes=summary.bytes + result.size
+            )
+
+    return summary._replace(strategies=dict(used))
+
+
+def merge_summaries(*summaries: CopySummary) -> CopySummary:
+    """
+    Return the summary of all the given copies.
+
+    :param summaries: the summaries of the copies.
+    :type summaries: CopySummary
+    :return: an object with the total numbers.
+    :rtype: CopySummary
+
+    :Example:
+    >>> merge_summaries(
+    ...     CopySummary(1, 10, [], 2, {"copy": 1}),
+    ...     CopySummary(2, 5, [], 0, {"copy": 1, "reflink": 1})
+    ... )
+    CopySummary(files=3, bytes=15, errors=[], skipped=2, \
+strategies={'copy': 2, 'reflink': 1})
+    """
+    used: Dict[str, int] = collections.Counter()
+
+    for summary in summaries:
+        used.update(summary.strategies or {})
+
+    return CopySummary(
+        sum(summary.files for summary in summaries),
+        sum(summary.bytes for summary in summaries),
+        [error for summary in summaries for error in summary.errors],
+        sum(summary.skipped for summary in summaries),
+        dict(used)
+    )
+
+
+def copy_job(
+        job: CopyJob,
+        sync: bool = False,
+        strategies: Sequence[str] = DEFAULT_STRATEGIES
+        ) -> CopyResult:
+    """
+    Copy the file and return its size and strategy, None for the skipped
+    file, or the error of the failed copy.
+    """
+    try:
+        with stage("copy", 1, task=job.task, lesson=job.lesson):
+            if sync and is_unchanged(job.source, job.target):
+                return CopyResult(None)
+
+            strategy = copy_file(job.source, job.target, strategies)
+            source = os.stat(job.source)
+
+            if sync and strategy != "hardlink":
+                os.utime(
+                    job.target, ns=(source.st_atime_ns, source.st_mtime_ns)
+                )
+
+    except OSError as error:
+        return CopyResult(0, error=f"{type(error).__name__}: {error}")
+
+    return CopyResult(source.st_size, strategy)
+
+
+def copy_file(
+        source: str,
+        target: str,
+        strategies: Sequence[str] = DEFAULT_STRATEGIES
+        ) -> str:
+    """
+    Copy the file with the first strategy that works and return its name.
+
+    The 'hardlink' replaces the target by a link to the source, so it suits
+    only the outputs that are not edited. The 'reflink' clones the file on
+    the filesystems with copy on write, 'copy_file_range' and 'sendfile'
+    copy the data in the kernel and 'copy' reads and writes it in Python.
+    The unsupported strategy falls back to the next one. The target that is
+    a hard link to the source is unlinked first, so the copy does not
+    truncate the source.
+
+    :param source: a path of the copied file.
+    :type source: str
+    :param target: a path of the copy.
+    :type target: str
+    :param strategies: the names of the strategies in the order they are
+        tried, see 'DEFAULT_STRATEGIES' and 'LINK_STRATEGIES'.
+    :type strategies: tuple
+    :return: the name of the used strategy.
+    :rtype: str
+
+    :Example:
+    >>> copy_file("src/tests/foo.xml", "foo.xml", ["copy"])
+    'copy'
+    >>> os.remove("foo.xml")
+    >>> copy_file("src/tests/foo.xml", "foo.xml", ["move"])
+    Traceback (most recent call last):
+    ValueError: Unknown copy strategies: move
+    >>> copy_file("src/tests/foo.xml", "src/tests/foo.xml")
+    Traceback (most recent call last):
+    shutil.SameFileError: 'src/tests/foo.xml' and 'src/tests/foo.xml' are \
+the same file
+    """
+    unknown = [name for name in strategies if name not in STRATEGIES]
+
+    if unknown:
+        raise ValueError(f"Unknown copy strategies: {', '.join(unknown)}")
+
+    if is_same_file(source, target):
+        if os.path.realpath(source) == os.path.realpath(target):
+            raise shutil.SameFileError(
+                f"{source!r} and {target!r} are the same file"
+            )
+        os.remove(target)
+
+    error = OSError(errno.ENOSYS, "No copy strategy", source)
+
+    if "hardlink" in strategies:
+        try:
+            link_file(source, target)
+        except OSError as link_error:
+            if link_error.errno not in FALLBACK_ERRORS:
+                raise
+            error = link_error
+        else:
+            return "hardlink"
+
+    with open(source, "rb") as src, open(target, "wb") as dst:
+        size = os.fstat(src.fileno()).st_size
+
+        for name in strategies:
+            if name == "hardlink":
+                continue
+            try:
+                STRATEGIES[name](src.fileno(), dst.fileno(), size)
+            except OSError as copy_error:
+                if copy_error.errno not in FALLBACK_ERRORS:
+                    raise
+                error = copy_error
+                os.lseek(src.fileno(), 0, os.SEEK_SET)
+                os.lseek(dst.fileno(), 0, os.SEEK_SET)
+                os.ftruncate(dst.fileno(), 0)
+            else:
+                return name
+
+    raise error
+
+
+def is_same_file(source: str, target: str) -> bool:
+    """
+    Return True, if the target exists and shares the inode with the source.
+    """
+    try:
+        return os.path.samefile(source, target)
+    except FileNotFoundError:
+        return False
+
+
+def link_file(source: str, target: str) -> None:
+    """
+    Replace the target by a hard link to the source.
+    """
+    temporary = f"{target}.link"
+    os.link(source, temporary)
+    os.replace(temporary, target)
+
+
+def link_descriptors(src: int, dst: int, size: int) -> None:
+    """
+    The hard link is made from the paths by 'link_file' before the files
+    are opened, the open files fall back to the next strategy.
+    """
+    raise OSError(errno.ENOSYS, "Hard link needs the paths of the files")
+
+
+def clone_file(src: int, dst: int, size: int) -> None:
+    """
+    Clone the file with the 'FICLONE' ioctl.
+    """
+    if fcntl is None:
+        raise OSError(errno.ENOSYS, "Reflink is not supported")
+
+    fcntl.ioctl(dst, FICLONE, src)
+
+
+def copy_range(src: int, dst: int, size: int) -> None:
+    """
+    Copy the file with 'os.copy_file_range' (Linux, Python 3.8+).
+    """
+    if not hasattr(os, "copy_file_range"):
+        raise OSError(errno.ENOSYS, "copy_file_range is not supported")
+
+    offset = 0
+
+    while offset < size:
+        sent = os.copy_file_range(  # type: ignore
+            src, dst, size - offset, offset, offset
+        )
+        if not sent:
+            raise_short_copy(offset, size)
+        offset += sent
+
+
+def send_file(src: int, dst: int, size: int) -> None:
+    """
+    Copy the file with 'os.sendfile', Linux accepts a regular target file.
+    """
+    if not hasattr(os, "sendfile"):
+        raise OSError(errno.ENOSYS, "sendfile is not supported")
+
+    offset = 0
+
+    while offset < size:
+        sent = os.sendfile(dst, src, offset, size - offset)
+        if not sent:
+            raise_short_copy(offset, size)
+        offset += sent
+
+
+def raise_short_copy(offset: int, size: int) -> None:
+    """
+    Raise the error for the copy that ended before the expected size. If
+    nothing was copied, the call is not supported for the file and the next
+    strategy is used, otherwise the file shrank and the copy fails.
+
+    :Example:
+    >>> raise_short_copy(0, 10)
+    Traceback (most recent call last):
+    OSError: [Errno 22] Copied 0 of 10 bytes
+    """
+    raise OSError(
+        errno.EIO if offset else errno.EINVAL,
+        f"Copied {offset} of {size} bytes"
+    )
+
+
+def read_write(src: int, dst: int, size: int) -> None:
+    """
+    Copy the file through the buffers of Python.
+    """
+    with open(src, "rb", closefd=False) as source, \
+            open(dst, "wb", closefd=False) as target:
+        shutil.copyfileobj(source, target)
+
+
+STRATEGIES: Dict[str, Callable[[int, int, int], None]] = {
+    "hardlink": link_descriptors,
+    "reflink": clone_file,
+    "copy_file_range": copy_range,
+    "sendfile": send_file,
+    "copy": read_write
+}
+
+
+def is_unchanged(source: str, target: str) -> bool:
+    """
+    Return True, if the target has the same content as the source. The files
+    of the same size and modification time are the same, otherwise their
+    hashes are compared.
+
+    :param source: a path of the copied file.
+    :type source: str
+    :param target: a path of the copy.
+    :type target: str
+    :return: True for the same files.
+    :rtype: bool
+
+    :Example:
+    >>> is_unchanged("src/tests/foo.xml", "src/tests/foo.xml")
+    True
+    >>> is_unchanged("src/tests/foo.xml", "src/tests/missing.xml")
+    False
+    """
+    try:
+        target_stat = os.stat(target)
+    except FileNotFoundError:
+        return False
+
+    source_stat = os.stat(source)
+
+    if source_stat.st_size != target_stat.st_size:
+        return False
+    if source_stat.st_mtime_ns == target_stat.st_mtime_ns:
+        return True
+
+    return get_digest(source) == get_digest(target)
@@ -1,45 +1,148 @@
 import os
+import mmap
 import logging
+import concurrent.futures
 import xml.etree.ElementTree
-from typing import Dict, List, Tuple, Optional
+from typing import Any, Dict, List, NamedTuple, Tuple, Optional
 
-import task_manager.utils as tu
+from task_manager.fsindex import Snapshot, exists
+from task_manager.index import ExerciseIndex
+from task_manager.index import index_exercise, select_solution_path
+from task_manager.instrument import stage
+from task_manager.lessons import get_table
+from task_manager.manifest import fetch_cached, using_manifest
+from task_manager.writer import Sink, write_tree
+from task_manager.tasknames import create_task_data
+from task_manager.text_processor import process_text, process_texts
+from task_manager.text_processor import slice_section
 
-from task_manager.text_processor import process_text
+
+DEFAULT_WORKERS = 8
 
 
 def replace_descriptions(
         tree: xml.etree.ElementTree.ElementTree,
         data: Dict[str, Dict[str, Optional[str]]],
         exercises: List[xml.etree.ElementTree.Element],
-        package: str
-) -> None:
+        package: str,
+        index: Optional[ExerciseIndex] = None,
+        manifest: Optional[str] = None,
+        workers: int = DEFAULT_WORKERS,
+        processes: Optional[int] = None,
+        output: Sink = "output_desc.xml",
+        snapshot: Optional[Snapshot] = None
+) -> Dict[str, int]:
     """
     Update the XML tree with the given task names and task elements.
 
+    The README of every task name is processed once, the solutions are
+    removed from all the exercises (also those that repeat the name of a
+    task from another lesson), like in the streaming mode.
+
+    With the manifest, the processed README files are stored in it and only
+    the changed ones are read and processed again on the next run. The
+    README files are loaded in advance by a pool of 'workers' threads. With
+    'processes', the loaded texts are processed by a pool of processes.
+
     :param tree: an object that represents XML content.
     :type tree: xml.etree.ElementTree.ElementTree
     :param data: an object with tasks attributes.
     :type data: dict
     :param exercises: an sequence of exercise elements.
     :type exercises: list
+    :param index: an index of the exercises, see 'index.build_index'.
+    :type index: ExerciseIndex
+    :param manifest: a path of the README manifest file.
+    :type manifest: str
+    :param workers: a maximum number of threads reading the README files.
+    :type workers: int
+    :param processes: a number of processes for the text processing, see
+        'text_processor.process_texts'.
+    :type processes: int
+    :param output: a path, a file descriptor or a file object for the tree.
+    :type output: str, os.PathLike, int or file object
+    :param snapshot: the scanned package, see 'fsindex.take_snapshot'.
+    :type snapshot: Snapshot
+    :return: a number of README files taken from the manifest and processed.
+    :rtype: dict
     """
-    for task_data, exercise in zip(data.items(), exercises):
-        process_description(task_data, package)
-        remove_solution(exercise)
+    tables = [entry.children for entry in index.entries] if index \
+        else [None] * len(exercises)
+    tasks = list(data.items())
 
-    tree.write("output_desc.xml", encoding="utf-8")
+    with using_manifest(manifest, package) as (entries, stats):
+        contents = prefetch_descriptions(
+            tasks, package, entries, workers, snapshot
+        )
+
+        pending = {
+            task_data[0]: content.lines
+            for task_data, content in zip(tasks, contents)
+            if content.text is None and content.lines
+        } if processes else {}
+        processed: Dict[str, str] = {}
+
+        if pending:
+            with stage("text.process", len(pending)):
+                processed = process_texts(pending, processes)
+
+        for task_data, content in zip(tasks, contents):
+            process_description(
+                task_data, package, entries, stats, content,
+                processed.get(task_data[0])
+            )
 
+    for exercise, table in zip(exercises, tables):
+        remove_solution(exercise, table)
 
-def remove_solution(exercise: xml.etree.ElementTree.Element) -> None:
+    write_tree(tree, output)
+    return stats
+
+
+def describe_exercise(
+        exercise: xml.etree.ElementTree.Element,
+        package: str,
+        manifest: Optional[Dict[str, Dict[str, Any]]] = None,
+        stats: Optional[Dict[str, int]] = None
+        ) -> None:
+    """
+    Process the description of a single exercise and remove its solution.
+    It is the handler for the streaming mode of the description processor.
+
+    :param exercise: an xml element with task.
+    :type exercise: xml.etree.ElementTree.Element
+    :param package: a name of the package.
+    :type package: str
+    :param manifest: the entries of the README manifest.
+    :type manifest: dict
+    :param stats: the counters of the manifest hits and misses.
+    :type stats: dict
+    """
+    entry = index_exercise(exercise)
+    path = select_solution_path(entry) or ""
+
+    if path.startswith("exercises/"):
+        for task_data in create_task_data([path]).items():
+            process_description(task_data, package, manifest, stats)
+    remove_solution(exercise, entry.children)
+
+
+def remove_solution(
+        exercise: xml.etree.ElementTree.Element,
+        table: Optional[Dict[str, xml.etree.ElementTree.Element]] = None
+        ) -> None:
     """
     From the given tag remove the current text.
 
     :param exercise: an xml element with task.
     :type exercise: xml.etree.ElementTree.Element
+    :param table: the children of the exercise by their tags, see
+        'index.index_exercise'. Without it the child is searched.
+    :type table: dict
     """
     try:
-        solution_tag = exercise.find("solution")
+        solution_tag = table.get("solution") if table is not None \
+            else exercise.find("solution")
 
     except Exception:
         logging.warning(f"No childern element: {exercise}")
@@ -50,10 +153,26 @@ def remove_solution(exercise: xml.etree.ElementTree.Element) -> None:
             logging.warning("Missing attribute 'text'.")
 
 
+class ReadmeContent(NamedTuple):
+    """
+    A README file loaded for the processing. The 'text' is set if it was
+    taken from the manifest, otherwise the 'lines' are processed and stored
+    into the manifest under the 'key' with the 'record'.
+    """
+    key: Optional[str]
+    text: Optional[str]
+    lines: List[str]
+    record: Optional[Dict[str, Any]]
+
+
 def process_description(
         task_data: Tuple[str, Dict[str, Optional[str]]],
-        package: str
-        ) -> None:
+        package: str,
+        manifest: Optional[Dict[str, Dict[str, Any]]] = None,
+        stats: Optional[Dict[str, int]] = None,
+        content: Optional[ReadmeContent] = None,
+        text: Optional[str] = None
+        ) -> str:
     """
     Read the content of created README.md paths. Then insert the readed text
     into the tree.
@@ -64,36 +183,161 @@ def process_description(
     :type exercise: xml.etree.ElementTree.Element
     :param package: a name of the package.
     :type package: str
+    :param manifest: the entries of the README manifest. If it is given, the
+        unchanged README files are not read again.
+    :type manifest: dict
+    :param stats: the counters of the manifest hits and misses.
+    :type stats: dict
+    :param content: the README file loaded in advance, see
+        'prefetch_descriptions'. Without it the file is read here.
+    :type content: ReadmeContent
+    :param text: the lines of the content processed in advance, see
+        'text_processor.process_texts'.
+    :type text: str
     :return: an overwritten text.
     :rtype: str
     """
-    lesson = load_lesson_tasks(
-        tu.lessons.get(task_data[1]["lesson"], "nan_lesson")   # type: ignore
-    )
-    name = get_current_name(task_data[0], lesson)
+    if content is None:
+        content = fetch_description(task_data, package, manifest)
+
+    if content.text is not None:
+        if stats is not None:
+            stats["hits"] += 1
+        return content.text
+
+    if text is None:
+        with stage("text.process", 1, task=task_data[0]):
+            text = process_content(content.lines)
+
+    if manifest is not None and content.record is not None:
+        manifest[content.key] = dict(content.record, text=text)  # type: ignore
+        if stats is not None:
+            stats["misses"] += 1
+    return text
+
+
+def prefetch_descriptions(
+        data: List[Tuple[str, Dict[str, Optional[str]]]],
+        package: str,
+        manifest: Optional[Dict[str, Dict[str, Any]]] = None,
+        workers: int = DEFAULT_WORKERS,
+        snapshot: Optional[Snapshot] = None
+        ) -> List[ReadmeContent]:
+    """
+    Load the README files of all the given tasks with a pool of threads. The
+    results are in the same order as the tasks.
 
-    if lesson != "nan_lesson" and name != "nan_task":          # type: ignore
-        lesson_nr = get_current_lesson(task_data, tu.lessons)  # type: ignore
-        process_text(
-            read_description(
-                package, name, lesson_nr
+    :param data: a sequence of the task names with their attributes.
+    :type data: list
+    :param package: a name of the package.
+    :type package: str
+    :param manifest: the entries of the README manifest.
+    :type manifest: dict
+    :param workers: a maximum number of threads reading the files.
+    :type workers: int
+    :param snapshot: the scanned package, see 'fsindex.take_snapshot'.
+    :type snapshot: Snapshot
+    :return: the loaded README files.
+    :rtype: list
+    """
+    if workers <= 1:
+        return [
+            fetch_description(task_data, package, manifest, snapshot)
+            for task_data in data
+        ]
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(
+            pool.map(
+                lambda task_data: fetch_description(
+                    task_data, package, manifest, snapshot
+                ),
+                data
             )
         )
 
 
-def load_lesson_tasks(lesson: str) -> Dict[str, str]:
+def fetch_description(
+        task_data: Tuple[str, Dict[str, Optional[str]]],
+        package: str,
+        manifest: Optional[Dict[str, Dict[str, Any]]] = None,
+        snapshot: Optional[Snapshot] = None
+        ) -> ReadmeContent:
     """
-    Return an object with the name mapping for the specific lesson.
+    Load the README file of the task. With the manifest, the file is read
+    only if it changed since the last run. With the snapshot, the missing
+    file is not opened at all.
+
+    :param task_data: an object with task attributes.
+    :type name: tuple
+    :param package: a name of the package.
+    :type package: str
+    :param manifest: the entries of the README manifest.
+    :type manifest: dict
+    :param snapshot: the scanned package, see 'fsindex.take_snapshot'.
+    :type snapshot: Snapshot
+    :return: the loaded README file.
+    :rtype: ReadmeContent
     """
+    table = get_table()
+    code = task_data[1]["lesson"]
+    name = table.names.get((code, task_data[0]), "nan_task")  # type: ignore
+    lesson_nr = table.folders.get(code, "nan_lesson")         # type: ignore
+
+    if lesson_nr == "nan_lesson" or name == "nan_task":
+        return ReadmeContent(None, None, [], None)
+
+    key = f"tasks/{lesson_nr}/{name}/README.md"
+
+    if snapshot is not None and not exists(
+            snapshot, os.path.join(package, key)
+    ):
+        logging.warning(f"Path does not exist: {key}")
+        return ReadmeContent(None, None, [], None)
+
     try:
-        value = getattr(globals()["tu"], lesson)
+        with stage("readme.read", 1, task=name, lesson=lesson_nr):
+            if manifest is None:
+                return ReadmeContent(
+                    None, None, map_description(package, name, lesson_nr),
+                    None
+                )
+            text, lines, record = fetch_cached(
+                manifest, key, os.path.join(package, key)
+            )
 
-    except AttributeError:
-        output = {}
-    else:
-        output = value
-    finally:
-        return output
+    except FileNotFoundError:
+        logging.warning(f"Path does not exist: {key}")
+        return ReadmeContent(None, None, [], None)
+
+    return ReadmeContent(key, text, lines, record)
+
+
+def process_content(content: List[str]) -> str:
+    """
+    Return the processed text of the README content, the empty content
+    (missing file) gives the empty text.
+
+    :Example:
+    >>> process_content(["intro\\n", "---\\n", "text\\n", "---\\n"])
+    'text'
+    >>> process_content([])
+    ''
+    """
+    return process_text(content) if content else ""
+
+
+def load_lesson_tasks(lesson: str) -> Dict[str, str]:
+    """
+    Return an object with the name mapping for the specific lesson.
+
+    :Example:
+    >>> load_lesson_tasks("lesson01")["slicing_string"]
+    'rozdeleni_stringu'
+    >>> load_lesson_tasks("nan_lesson")
+    {}
+    """
+    return get_table().tasks.get(lesson, {})
 
 
 def get_current_name(old_name: str, pattern: Dict[str, str]) -> str:
@@ -171,7 +415,8 @@ def read_description(pack_path: str, name: str, lesson: str) -> List[str]:
     """
     try:
         with open(
-            os.path.join(pack_path, "tasks", lesson, name, "README.md")
+            os.path.join(pack_path, "tasks", lesson, name, "README.md"),
+            encoding="utf-8"
         ) as md:
             content = md.readlines()
 
@@ -184,6 +429,39 @@ def read_description(pack_path: str, name: str, lesson: str) -> List[str]:
         return output
 
 
+def map_description(pack_path: str, name: str, lesson: str) -> List[str]:
+    """
+    Return the description of the certain task from the memory-mapped
+    README.md file. Only the lines between the delimiters are decoded, see
+    'text_processor.slice_section', the processed text is the same as from
+    'read_description'.
+
+    :param pack_path: a relative path of the package.
+    :type pack_path: str
+    :param name: an previous name of the task.
+    :type name: str
+    :param lesson: a name of the lesson.
+    :param lesson: str
+    :return: a content of the README.md file between the delimiters.
+    :rtype: list
+    """
+    path = os.path.join(pack_path, "tasks", lesson, name, "README.md")
+
+    try:
+        with open(path, "rb") as md:
+            if not os.fstat(md.fileno()).st_size:
+                return []
+            with mmap.mmap(md.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                content = slice_section(buffer)
+
+    except FileNotFoundError:
+        logging.warning(f"Path does not exist: tasks/{lesson}/{name}/README.md")
+        return []
+
+    return read_description(pack_path, name, lesson) \
+        if content is None else content
+
+
 def write_description(
         text: str,
         selected_element: xml.etree.ElementTree.Element,
@@ -0,0 +1,24 @@
+import hashlib
+
+
+def get_digest(filename: str) -> str:
+    """
+    Return the SHA-256 hash of the file content. The file is read in chunks,
+    so the large files are not loaded into the memory at once.
+
+    :param filename: a path of the file.
+    :type filename: str
+    :return: a hexadecimal digest of the content.
+    :rtype: str
+
+    :Example:
+    >>> len(get_digest("src/tests/foo.xml"))
+    64
+    """
+    digest = hashlib.sha256()
+
+    with open(filename, "rb") as source:
+        for chunk in iter(lambda: source.read(1024 * 1024), b""):
+            digest.update(chunk)
+
+    return digest.hexdigest()
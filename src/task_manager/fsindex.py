@@ -0,0 +1,160 @@
+import os
+from typing import Dict, List, NamedTuple, Optional
+
+from task_manager.instrument import stage
+
+
+class Snapshot(NamedTuple):
+    """
+    The entries of all the directories under the scanned roots by their
+    absolute paths. The 'os.DirEntry' objects keep their stat results once
+    they are asked for them.
+    """
+    roots: List[str]
+    directories: Dict[str, Dict[str, "os.DirEntry[str]"]]
+
+
+def take_snapshot(*roots: str, depth: Optional[int] = None) -> Snapshot:
+    """
+    Scan the given directories recursively with 'os.scandir'. The missing
+    roots are skipped.
+
+    :param roots: the paths of the scanned directories.
+    :type roots: str
+    :param depth: a number of the scanned levels under the roots, all of
+        them by default. The deeper paths are checked on the disk.
+    :type depth: int
+    :return: an object with the entries of the directories.
+    :rtype: Snapshot
+
+    :Example:
+    >>> snapshot = take_snapshot("src/tests")
+    >>> exists(snapshot, "src/tests/foo.xml")
+    True
+    >>> exists(snapshot, "src/tests/missing/foo.xml")
+    False
+    """
+    snapshot = Snapshot([os.path.abspath(root) for root in roots], {})
+
+    with stage("snapshot") as current:
+        for root in snapshot.roots:
+            scan_tree(snapshot, root, depth)
+        current.add(len(snapshot.directories))
+
+    return snapshot
+
+
+def scan_tree(
+        snapshot: Snapshot, path: str, depth: Optional[int] = None
+        ) -> None:
+    """
+    Record the entries of the directory and its subdirectories up to the
+    depth. The symbolic links to directories are not followed.
+    """
+    try:
+        with os.scandir(path) as entries:
+            listing = {entry.name: entry for entry in entries}
+
+    except (FileNotFoundError, NotADirectoryError):
+        return
+
+    snapshot.directories[path] = listing
+
+    if depth is not None and depth <= 1:
+        return
+
+    for entry in listing.values():
+        if entry.is_dir(follow_symlinks=False):
+            scan_tree(snapshot, entry.path, depth and depth - 1)
+
+
+def refresh_snapshot(snapshot: Snapshot, path: str) -> None:
+    """
+    Scan the changed directory again, it has to be called after every
+    change of the files under the roots. The removed directory is dropped
+    from the snapshot.
+
+    :param snapshot: an object with the entries of the directories.
+    :type snapshot: Snapshot
+    :param path: a path of the created, changed or removed directory.
+    :type path: str
+    """
+    path = os.path.abspath(path)
+    nested = path.rstrip(os.sep) + os.sep
+
+    for directory in list(snapshot.directories):
+        if directory == path or directory.startswith(nested):
+            del snapshot.directories[directory]
+
+    scan_tree(snapshot, path)
+    parent = os.path.dirname(path)
+
+    if parent in snapshot.directories:
+        listing = snapshot.directories[parent]
+        listing.pop(os.path.basename(path), None)
+
+        with os.scandir(parent) as entries:
+            for entry in entries:
+                if entry.name == os.path.basename(path):
+                    listing[entry.name] = entry
+
+
+def listdir(snapshot: Optional[Snapshot], path: str) -> List[str]:
+    """
+    Return the names in the directory like 'os.listdir'. The directories
+    that are not in the snapshot, or all of them without the snapshot, are
+    listed on the disk.
+
+    :param snapshot: an object with the entries of the directories.
+    :type snapshot: Snapshot
+    :param path: a path of the directory.
+    :type path: str
+    :return: a sequence of the names.
+    :rtype: list
+
+    :Example:
+    >>> sorted(listdir(take_snapshot("src"), "src/task_manager/data"))
+    ['lessons.json']
+    """
+    listing = snapshot.directories.get(os.path.abspath(path)) \
+        if snapshot is not None else None
+    return os.listdir(path) if listing is None else list(listing)
+
+
+def exists(snapshot: Optional[Snapshot], path: str) -> bool:
+    """
+    Return True for the existing path like 'os.path.exists'. The paths that
+    are not under the scanned directories, or all of them without the
+    snapshot, are checked on the disk.
+
+    :param snapshot: an object with the entries of the directories.
+    :type snapshot: Snapshot
+    :param path: a path of the file or the directory.
+    :type path: str
+    :return: True, if the path exists.
+    :rtype: bool
+    """
+    if snapshot is None:
+        return os.path.exists(path)
+
+    target = os.path.abspath(path)
+
+    if target in snapshot.directories:
+        return True
+
+    child, parent = target, os.path.dirname(target)
+
+    while parent not in snapshot.directories:
+        if parent == child:
+            return os.path.exists(path)
+        child, parent = parent, os.path.dirname(parent)
+
+    entry = snapshot.directories[parent].get(os.path.basename(child))
+
+    if entry is None:
+        return False
+    if child == target:
+        return True
+
+    # A path inside a file, or in a directory that was not scanned.
+    return entry.is_dir() and os.path.exists(path)
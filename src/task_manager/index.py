@@ -0,0 +1,123 @@
+import xml.etree.ElementTree
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+
+class ExerciseEntry(NamedTuple):
+    """
+    A single exercise element with the table of its children.
+    """
+    element: xml.etree.ElementTree.Element
+    children: Dict[str, xml.etree.ElementTree.Element]
+
+
+class ExerciseIndex(NamedTuple):
+    """
+    All the exercises of the course, built in a single traversal.
+    """
+    entries: List[ExerciseEntry]
+    solutions: Dict[str, ExerciseEntry]
+
+
+def build_index(
+        root: xml.etree.ElementTree.Element, tag: str = "exercise"
+        ) -> ExerciseIndex:
+    """
+    Return the index of all the exercises under the given root.
+
+    :param root: an object with the content of the XML file.
+    :type root: xml.etree.ElementTree.Element
+    :param tag: a name of the exercise elements.
+    :type tag: str
+    :return: an object with the exercises in the document order and by
+        their solution paths.
+    :rtype: ExerciseIndex
+
+    :Example:
+    >>> import xml.etree.ElementTree as te
+    >>> index = build_index(te.parse("src/tests/bar.xml").getroot())
+    >>> len(index.entries)
+    2
+    >>> index.entries[0].children["skeleton"].get("sourceDir")
+    'exercises/L01/slicing_string/skeleton'
+    """
+    return index_elements(root.iter(tag))
+
+
+def index_elements(
+        exercises: Iterable[xml.etree.ElementTree.Element]
+        ) -> ExerciseIndex:
+    """
+    Return the index of the given exercise elements.
+
+    :param exercises: a sequence of exercise elements.
+    :type exercises: iterable
+    :return: an object with the exercises in the document order and by
+        their solution paths.
+    :rtype: ExerciseIndex
+    """
+    index = ExerciseIndex([], {})
+
+    for exercise in exercises:
+        entry = index_exercise(exercise)
+        index.entries.append(entry)
+
+        path = select_solution_path(entry)
+        if path is not None:
+            index.solutions.setdefault(path, entry)
+
+    return index
+
+
+def index_exercise(exercise: xml.etree.ElementTree.Element) -> ExerciseEntry:
+    """
+    Return the exercise with the table of its children. For the repeated tag
+    the first child is kept, same as with the 'find' method.
+
+    :Example:
+    >>> import xml.etree.ElementTree as te
+    >>> exercise = te.fromstring("<exercise><a x='1'/><a x='2'/></exercise>")
+    >>> index_exercise(exercise).children["a"].get("x")
+    '1'
+    """
+    children: Dict[str, xml.etree.ElementTree.Element] = {}
+
+    for child in exercise:
+        children.setdefault(child.tag, child)
+
+    return ExerciseEntry(exercise, children)
+
+
+def select_solution_path(entry: ExerciseEntry) -> Optional[str]:
+    """
+    Return the relative path of the solution of the given exercise.
+    """
+    solution = entry.children.get("solution")
+    return solution.get("sourceDir") if solution is not None else None
+
+
+def get_exercises(
+        index: ExerciseIndex
+        ) -> List[xml.etree.ElementTree.Element]:
+    """
+    Return the list of all the exercise elements in the document order.
+
+    :Example:
+    >>> import xml.etree.ElementTree as te
+    >>> index = build_index(te.parse("src/tests/exercise.xml").getroot())
+    >>> [exercise.get("name") for exercise in get_exercises(index)]
+    ['Převaděč jednotek']
+    """
+    return [entry.element for entry in index.entries]
+
+
+def get_solution_paths(index: ExerciseIndex, prefix: str) -> List[str]:
+    """
+    Return the relative paths of the solutions that start with the prefix.
+
+    :Example:
+    >>> import xml.etree.ElementTree as te
+    >>> index = build_index(te.parse("src/tests/bar.xml").getroot())
+    >>> get_solution_paths(index, "exercises/")[1]
+    'exercises/L01/string_operations/solution'
+    """
+    return [path for path in index.solutions if path.startswith(prefix)]
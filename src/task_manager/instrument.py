@@ -0,0 +1,504 @@
+import os
+import json
+import time
+import threading
+import tracemalloc
+import functools
+import contextlib
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set
+from typing import Tuple, TypeVar
+
+
+Function = TypeVar("Function", bound=Callable[..., Any])
+
+
+REPORT_FORMAT = 1
+
+ENABLED = False
+TRACING = False
+PROFILING = False
+TOP_SITES = 10
+SITE_STAGES: Tuple[str, ...] = ("collect", "attributes.rewrite", "write")
+FRAMES = 16
+STAGES: Dict[str, Dict[str, float]] = {}
+EVENTS: List[Dict[str, Any]] = []
+THREADS: Set[Tuple[int, int]] = set()
+SITES: Dict[str, List[Dict[str, Any]]] = {}
+LOCK = threading.Lock()
+SESSION = threading.RLock()
+LOCAL = threading.local()
+
+# 'time.thread_time' is new in Python 3.7, the older ones measure the CPU
+# time of the whole process.
+CPU_TIME = getattr(time, "thread_time", time.process_time)
+
+
+class Stage:
+    """
+    A single run of the named stage. The wall time, the CPU time of the
+    current thread and the number of processed items are added to the stage
+    totals at the exit. While tracing, the run is recorded as a span with
+    the given arguments too. While profiling, the peak and the retained
+    memory of the run are measured.
+    """
+    __slots__ = ("name", "items", "wall", "cpu", "args", "memory")
+
+    def __init__(
+            self, name: str, items: int = 0,
+            args: Optional[Dict[str, Any]] = None
+            ) -> None:
+        self.name = name
+        self.items = items
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.args = args
+        self.memory: List[int] = []
+
+    def __enter__(self) -> "Stage":
+        if PROFILING:
+            self.memory = enter_memory()
+        self.wall = time.perf_counter()
+        self.cpu = CPU_TIME()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        wall = time.perf_counter() - self.wall
+        cpu = CPU_TIME() - self.cpu
+
+        if PROFILING:
+            peak, retained = exit_memory(self.memory)
+            sites = get_sites(TOP_SITES) if self.name in SITE_STAGES \
+                and self.name not in SITES else None
+
+        with LOCK:
+            totals = STAGES.setdefault(self.name, new_totals())
+            totals["calls"] += 1
+            totals["items"] += self.items
+            totals["wall"] += wall
+            totals["cpu"] += cpu
+
+            if TRACING:
+                record_span(self.name, self.wall, wall, self.args)
+
+            if PROFILING:
+                totals["peak"] = max(totals.get("peak", 0), peak)
+                totals["retained"] = totals.get("retained", 0) + retained
+                if sites is not None:
+                    SITES[self.name] = sites
+
+    def add(self, items: int = 1) -> None:
+        """
+        Add the number of items processed in this run.
+        """
+        self.items += items
+
+
+class NullStage:
+    """
+    The stage returned while the instrumentation is disabled, it does
+    nothing.
+    """
+    __slots__ = ()
+
+    def __enter__(self) -> "NullStage":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        pass
+
+    def add(self, items: int = 1) -> None:
+        pass
+
+
+NULL_STAGE = NullStage()
+
+
+def stage(name: str, items: int = 0, **args: Any) -> Any:
+    """
+    Return the context manager that measures the stage. While the
+    instrumentation is disabled, the shared no-op stage is returned, so the
+    hooks in the processors cost a single function call.
+
+    :param name: a name of the stage, e.g. 'parse' or 'readme.read'.
+    :type name: str
+    :param items: a number of items processed by the stage.
+    :type items: int
+    :param args: the arguments of the span in the trace, e.g. task name.
+    :type args: dict
+    :return: a context manager with the 'add' method for the items.
+    :rtype: Stage
+
+    :Example:
+    >>> with recording() as stages:
+    ...     with stage("parse") as current:
+    ...         current.add(3)
+    >>> stages["parse"]["calls"], stages["parse"]["items"]
+    (1, 3)
+    """
+    if not ENABLED:
+        return NULL_STAGE
+    return Stage(name, items, args)
+
+
+def measured(name: str) -> Callable[[Function], Function]:
+    """
+    Return the decorator that measures every call of the function as the
+    stage with the given name.
+
+    :param name: a name of the stage.
+    :type name: str
+    :return: a decorator of the function.
+    :rtype: callable
+    """
+    def decorator(function: Function) -> Function:
+        @functools.wraps(function)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not ENABLED:
+                return function(*args, **kwargs)
+            with Stage(name):
+                return function(*args, **kwargs)
+
+        return wrapper  # type: ignore
+
+    return decorator
+
+
+def new_totals() -> Dict[str, float]:
+    """
+    Return the empty totals of the stage.
+    """
+    return {"calls": 0, "items": 0, "wall": 0.0, "cpu": 0.0}
+
+
+def record_span(
+        name: str, start: float, duration: float,
+        args: Optional[Dict[str, Any]] = None
+        ) -> None:
+    """
+    Append the span as the complete event of the Chrome trace format. The
+    times are in microseconds of 'time.perf_counter', which is shared by all
+    the processes on Linux and macOS. The name of the thread is recorded
+    with its first span.
+    """
+    pid, tid = os.getpid(), threading.get_ident()
+
+    if (pid, tid) not in THREADS:
+        THREADS.add((pid, tid))
+        EVENTS.append({
+            "name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+            "args": {"name": threading.current_thread().name}
+        })
+
+    EVENTS.append({
+        "name": name, "cat": "stage", "ph": "X", "pid": pid, "tid": tid,
+        "ts": start * 1e6, "dur": duration * 1e6, "args": args or {}
+    })
+
+
+def enter_memory() -> List[int]:
+    """
+    Return the frame of the memory profile for the new stage: the traced
+    memory at the start and the peak. The peak of the enclosing stage is
+    saved before the peak is reset, so the nested stages do not hide it.
+    """
+    stack = LOCAL.__dict__.setdefault("stack", [])
+    current, peak = tracemalloc.get_traced_memory()
+
+    if stack:
+        stack[-1][1] = max(stack[-1][1], peak)
+    if hasattr(tracemalloc, "reset_peak"):
+        tracemalloc.reset_peak()
+
+    frame = [current, current]
+    stack.append(frame)
+    return frame
+
+
+def exit_memory(frame: List[int]) -> Tuple[int, int]:
+    """
+    Return the peak and the retained memory of the stage in bytes, both
+    relative to the start of the stage.
+    """
+    stack = LOCAL.__dict__.setdefault("stack", [])
+    current, peak = tracemalloc.get_traced_memory()
+    peak = max(frame[1], peak)
+
+    if frame in stack:
+        stack.remove(frame)
+    if stack:
+        stack[-1][1] = max(stack[-1][1], peak)
+
+    return peak - frame[0], current - frame[0]
+
+
+def get_sites(limit: int) -> List[Dict[str, Any]]:
+    """
+    Return the source lines with the most of the memory currently allocated.
+    The memory allocated by the libraries (the XML parser, json) is counted
+    to the line of this package that called them, so the structures of the
+    pipeline are visible.
+    """
+    package = os.path.dirname(os.path.abspath(__file__))
+    sites: Dict[str, List[int]] = {}
+
+    for stat in tracemalloc.take_snapshot().statistics("traceback"):
+        if stat.traceback[-1].filename in (tracemalloc.__file__, __file__):
+            continue
+        frame = next(
+            (
+                frame for frame in reversed(stat.traceback)
+                if frame.filename.startswith(package)
+                and frame.filename != __file__
+            ),
+            stat.traceback[-1]
+        )
+        site = sites.setdefault(f"{frame.filename}:{frame.lineno}", [0, 0])
+        site[0] += stat.size
+        site[1] += stat.count
+
+    return [
+        {"site": site, "size": size, "count": count}
+        for site, (size, count) in sorted(
+            sites.items(), key=lambda item: item[1][0], reverse=True
+        )[:limit]
+    ]
+
+
+def enable() -> None:
+    """
+    Turn the instrumentation on, the totals are kept.
+    """
+    global ENABLED
+    ENABLED = True
+
+
+def disable() -> None:
+    """
+    Turn the instrumentation off, the totals are kept.
+    """
+    global ENABLED
+    ENABLED = False
+
+
+def reset() -> None:
+    """
+    Remove the totals of all the stages and the recorded spans.
+    """
+    with LOCK:
+        STAGES.clear()
+        EVENTS.clear()
+        THREADS.clear()
+        SITES.clear()
+
+
+def get_report() -> Dict[str, Any]:
+    """
+    Return the report with the copy of the totals of all the stages.
+
+    :Example:
+    >>> reset()
+    >>> get_report()
+    {'format': 1, 'stages': {}}
+    """
+    with LOCK:
+        stages = {name: dict(totals) for name, totals in STAGES.items()}
+        sites = dict(SITES)
+
+    report = {"format": REPORT_FORMAT, "stages": stages}
+    if sites:
+        report["sites"] = sites
+    return report
+
+
+def write_report(filename: str) -> None:
+    """
+    Write the report into the JSON file.
+
+    :param filename: a path of the report.
+    :type filename: str
+    """
+    with open(filename, "w", encoding="utf-8") as out:
+        json.dump(get_report(), out, indent=2)
+
+
+@contextlib.contextmanager
+def recording(report: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Measure the stages of the code inside the block from scratch. The
+    totals are available in the yielded object and, with the 'report' path,
+    they are written into the JSON file at the end.
+
+    Only the stages of the current process are measured, the work done in
+    the worker processes ('processes' of the description processor, the
+    batch processor) is not included. The stages of all the threads are
+    measured, the recording started by another thread waits until this one
+    is finished.
+
+    :param report: a path of the JSON report.
+    :type report: str
+    :return: an object filled with the stage names and their totals at the
+        end of the block.
+    :rtype: dict
+    """
+    stages: Dict[str, Any] = {}
+
+    with SESSION:
+        reset()
+        enable()
+
+        try:
+            yield stages
+        finally:
+            disable()
+            stages.update(get_report()["stages"])
+            if report:
+                write_report(report)
+
+
+@contextlib.contextmanager
+def tracing(trace: str) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Record the spans of the stages inside the block and write them into
+    the JSON file in the Chrome trace event format, it can be opened in
+    'chrome://tracing' or in the Perfetto UI. The totals of the stages are
+    collected too, see 'recording'.
+
+    The spans of the batch processor workers are recorded in the worker
+    processes and added to the trace when the courses are finished, see
+    'capture'.
+
+    :param trace: a path of the trace file.
+    :type trace: str
+    :return: a list filled with the recorded events at the end of the block.
+    :rtype: list
+    """
+    global TRACING
+    events: List[Dict[str, Any]] = []
+
+    with SESSION:
+        reset()
+        enable()
+        TRACING = True
+
+        try:
+            yield events
+        finally:
+            TRACING = False
+            disable()
+            with LOCK:
+                events.extend(EVENTS)
+            write_trace(trace)
+
+
+@contextlib.contextmanager
+def profiling(
+        report: Optional[str] = None,
+        top: int = TOP_SITES,
+        sites: Tuple[str, ...] = SITE_STAGES
+        ) -> Iterator[Dict[str, Any]]:
+    """
+    Measure the stages inside the block with the memory profile by the
+    'tracemalloc' module, see 'recording'. Every stage gets the 'peak' (the
+    highest memory allocated during a run) and the 'retained' memory (still
+    allocated at the end of the runs) in bytes, relative to the start of
+    the run.
+
+    The 'sites' of the report list the source lines with the most of the
+    memory allocated at the end of the first run of the selected stages. By
+    default these are the ends of the parsing ('collect', the tree, the index
+    and the collected data are alive), of the attribute rewrite and of the
+    writing. Every snapshot takes tens of microseconds per live allocation.
+
+    The tracing of the memory slows the code down several times. The peaks
+    of the stages running in parallel threads (README reading) include the
+    memory of each other, use 'workers=1' for the exact numbers.
+
+    :param report: a path of the JSON report.
+    :type report: str
+    :param top: a number of the allocation sites for every stage.
+    :type top: int
+    :param sites: the names of the stages with the allocation sites.
+    :type sites: tuple
+    :return: an object filled with the stage names and their totals at the
+        end of the block.
+    :rtype: dict
+    """
+    global PROFILING, TOP_SITES, SITE_STAGES
+    stages: Dict[str, Any] = {}
+
+    with SESSION:
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start(FRAMES)
+        reset()
+        enable()
+        PROFILING, TOP_SITES, SITE_STAGES = True, top, sites
+
+        try:
+            yield stages
+        finally:
+            PROFILING = False
+            disable()
+            if started:
+                tracemalloc.stop()
+            stages.update(get_report()["stages"])
+            if report:
+                write_report(report)
+
+
+def write_trace(filename: str) -> None:
+    """
+    Write the recorded spans into the JSON file in the Chrome trace format.
+
+    :param filename: a path of the trace file.
+    :type filename: str
+    """
+    with LOCK:
+        events = list(EVENTS)
+
+    with open(filename, "w", encoding="utf-8") as out:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, out)
+
+
+def get_state() -> Tuple[bool, bool]:
+    """
+    Return whether the instrumentation and the tracing are on. The state is
+    passed to the worker processes, see 'capture'.
+    """
+    return ENABLED, TRACING
+
+
+@contextlib.contextmanager
+def capture(state: Tuple[bool, bool]) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Record the spans of the block in a worker process with the state of the
+    parent process. The yielded list is filled with the spans at the end,
+    the parent adds them to its trace with 'add_events'. The spans inherited
+    from the parent or left by the previous task of the worker are dropped.
+
+    :param state: the state of the parent process, see 'get_state'.
+    :type state: tuple
+    :return: a list filled with the recorded spans at the end.
+    :rtype: list
+    """
+    global ENABLED, TRACING
+    previous = get_state()
+    ENABLED, TRACING = state
+    reset()
+    captured: List[Dict[str, Any]] = []
+
+    try:
+        yield captured
+    finally:
+        with LOCK:
+            captured.extend(EVENTS)
+        reset()
+        ENABLED, TRACING = previous
+
+
+def add_events(events: List[Dict[str, Any]]) -> None:
+    """
+    Add the spans recorded in a worker process to the trace.
+    """
+    with LOCK:
+        EVENTS.extend(events)
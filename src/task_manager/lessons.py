@@ -0,0 +1,93 @@
+import os
+import json
+import functools
+from typing import Dict, NamedTuple, Optional, Tuple
+
+
+LESSONS_FORMAT = 1
+LESSONS_ENV = "TASK_MANAGER_LESSONS"
+DEFAULT_LESSONS = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "data", "lessons.json"
+)
+
+
+class LessonTable(NamedTuple):
+    """
+    The name mapping of all the lessons, compiled into flat tables.
+    """
+    folders: Dict[str, str]
+    codes: Dict[str, str]
+    tasks: Dict[str, Dict[str, str]]
+    names: Dict[Tuple[str, str], str]
+
+
+def get_table(filename: Optional[str] = None) -> LessonTable:
+    """
+    Return the compiled name mapping. The file is read only once, the next
+    calls return the same table.
+
+    :param filename: a path of the JSON file with the mapping. If it is not
+        given, the 'TASK_MANAGER_LESSONS' variable or the bundled file is
+        used.
+    :type filename: str
+    :return: an object with the lesson folders and the task names.
+    :rtype: LessonTable
+
+    :Example:
+    >>> table = get_table()
+    >>> table.folders["L01"], table.codes["lesson01"]
+    ('lesson01', 'L01')
+    >>> table.names[("L01", "slicing_string")]
+    'rozdeleni_stringu'
+    """
+    return load_table(
+        os.path.abspath(
+            filename or os.environ.get(LESSONS_ENV) or DEFAULT_LESSONS
+        )
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def load_table(filename: str) -> LessonTable:
+    """
+    Read the JSON file with the mapping and compile it into the table.
+    """
+    with open(filename, encoding="utf-8") as source:
+        content = json.load(source)
+
+    if content.get("format") != LESSONS_FORMAT:
+        raise ValueError(f"Unknown format of the lesson mapping: {filename}")
+
+    return compile_table(content["lessons"], content["tasks"])
+
+
+def compile_table(
+        folders: Dict[str, str],
+        tasks: Dict[str, Dict[str, str]]
+        ) -> LessonTable:
+    """
+    Return the table with the lessons and the task names keyed by the pair
+    of the lesson code and the previous name of the task.
+
+    :param folders: an object with the lesson codes and their folders.
+    :type folders: dict
+    :param tasks: an object with the folders and the task name mappings.
+    :type tasks: dict
+    :return: an object with the lesson folders and the task names.
+    :rtype: LessonTable
+
+    :Example:
+    >>> table = compile_table({"L01": "lesson01"}, {"lesson01": {"a": "b"}})
+    >>> table.codes, table.names
+    ({'lesson01': 'L01'}, {('L01', 'a'): 'b'})
+    """
+    return LessonTable(
+        dict(folders),
+        {folder: code for code, folder in folders.items()},
+        {folder: dict(names) for folder, names in tasks.items()},
+        {
+            (code, old_name): new_name
+            for code, folder in folders.items()
+            for old_name, new_name in tasks.get(folder, {}).items()
+        }
+    )
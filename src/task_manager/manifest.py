@@ -0,0 +1,176 @@
+import io
+import os
+import json
+import hashlib
+import logging
+import tempfile
+import contextlib
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from task_manager.text_processor import TEXT_VERSION, slice_section
+
+
+MANIFEST_FORMAT = 1
+
+
+def load_manifest(filename: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Return the entries of the README manifest or an empty object, if the
+    manifest does not exist yet or its texts were processed by another
+    version of the text processing, see 'text_processor.TEXT_VERSION'.
+
+    :param filename: a path of the manifest file.
+    :type filename: str
+    :return: an object with README paths as keys and their records as values.
+    :rtype: dict
+    """
+    output: Dict[str, Dict[str, Any]]
+
+    try:
+        with open(filename, encoding="utf-8") as source:
+            content = json.load(source)
+
+    except FileNotFoundError:
+        output = {}
+    except ValueError:
+        logging.warning(f"Cannot read the manifest: {filename}")
+        output = {}
+    else:
+        output = content.get("entries", {}) \
+            if content.get("format") == MANIFEST_FORMAT \
+            and content.get("text") == TEXT_VERSION else {}
+    finally:
+        return output
+
+
+def save_manifest(filename: str, entries: Dict[str, Dict[str, Any]]) -> None:
+    """
+    Write the entries into the README manifest. The file is replaced at once.
+
+    :param filename: a path of the manifest file.
+    :type filename: str
+    :param entries: an object with README paths and their records.
+    :type entries: dict
+    """
+    directory = os.path.dirname(os.path.abspath(filename))
+    handle, temp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+
+    with os.fdopen(handle, "w", encoding="utf-8") as target:
+        json.dump(
+            {"format": MANIFEST_FORMAT, "text": TEXT_VERSION,
+             "entries": entries},
+            target, ensure_ascii=False
+        )
+    os.replace(temp, filename)
+
+
+def prune_manifest(
+        entries: Dict[str, Dict[str, Any]], package: str
+        ) -> Dict[str, Dict[str, Any]]:
+    """
+    Remove the records of the README files that no longer exist.
+
+    :param entries: an object with README paths and their records.
+    :type entries: dict
+    :param package: a path of the package, the README paths are relative to
+        it.
+    :type package: str
+    :return: the same object without the removed README files.
+    :rtype: dict
+
+    :Example:
+    >>> prune_manifest({"missing/README.md": {}, "README.md": {}}, ".")
+    {'README.md': {}}
+    """
+    for key in [
+            key for key in entries
+            if not os.path.exists(os.path.join(package, key))
+    ]:
+        del entries[key]
+    return entries
+
+
+@contextlib.contextmanager
+def using_manifest(
+        filename: Optional[str], package: str
+        ) -> Iterator[Tuple[Optional[Dict[str, Dict[str, Any]]],
+                            Dict[str, int]]]:
+    """
+    Load the README manifest for the block and save it at the end, without
+    the records of the removed README files. The numbers of the manifest
+    hits and misses counted in the block are logged. Without the filename
+    the block runs without any manifest.
+
+    :param filename: a path of the manifest file.
+    :type filename: str
+    :param package: a path of the package with the README files.
+    :type package: str
+    :return: a pair of the manifest entries (None without the manifest) and
+        the counters of the hits and misses.
+    :rtype: tuple
+    """
+    entries = load_manifest(filename) if filename else None
+    stats = {"hits": 0, "misses": 0}
+
+    yield entries, stats
+
+    if filename and entries is not None:
+        save_manifest(filename, prune_manifest(entries, package))
+        logging.info(
+            f"README manifest: {stats['hits']} hits, {stats['misses']} misses"
+        )
+
+
+def fetch_cached(
+        entries: Dict[str, Dict[str, Any]],
+        key: str,
+        path: str
+        ) -> Tuple[Optional[str], List[str], Optional[Dict[str, Any]]]:
+    """
+    Return the text of the README file from the manifest. If the file
+    changed, return its lines instead with the new record (without the
+    text), the caller processes the lines and stores the record.
+
+    :param entries: an object with README paths and their records.
+    :type entries: dict
+    :param key: a key of the record in the manifest.
+    :type key: str
+    :param path: a path of the README file.
+    :type path: str
+    :return: the cached text or the lines with the new record.
+    :rtype: tuple
+    """
+    stat = os.stat(path)
+    record = entries.get(key)
+
+    if record and record["size"] == stat.st_size \
+            and record["mtime"] == stat.st_mtime_ns:
+        return record["text"], [], None
+
+    with open(path, "rb") as source:
+        raw = source.read()
+    digest = hashlib.sha256(raw).hexdigest()
+
+    if record and record["digest"] == digest:
+        record.update(size=stat.st_size, mtime=stat.st_mtime_ns)
+        return record["text"], [], None
+
+    lines = slice_section(raw)
+
+    return None, decode_lines(raw) if lines is None else lines, {
+        "size": stat.st_size,
+        "mtime": stat.st_mtime_ns,
+        "digest": digest
+    }
+
+
+def decode_lines(raw: bytes) -> List[str]:
+    """
+    Return the lines of the file content, the same as 'readlines' of the
+    file opened in the text mode.
+
+    :Example:
+    >>> decode_lines(b"first\\r\\nsecond")
+    ['first\\n', 'second']
+    """
+    return io.TextIOWrapper(io.BytesIO(raw), encoding="utf-8").readlines()
@@ -1,23 +1,105 @@
+import os
 import xml.etree.ElementTree
+from typing import Any, Iterator, Optional, cast
 
+try:
+    import lxml.etree
+except ImportError:
+    LXML_AVAILABLE = False
+else:
+    LXML_AVAILABLE = True
 
-def get_xml_root(filename: str) -> xml.etree.ElementTree.ElementTree:
+
+def get_backend(name: Optional[str] = None) -> Any:
+    """
+    Return the module used for parsing the XML files.
+
+    The name is one of 'stdlib', 'lxml' and 'auto'. If it is not given, the
+    environment variable 'TASK_MANAGER_XML_BACKEND' is used, the standard
+    library is the default. The 'auto' backend picks lxml when it is
+    installed and the standard library otherwise.
+
+    :param name: a name of the backend.
+    :type name: str
+    :return: a module 'lxml.etree' or 'xml.etree.ElementTree'.
+    :rtype: module
+
+    :Example:
+    >>> get_backend().__name__
+    'xml.etree.ElementTree'
+    """
+    name = name or os.environ.get("TASK_MANAGER_XML_BACKEND", "stdlib")
+
+    if name == "lxml" or (name == "auto" and LXML_AVAILABLE):
+        if not LXML_AVAILABLE:
+            raise ImportError("The XML backend 'lxml' is not installed")
+        return lxml.etree
+    if name in ("auto", "stdlib"):
+        return xml.etree.ElementTree
+    raise ValueError(f"Unknown XML backend: {name}")
+
+
+def get_xml_root(
+        filename: str, backend: Optional[str] = None
+        ) -> xml.etree.ElementTree.ElementTree:
     """
     Get the root of the XML structure.
 
     :param filename: a name of the xml file.
     :type filename: str
-    :return: an object with the content of the xml.
-    :rtype: xml.etree.ElementTree.Element
+    :param backend: a name of the backend, see 'get_backend'.
+    :type backend: str
+    :return: an object with the content of the xml, 'lxml.etree._ElementTree'
+        with the lxml backend.
+    :rtype: xml.etree.ElementTree.ElementTree
 
     :Example:
     >>> isinstance(
-    ...     get_xml_root("src/tests/foo.xml"),
-    ...     xml.etree.ElementTree.ElementTree
+    ...     get_xml_root("src/tests/foo.xml"), xml.etree.ElementTree.ElementTree
     ... )
     True
     """
-    return xml.etree.ElementTree.parse(filename)
+    module = get_backend(backend)
+
+    if module is xml.etree.ElementTree:
+        tree = module.parse(filename)
+    else:
+        tree = module.parse(
+            filename, module.XMLParser(remove_comments=True, remove_pis=True)
+        )
+    return cast(xml.etree.ElementTree.ElementTree, tree)
+
+
+def get_root(
+        tree: xml.etree.ElementTree.ElementTree
+        ) -> xml.etree.ElementTree.Element:
+    """
+    Return the root element of the parsed tree.
+
+    :Example:
+    >>> get_root(get_xml_root("src/tests/foo.xml")).tag
+    'data'
+    """
+    root = tree.getroot()
+
+    if root is None:
+        raise ValueError("The XML tree has no root element")
+    return root
+
+
+def iterparse_xml(filename: str, backend: Optional[str] = None) -> Any:
+    """
+    Return the iterator over the 'start' and 'end' events of the XML file.
+    Both backends skip the comments and the processing instructions.
+    """
+    module = get_backend(backend)
+
+    if module is xml.etree.ElementTree:
+        return module.iterparse(filename, events=("start", "end"))
+    return module.iterparse(
+        filename, events=("start", "end"),
+        remove_comments=True, remove_pis=True
+    )
 
 
 def set_xml_attr(**kwargs):
@@ -34,6 +116,54 @@ def set_xml_attr(**kwargs):
     }
 
 
+def iter_xml_elements(
+        filename: str, tag: str, backend: Optional[str] = None
+        ) -> Iterator[xml.etree.ElementTree.Element]:
+    """
+    Yield the elements with the given tag one by one, as soon as they are
+    parsed. Every yielded element is cleared once the caller asks for the next
+    one, so the memory use does not grow with the size of the file.
+
+    :param filename: a name of the xml file.
+    :type filename: str
+    :param tag: a name of the searched element.
+    :type tag: str
+    :param backend: a name of the backend, see 'get_backend'.
+    :type backend: str
+    :return: an iterator over the complete elements.
+    :rtype: iterator
+
+    :Example:
+    >>> for country in iter_xml_elements("src/tests/foo.xml", "country"):
+    ...     print(country.attrib["name"])
+    Liechtenstein
+    Singapore
+    Panama
+    """
+    depth = 0
+
+    for event, element in iterparse_xml(filename, backend):
+        if element.tag != tag:
+            continue
+        if event == "start":
+            depth += 1
+            continue
+        depth -= 1
+
+        if not depth:
+            yield element
+            release_element(element)
+
+
+def release_element(element: xml.etree.ElementTree.Element) -> None:
+    """
+    Drop the content of the processed element, keep only its tail.
+    """
+    tail = element.tail
+    element.clear()
+    element.tail = tail
+
+
 if __name__ == "__main__":
     import doctest
     doctest.testmod()
@@ -0,0 +1,453 @@
+import os
+import json
+import shutil
+import logging
+import tempfile
+import itertools
+import concurrent.futures
+from typing import List, NamedTuple, Sequence, Set, Tuple
+
+from task_manager.copier import DEFAULT_STRATEGIES, copy_file, is_unchanged
+from task_manager.description import load_lesson_tasks
+from task_manager.fsindex import exists, listdir, take_snapshot
+from task_manager.instrument import stage
+from task_manager.lessons import get_table
+
+
+JOURNAL_FORMAT = 1
+PLAN_STASH = ".task_manager_plan"
+DEFAULT_PLAN_WORKERS = 8
+
+# The batches of the operations, every batch depends on the previous ones.
+REMOVE, RENAME, CREATE, FILL, COPY = range(5)
+
+
+class Operation(NamedTuple):
+    """
+    A single change of the repository. The 'remove' moves the source to the
+    stash, the 'rename' moves it to the target, the 'mkdir' and the 'touch'
+    create the target folder and the empty file. The 'copy' moves the
+    existing target to the backup in the stash first.
+    """
+    kind: str
+    source: str
+    target: str
+    batch: int
+    backup: str = ""
+
+
+class Journal(NamedTuple):
+    """
+    The planned operations with the indexes of the finished ones, they are
+    saved in the journal file.
+    """
+    path: str
+    stash: str
+    operations: List[Operation]
+    done: Set[int]
+
+
+class PlanSummary(NamedTuple):
+    """
+    The numbers of the applied operations and of the ones finished by the
+    interrupted run, with the failed operations and their errors.
+    """
+    applied: int
+    resumed: int
+    errors: List[Tuple[Operation, str]]
+
+
+def plan_lesson(
+        engeto_repo: str,
+        lesson_num: str,
+        package: str,
+        stash: str,
+        sync: bool = False
+        ) -> List[Operation]:
+    """
+    Return all the operations of 'processor.task_content_processor' for the
+    lesson, computed from a single scan of the lesson and the package.
+
+    The redundant operations are left out: the renames to the same name,
+    the removal of the tasks that already have their package name (they
+    would be created again as missing tasks), the copies of the missing
+    package files and, with 'sync', the copies of the unchanged files.
+
+    :param engeto_repo: a path to the repository.
+    :type engeto_repo: str
+    :param lesson_num: a name of the lesson in the package, e.g. 'lesson01'.
+    :type lesson_num: str
+    :param package: a path to the lesson in the package.
+    :type package: str
+    :param stash: a path of the folder for the removed and the overwritten
+        files, see 'make_stash'.
+    :type stash: str
+    :param sync: leave out the copies of the unchanged files.
+    :type sync: bool
+    :return: a sequence of the operations in the order of their batches.
+    :rtype: list
+    """
+    lesson = get_table().codes[lesson_num]
+    exercises = os.path.join(os.path.abspath(engeto_repo), "exercises")
+    lesson_path = os.path.join(exercises, lesson)
+    package = os.path.abspath(package)
+    snapshot = take_snapshot(lesson_path, package, depth=2)
+    names = load_lesson_tasks(lesson_num)
+    package_tasks = set(listdir(snapshot, package))
+    operations: List[Operation] = []
+    current = {}
+
+    def stash_path(path: str) -> str:
+        name = f"{len(operations)}-{os.path.basename(path)}"
+        return os.path.join(stash, name)
+
+    for folder in sorted(os.listdir(exercises)):
+        if folder != lesson:
+            path = os.path.join(exercises, folder)
+            operations.append(
+                Operation("remove", path, stash_path(path), REMOVE)
+            )
+
+    for folder in sorted(listdir(snapshot, lesson_path)):
+        path = os.path.join(lesson_path, folder)
+        updated = names.get(folder)
+
+        if updated is None and folder in package_tasks:
+            current[folder] = path
+        elif updated is None:
+            operations.append(
+                Operation("remove", path, stash_path(path), REMOVE)
+            )
+        else:
+            current[updated] = path
+            if updated != folder:
+                operations.append(
+                    Operation(
+                        "rename", path, os.path.join(lesson_path, updated),
+                        RENAME
+                    )
+                )
+
+    def add_copy(source: str, name: str, target: str) -> None:
+        original = os.path.join(current.get(name, ""), target)
+        target = os.path.join(lesson_path, name, target)
+
+        if not exists(snapshot, source):
+            logging.warning(f"Path does not exist: {source}")
+        elif name not in current or not exists(snapshot, original):
+            operations.append(Operation("copy", source, target, COPY))
+        elif not sync or not is_unchanged(source, original):
+            operations.append(
+                Operation("copy", source, target, COPY, stash_path(target))
+            )
+
+    for name in sorted(current):
+        if name in package_tasks \
+                and exists(snapshot, os.path.join(current[name], "solution")):
+            add_copy(
+                os.path.join(package, name, f"{name}.py"), name,
+                os.path.join("solution", "main.py")
+            )
+
+    for name in sorted(package_tasks.difference(current, ["__init__.py"])):
+        task = os.path.join(lesson_path, name)
+        operations.extend([
+            Operation("mkdir", "", task, CREATE),
+            Operation("mkdir", "", os.path.join(task, "skeleton"), FILL),
+            Operation("mkdir", "", os.path.join(task, "solution"), FILL),
+            Operation(
+                "touch", "", os.path.join(task, "skeleton", "main.py"), COPY
+            )
+        ])
+        add_copy(
+            os.path.join(package, name, f"{name}.py"), name,
+            os.path.join("solution", "main.py")
+        )
+
+    for name in sorted(package_tasks.difference(["__init__.py"])):
+        add_copy(
+            os.path.join(package, name, f"test_{name}.py"), name, "tests.py"
+        )
+
+    return sorted(operations, key=lambda operation: operation.batch)
+
+
+def make_stash(engeto_repo: str) -> str:
+    """
+    Create a new stash of the plan in the repository, it is on the same
+    filesystem as the changed files. The stash of another plan has to be
+    removed first, by resuming or rolling back its journal.
+
+    :param engeto_repo: a path to the repository.
+    :type engeto_repo: str
+    :return: a path of the empty stash.
+    :rtype: str
+    """
+    engeto_repo = os.path.abspath(engeto_repo)
+    stashes = sorted(
+        name for name in os.listdir(engeto_repo)
+        if name.startswith(PLAN_STASH)
+    )
+
+    if stashes:
+        raise FileExistsError(
+            f"Another plan is not finished: {stashes[0]}, resume or roll "
+            f"back its journal first"
+        )
+
+    return tempfile.mkdtemp(prefix=f"{PLAN_STASH}-", dir=engeto_repo)
+
+
+def start_plan(
+        path: str, operations: List[Operation], stash: str
+        ) -> Journal:
+    """
+    Write the journal file with the operations and create the stash for the
+    removed and the overwritten files.
+
+    :param path: a path of the journal file.
+    :type path: str
+    :param operations: a sequence of the operations, see 'plan_lesson'.
+    :type operations: list
+    :param stash: a path of the folder for the removed files, see
+        'make_stash'.
+    :type stash: str
+    :return: an object with the journal.
+    :rtype: Journal
+    """
+    with open(path, "w", encoding="utf-8") as out:
+        json.dump(
+            {
+                "format": JOURNAL_FORMAT,
+                "stash": stash,
+                "operations": [list(operation) for operation in operations]
+            },
+            out
+        )
+        out.write("\n")
+        out.flush()
+        os.fsync(out.fileno())
+
+    return Journal(path, stash, operations, set())
+
+
+def load_journal(path: str) -> Journal:
+    """
+    Return the journal of the interrupted run. The last line can be cut off
+    by the interruption, it is ignored.
+
+    :param path: a path of the journal file.
+    :type path: str
+    :return: an object with the journal.
+    :rtype: Journal
+    """
+    with open(path, encoding="utf-8") as journal:
+        header = json.loads(journal.readline())
+        done = set()
+
+        for line in journal:
+            try:
+                done.add(json.loads(line)["done"])
+            except ValueError:
+                break
+
+    if header.get("format") != JOURNAL_FORMAT:
+        raise ValueError(f"Unsupported journal format: {header.get('format')}")
+
+    return Journal(
+        path, header["stash"],
+        [Operation(*operation) for operation in header["operations"]], done
+    )
+
+
+def run_plan(
+        journal: Journal,
+        workers: int = DEFAULT_PLAN_WORKERS,
+        strategies: Sequence[str] = DEFAULT_STRATEGIES
+        ) -> PlanSummary:
+    """
+    Apply the operations that are not finished yet, batch by batch with a
+    pool of threads. Every finished operation is written to the journal. The
+    run stops after the batch with a failed operation, it can be resumed or
+    rolled back, see 'rollback_plan'.
+
+    :param journal: an object with the journal, see 'start_plan'.
+    :type journal: Journal
+    :param workers: a maximum number of the operations run at once.
+    :type workers: int
+    :param strategies: the ways of copying, see 'copier.copy_file'.
+    :type strategies: tuple
+    :return: an object with the numbers of the applied operations.
+    :rtype: PlanSummary
+    """
+    summary = PlanSummary(0, len(journal.done), [])
+    indexes = [
+        index for index in range(len(journal.operations))
+        if index not in journal.done
+    ]
+
+    with open(journal.path, "a", encoding="utf-8") as out, \
+            concurrent.futures.ThreadPoolExecutor(workers) as pool:
+        for batch, group in itertools.groupby(
+                indexes, key=lambda index: journal.operations[index].batch
+        ):
+            with stage("plan.batch", batch=batch) as current:
+                futures = {
+                    pool.submit(
+                        apply_operation, journal.operations[index], strategies
+                    ): index
+                    for index in group
+                }
+                for future in concurrent.futures.as_completed(futures):
+                    index = futures[future]
+                    try:
+                        future.result()
+                    except OSError as error:
+                        summary.errors.append((
+                            journal.operations[index],
+                            f"{type(error).__name__}: {error}"
+                        ))
+                        continue
+                    journal.done.add(index)
+                    out.write(json.dumps({"done": index}) + "\n")
+                    summary = summary._replace(applied=summary.applied + 1)
+
+                current.add(len(futures))
+                out.flush()
+                os.fsync(out.fileno())
+
+            if summary.errors:
+                break
+
+    return summary
+
+
+def apply_operation(
+        operation: Operation, strategies: Sequence[str] = DEFAULT_STRATEGIES
+        ) -> None:
+    """
+    Apply the operation. It can be applied again after an interruption.
+    """
+    kind, source, target, _, backup = operation
+
+    if kind in ("remove", "rename"):
+        if os.path.lexists(source) or not os.path.lexists(target):
+            os.rename(source, target)
+    elif kind == "mkdir":
+        os.makedirs(target, exist_ok=True)
+    elif kind == "touch":
+        open(target, "a").close()
+    elif kind == "copy":
+        if backup and os.path.lexists(target) \
+                and not os.path.lexists(backup):
+            os.rename(target, backup)
+        copy_file(source, target, strategies)
+    else:
+        raise ValueError(f"Unknown operation: {kind}")
+
+
+def revert_operation(operation: Operation) -> None:
+    """
+    Undo the operation, if it was applied.
+    """
+    kind, source, target, _, backup = operation
+
+    if kind in ("remove", "rename"):
+        if os.path.lexists(target) and not os.path.lexists(source):
+            os.rename(target, source)
+    elif kind == "mkdir":
+        if os.path.isdir(target):
+            shutil.rmtree(target)
+    elif kind == "copy" and backup:
+        if os.path.lexists(backup):
+            os.replace(backup, target)
+    elif os.path.lexists(target):
+        os.remove(target)
+
+
+def rollback_plan(journal: Journal) -> None:
+    """
+    Undo the operations of the interrupted run in the reverse order and
+    remove the journal, the repository is the same as before the run.
+
+    :param journal: an object with the journal, see 'load_journal'.
+    :type journal: Journal
+    """
+    for operation in sorted(
+            journal.operations, key=lambda operation: operation.batch,
+            reverse=True
+    ):
+        revert_operation(operation)
+
+    finish_plan(journal)
+
+
+def finish_plan(journal: Journal) -> None:
+    """
+    Remove the stash with the removed and the overwritten files and the
+    journal.
+
+    :param journal: an object with the journal.
+    :type journal: Journal
+    """
+    shutil.rmtree(journal.stash, ignore_errors=True)
+    os.remove(journal.path)
+
+
+def run_journaled(
+        engeto_repo: str,
+        lesson_num: str,
+        package: str,
+        path: str,
+        sync: bool = False,
+        strategies: Sequence[str] = DEFAULT_STRATEGIES,
+        workers: int = DEFAULT_PLAN_WORKERS
+        ) -> PlanSummary:
+    """
+    Plan and apply the changes of the lesson with the journal in the given
+    path. The existing journal is resumed instead. The journal and its stash
+    are removed after the successful run, otherwise they are kept for the
+    next run or for 'rollback_plan'. A new plan is refused while the stash
+    of another one exists.
+
+    :param engeto_repo: a path to the repository.
+    :type engeto_repo: str
+    :param lesson_num: a name of the lesson in the package, e.g. 'lesson01'.
+    :type lesson_num: str
+    :param package: a path to the lesson in the package.
+    :type package: str
+    :param path: a path of the journal file.
+    :type path: str
+    :param sync: leave out the copies of the unchanged files.
+    :type sync: bool
+    :param strategies: the ways of copying, see 'copier.copy_file'.
+    :type strategies: tuple
+    :param workers: a maximum number of the operations run at once.
+    :type workers: int
+    :return: an object with the numbers of the applied operations.
+    :rtype: PlanSummary
+    """
+    if os.path.exists(path):
+        journal = load_journal(path)
+        logging.info(
+            f"Resuming {path}: {len(journal.done)} of "
+            f"{len(journal.operations)} operations are finished"
+        )
+    else:
+        stash = make_stash(engeto_repo)
+        try:
+            with stage("plan.build"):
+                operations = plan_lesson(
+                    engeto_repo, lesson_num, package, stash, sync
+                )
+            journal = start_plan(path, operations, stash)
+        except BaseException:
+            shutil.rmtree(stash)
+            raise
+
+    summary = run_plan(journal, workers, strategies)
+
+    if not summary.errors:
+        finish_plan(journal)
+
+    return summary
@@ -1,82 +1,368 @@
 import os
+import time
+import logging
+import traceback
+import concurrent.futures
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
 
-import task_manager.utils as tu
+from task_manager.cache import load_course
+from task_manager.writer import Sink, stream_xml
 
-from task_manager.parser import get_xml_root
+from task_manager.description import replace_descriptions, describe_exercise
+from task_manager.description import DEFAULT_WORKERS
+from task_manager.manifest import using_manifest
 
-from task_manager.description import replace_descriptions
+from task_manager.index import get_exercises
+from task_manager.instrument import measured, stage
+from task_manager.lessons import get_table
 
-from task_manager.tasknames import create_task_data
-from task_manager.tasknames import get_all_tasks, get_task_names
-
-from task_manager.attributes import replace_attributes
-from task_manager.attributes import replace_values, collect_data
+from task_manager.attributes import replace_attributes, rewrite_exercise
+from task_manager.attributes import replace_values
 
 from task_manager.cleaner import remove_unused_lessons
 from task_manager.cleaner import rename_dirs, move_content, move_tests
+from task_manager.copier import DEFAULT_STRATEGIES, CopySummary
+from task_manager.fsindex import take_snapshot
+from task_manager.trash import Trash, open_trash, close_trash
+from task_manager.planner import run_journaled
+
+
+DEFAULT_PACKAGE = "../engeto_tasks/tasks"
+DEFAULT_LESSON_WORKERS = 4
 
 
-def task_desc_processor(engeto: str, task_p: str) -> None:
+class LessonResult(NamedTuple):
+    """
+    A result of the content processing of one lesson, see 'process_lesson'.
+    """
+    lesson: str
+    error: Optional[str]
+    seconds: float
+    content: CopySummary
+    tests: CopySummary
+
+
+@measured("task_desc_processor")
+def task_desc_processor(
+        engeto: str,
+        task_p: str,
+        stream: bool = False,
+        backend: Optional[str] = None,
+        cache_dir: Optional[str] = None,
+        manifest: Optional[str] = None,
+        workers: int = DEFAULT_WORKERS,
+        processes: Optional[int] = None,
+        output: Sink = "output_desc.xml",
+        scan: bool = False
+        ) -> Dict[str, int]:
     """
     Run the processor of the descriptions in a XML source file.
+
+    With 'stream' set, the course is parsed one exercise at a time, so the
+    memory use stays flat regardless of the size of the file. The 'backend'
+    selects the XML parser, see 'parser.get_backend'. With 'cache_dir' the
+    parsed course is reused from the cache, see 'cache.load_course'. With
+    'manifest' only the changed README files are processed again, the
+    numbers of the manifest hits and misses are returned. The README files
+    are loaded by a pool of 'workers' threads and, with 'processes' set,
+    processed by a pool of processes. The 'output' is a path, a file
+    descriptor or a file object, see 'writer.open_sink'. With 'scan' the
+    package is scanned once and the missing README files are not opened,
+    see 'fsindex.take_snapshot'.
     """
     rel_path = os.path.join(engeto, f"course_{os.path.basename(engeto)}.xml")
-    tree = get_xml_root(rel_path)
 
-    exercises = get_all_tasks(tree.getroot(), "exercise")
-    task_names = get_task_names(
-        tree.getroot(), "solution",
-        "sourceDir", "exercises/"
+    if stream:
+        with using_manifest(manifest, task_p) as (entries, stats):
+            stream_xml(
+                rel_path, "exercise",
+                lambda exercise: describe_exercise(
+                    exercise, task_p, entries, stats
+                ),
+                output, backend
+            )
+        return stats
+
+    course = load_course(rel_path, cache_dir, backend)
+    return replace_descriptions(
+        course.tree, course.task_data,
+        get_exercises(course.exercise_index), task_p, course.exercise_index,
+        manifest, workers, processes, output,
+        take_snapshot(os.path.join(task_p, "tasks")) if scan else None
     )
-    task_data = create_task_data(task_names)
-    replace_descriptions(tree, task_data, exercises, task_p)
 
 
-def task_attr_processor(source: str) -> None:
+@measured("task_attr_processor")
+def task_attr_processor(
+        source: str,
+        stream: bool = False,
+        backend: Optional[str] = None,
+        cache_dir: Optional[str] = None,
+        output: Sink = "output_attr.xml"
+        ) -> None:
     """
     Run the main function for the overwritting the attributes.
+
+    With 'stream' set, the source is parsed one exercise at a time. With
+    'cache_dir' the parsed source is reused from the cache. The 'output' is
+    a path, a file descriptor or a file object, see 'writer.open_sink'.
     """
-    tree = get_xml_root(source)
-    exercises = get_all_tasks(tree.getroot(), "exercise")
+    if stream:
+        stream_xml(source, "exercise", rewrite_exercise, output, backend)
+        return
 
-    task_data = replace_values(collect_data(exercises))
-    replace_attributes(tree, exercises, task_data)
+    course = load_course(source, cache_dir, backend)
+
+    task_data = replace_values(course.attr_data)
+    replace_attributes(
+        course.tree, get_exercises(course.exercise_index), task_data,
+        course.exercise_index, output
+    )
 
 
+@measured("task_content_processor")
 def task_content_processor(
         engeto_repo: str,
         lesson_num: str,
+        sync: bool = False,
+        strategies: Sequence[str] = DEFAULT_STRATEGIES,
+        background: bool = False,
+        journal: Optional[str] = None,
+        package: str = DEFAULT_PACKAGE
         ) -> None:
     """
-    Run the main function and remove all the unused lesson and tasks.
+    Run the main function and remove all the unused lesson and tasks. With
+    'sync' only the solutions and tests that differ are copied, 'strategies'
+    are the ways of copying them (see 'copier.copy_file'). The renamed
+    lesson and the package are scanned once for the copying, see
+    'fsindex.take_snapshot'. With 'background' the removed folders are
+    moved to a trash and purged by other threads while the tasks are
+    copied, the processor waits for them at the end. The 'package' is the
+    'tasks' folder of the tasks package.
+
+    With 'journal' all the changes are planned in advance and applied in
+    batches, the finished ones are written to the journal file. The failed
+    run can be resumed by running the processor with the same journal
+    again, or rolled back, see 'planner.rollback_plan'.
     """
-    for key, value in tu.lessons.items():
-        if value == lesson_num:
-            lesson = key
+    lesson = get_table().codes.get(lesson_num)
+
+    if lesson and journal:
+        summary = run_journaled(
+            engeto_repo, lesson_num, os.path.join(package, lesson_num),
+            journal, sync, strategies
+        )
+        logging.info(
+            f"Applied {summary.applied} operations of {lesson_num}, "
+            f"{summary.resumed} were finished before"
+        )
+        if summary.errors:
+            for operation, error in summary.errors:
+                logging.error(f"Cannot {operation.kind} {operation.target}: "
+                              f"{error}")
+            raise Exception(
+                f"The plan of {lesson_num} failed, the journal {journal} can "
+                f"be resumed or rolled back"
+            )
+    elif lesson:
+        trash = open_trash(engeto_repo) if background else None
 
-    if lesson:
-        remove_unused_lessons(
-            os.listdir(os.path.join(engeto_repo, "exercises")),
-            lesson,
-            os.path.join(engeto_repo, "exercises")
+        with stage("cleaner.remove"):
+            remove_unused_lessons(
+                os.listdir(os.path.join(engeto_repo, "exercises")),
+                lesson,
+                os.path.join(engeto_repo, "exercises"),
+                trash
+            )
+
+        process_lesson(
+            engeto_repo, lesson_num, package, sync, strategies, trash
         )
 
+        if trash is not None:
+            with stage("cleaner.purge"):
+                status = close_trash(trash)
+            logging.info(
+                f"Purged {status.purged} folders, {len(status.errors)} failed"
+            )
+    else:
+        raise Exception(f"Cannot find lesson {lesson_num} in the utils")
+
+
+def process_lesson(
+        engeto_repo: str,
+        lesson_num: str,
+        package: str = DEFAULT_PACKAGE,
+        sync: bool = False,
+        strategies: Sequence[str] = DEFAULT_STRATEGIES,
+        trash: Optional[Trash] = None
+        ) -> Tuple[CopySummary, CopySummary]:
+    """
+    Rename the tasks of a single lesson and copy their solutions and tests
+    from the package, the other lessons are left as they are. See
+    'task_content_processor' for the arguments.
+
+    :return: the summaries of the copied solutions and tests.
+    :rtype: tuple
+    """
+    lesson = get_table().codes[lesson_num]
+    lesson_path = os.path.join(engeto_repo, "exercises", lesson)
+    package = os.path.join(package, lesson_num)
+
+    with stage("cleaner.rename", lesson=lesson):
         rename_dirs(
-            tuple(os.listdir(os.path.join(engeto_repo, "exercises", lesson))),
-            lesson_num,
-            os.path.join(engeto_repo, "exercises", lesson)
+            tuple(os.listdir(lesson_path)), lesson_num, lesson_path, trash
         )
 
-        move_content(
-            os.path.join(engeto_repo, "exercises", lesson),
+    snapshot = take_snapshot(lesson_path, package, depth=2)
+
+    with stage("cleaner.content", lesson=lesson):
+        content = move_content(
+            lesson_path,
             engeto_repo,
-            os.path.join("../engeto_tasks/tasks", lesson_num)
+            package,
+            sync=sync,
+            strategies=strategies,
+            snapshot=snapshot
         )
 
-        move_tests(
-            os.path.join(engeto_repo, "exercises", lesson),
+    with stage("cleaner.tests", lesson=lesson):
+        tests = move_tests(
+            lesson_path,
             engeto_repo,
-            os.path.join("../engeto_tasks/tasks", lesson_num)
+            package,
+            sync=sync,
+            strategies=strategies,
+            snapshot=snapshot
         )
-    else:
-        raise Exception(f"Cannot find lesson {lesson_num} in the utils")
+
+    for name, summary in ("content", content), ("tests", tests):
+        logging.info(
+            f"Copied {summary.files} {name} files ({summary.bytes} bytes)"
+            f" of {lesson_num}, {summary.skipped} unchanged,"
+            f" {len(summary.errors)} failed, strategies:"
+            f" {summary.strategies or {}}"
+        )
+
+    return content, tests
+
+
+@measured("lessons_processor")
+def lessons_processor(
+        engeto_repo: str,
+        package: str = DEFAULT_PACKAGE,
+        max_workers: int = DEFAULT_LESSON_WORKERS,
+        background: bool = False,
+        **options: Any
+        ) -> List[LessonResult]:
+    """
+    Process the content of all the lessons in the repository at once, every
+    lesson in a separate thread. Unlike 'task_content_processor' no
+    lesson is removed, the lessons without the mapping are skipped.
+
+    The 'exercises' folder is listed once. The errors do not stop the other
+    lessons, they are returned in the results.
+
+    :param engeto_repo: a path to the repository.
+    :type engeto_repo: str
+    :param package: a path to the 'tasks' folder of the tasks package.
+    :type package: str
+    :param max_workers: a maximum number of lessons processed at once.
+    :type max_workers: int
+    :param background: purge the removed tasks in the background, see
+        'trash.open_trash'.
+    :type background: bool
+    :param options: other arguments for 'process_lesson', the 'sync' and
+        the 'strategies'.
+    :type options: dict
+    :return: the results in the order of the lesson names.
+    :rtype: list
+    """
+    folders = get_table().folders
+    lessons = []
+
+    for code in sorted(os.listdir(os.path.join(engeto_repo, "exercises"))):
+        if code in folders:
+            lessons.append((code, folders[code]))
+        else:
+            logging.warning(f"Cannot find lesson {code} in the utils")
+
+    trash = open_trash(engeto_repo) if background else None
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers) as pool:
+        futures = [
+            pool.submit(
+                run_lesson, engeto_repo, lesson_num, package, trash, options
+            )
+            for _, lesson_num in lessons
+        ]
+        results = [future.result() for future in futures]
+
+    if trash is not None:
+        status = close_trash(trash)
+        logging.info(
+            f"Purged {status.purged} folders, {len(status.errors)} failed"
+        )
+
+    logging.info(f"Lessons summary:\n{format_lessons(results)}")
+    return results
+
+
+def run_lesson(
+        engeto_repo: str,
+        lesson_num: str,
+        package: str,
+        trash: Optional[Trash],
+        options: Dict[str, Any]
+        ) -> LessonResult:
+    """
+    Process a single lesson and measure it.
+    """
+    empty = CopySummary(0, 0, [])
+    start = time.perf_counter()
+
+    try:
+        content, tests = process_lesson(
+            engeto_repo, lesson_num, package, trash=trash, **options
+        )
+
+    except Exception:
+        return LessonResult(
+            lesson_num, traceback.format_exc(), time.perf_counter() - start,
+            empty, empty
+        )
+
+    return LessonResult(
+        lesson_num, None, time.perf_counter() - start, content, tests
+    )
+
+
+def format_lessons(results: List[LessonResult]) -> str:
+    """
+    Return the table with the copied files of every lesson.
+
+    :Example:
+    >>> print(format_lessons([LessonResult(
+    ...     "lesson01", None, 0.25, CopySummary(20, 2000, [], 2),
+    ...     CopySummary(22, 1100, [])
+    ... )]))
+    lesson       solutions    tests  skipped   failed     time  status
+    lesson01            20       22        2        0    0.25s  ok
+    """
+    lines = [
+        f"{'lesson':<12} {'solutions':>9} {'tests':>8} {'skipped':>8} "
+        f"{'failed':>8} {'time':>8}  status"
+    ]
+
+    for result in results:
+        status = "ok" if result.error is None \
+            else result.error.strip().splitlines()[-1]
+        lines.append(
+            f"{result.lesson:<12} {result.content.files:>9} "
+            f"{result.tests.files:>8} "
+            f"{result.content.skipped + result.tests.skipped:>8} "
+            f"{len(result.content.errors) + len(result.tests.errors):>8} "
+            f"{result.seconds:>7.2f}s  {status}"
+        )
+
+    return "\n".join(lines)
@@ -1,6 +1,8 @@
 import xml.etree.ElementTree
 from typing import List, Union, Dict, Tuple, Optional
 
+from task_manager.instrument import measured
+
 
 def get_all_tasks(
     root: xml.etree.ElementTree.Element, value: str
@@ -91,6 +93,7 @@ def select_attr_value(
     ]
 
 
+@measured("task_names")
 def get_task_names(
         root: xml.etree.ElementTree.Element,
         xml_tag: str,
@@ -1,4 +1,13 @@
-from typing import List, Tuple
+import io
+import os
+import mmap
+import concurrent.futures
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+
+# The version of the processed text, it has to be raised with every change
+# of the output, the README manifests are processed again then.
+TEXT_VERSION = 1
 
 
 def process_text(text: List[str]) -> str:
@@ -12,13 +21,146 @@ def process_text(text: List[str]) -> str:
     ... )
     'third line'
     """
-    bounds = select_boundaries(text, "---\n")
-    start, stop = modify_indexes(bounds)
-    cleaned_txt = remove_backticks(
-        clean_newlines(text[start: stop]),
-        2
-    )
-    return join_text(replace_empty_strs(cleaned_txt))
+    return extract_description(text)
+
+
+def extract_description(
+        lines: Iterable[str], signal: str = "---\n", backticks: int = 2
+        ) -> str:
+    """
+    Return the processed text between the first and the last delimiter in
+    a single pass over the lines.
+
+    The lines are taken from any iterable, e.g. an open file. The lines after
+    the last seen delimiter are held back until the next delimiter confirms
+    them, the rest is cleaned right away. The result is the same as from the
+    'select_boundaries', 'remove_backticks', 'clean_newlines' and
+    'replace_empty_strs' steps, the IndexError is raised for the text without
+    any delimiter.
+
+    :param lines: a content of README.md file.
+    :type lines: iterable
+    :param signal: a delimiter from the text.
+    :type signal: str
+    :param backticks: a number of removed backtick lines.
+    :type backticks: int
+    :return: a cleaned text between the delimiters.
+    :rtype: str
+
+    :Example:
+    >>> extract_description(
+    ...    iter(["intro\\n", "---\\n", "```\\n", "a\\n", "\\n", "---\\n",
+    ...    "b\\n", "---\\n", "footer\\n"])
+    ... )
+    'a\\n\\n\\n---\\nb'
+    """
+    output: List[str] = []
+    pending: List[str] = []
+    opened = False
+
+    for line in lines:
+        if line != signal:
+            if opened:
+                pending.append(line.strip() or "\n")
+            continue
+
+        if not opened:
+            opened = True
+            continue
+
+        for item in pending:
+            if backticks and item == "```":
+                backticks -= 1
+            else:
+                output.append(item)
+        pending = ["---"]
+
+    if not opened:
+        raise IndexError("The text does not contain the delimiter")
+
+    return "\n".join(output)
+
+
+def slice_section(
+        buffer: Union[bytes, mmap.mmap], signal: bytes = b"---\n"
+        ) -> Optional[List[str]]:
+    """
+    Return the lines from the first to the last delimiter of the raw file
+    content. The delimiters are found in the bytes, so only the byte range
+    between them is decoded, the buffer may be a memory-mapped file.
+
+    The None is returned for the content, that has to be decoded as a whole:
+    with the carriage returns (universal newlines) or without any delimiter.
+    The processed text of the section is the same as of the whole content.
+
+    :param buffer: a raw content of README.md file.
+    :type buffer: bytes or mmap.mmap
+    :param signal: a delimiter from the text.
+    :type signal: bytes
+    :return: the decoded lines of the section.
+    :rtype: list
+
+    :Example:
+    >>> slice_section(b"intro\\n---\\ntext\\n---\\nfooter\\n")
+    ['---\\n', 'text\\n', '---\\n']
+    >>> slice_section(b"intro\\r\\n---\\r\\n") is None
+    True
+    """
+    if buffer.find(b"\r") != -1:
+        return None
+
+    if buffer[:len(signal)] == signal:
+        start = 0
+    else:
+        start = buffer.find(b"\n" + signal) + 1
+        if not start:
+            return None
+
+    last = buffer.rfind(b"\n" + signal)
+    stop = (last + 1 if last >= start else start) + len(signal)
+
+    return io.StringIO(buffer[start:stop].decode("utf-8")).readlines()
+
+
+def process_texts(
+        texts: Dict[str, List[str]],
+        processes: Optional[int] = None,
+        chunksize: Optional[int] = None
+        ) -> Dict[str, str]:
+    """
+    Return the processed texts of many tasks, computed by a pool of processes.
+
+    The texts are sent to the workers in chunks, so the overhead of the
+    communication stays low. The results are the same as from 'process_text'
+    called for every text one by one.
+
+    :param texts: an object with task names as keys and the lines as values.
+    :type texts: dict
+    :param processes: a number of worker processes (all CPUs by default),
+        the value 1 processes the texts in the current process.
+    :type processes: int
+    :param chunksize: a number of texts sent to a worker at once.
+    :type chunksize: int
+    :return: an object with task names as keys and processed texts as values.
+    :rtype: dict
+
+    :Example:
+    >>> process_texts(
+    ...    {"task": ["first line\\n", "---\\n", "third line\\n", "---\\n"]},
+    ...    processes=1
+    ... )
+    {'task': 'third line'}
+    """
+    processes = processes or os.cpu_count() or 1
+
+    if processes == 1 or len(texts) < 2:
+        return {name: process_text(text) for name, text in texts.items()}
+
+    chunksize = chunksize or -(-len(texts) // (processes * 4))
+
+    with concurrent.futures.ProcessPoolExecutor(processes) as pool:
+        results = pool.map(process_text, texts.values(), chunksize=chunksize)
+        return dict(zip(texts, results))
 
 
 def select_boundaries(content: List[str], signal: str) -> List[int]:
@@ -0,0 +1,210 @@
+import os
+import shutil
+import logging
+import time
+import tempfile
+import itertools
+import concurrent.futures
+from typing import IO, Any, Iterator, List, NamedTuple, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore
+
+from task_manager.instrument import stage
+
+
+DEFAULT_PURGE_WORKERS = 2
+TRASH_PREFIX = ".task_manager_trash-"
+TRASH_LOCK = ".lock"
+
+# The trash without the lock (not created yet, or without 'fcntl') is left
+# by an interrupted run, if it was not changed for this number of seconds.
+STALE_TRASH_AGE = 24 * 60 * 60
+
+
+class Trash(NamedTuple):
+    """
+    A trash folder with the pool of threads purging the discarded folders.
+    The lock file is locked while the trash is open.
+    """
+    directory: str
+    pool: concurrent.futures.ThreadPoolExecutor
+    futures: List[Tuple[str, "concurrent.futures.Future[None]"]]
+    names: Iterator[int]
+    lock: Optional[IO[Any]] = None
+
+
+class PurgeStatus(NamedTuple):
+    """
+    The numbers of the purged and the pending folders with the errors of the
+    failed ones.
+    """
+    purged: int
+    pending: int
+    errors: List[Tuple[str, str]]
+
+
+def open_trash(root: str, workers: int = DEFAULT_PURGE_WORKERS) -> Trash:
+    """
+    Create the trash folder in the root, it has to be on the same filesystem
+    as the discarded folders. The trash folders left by the interrupted runs
+    are purged too, the ones of the other running processes are kept, see
+    'is_stale'.
+
+    :param root: a path of the folder for the trash.
+    :type root: str
+    :param workers: a number of the threads purging the folders.
+    :type workers: int
+    :return: an object with the trash folder.
+    :rtype: Trash
+    """
+    directory = tempfile.mkdtemp(prefix=TRASH_PREFIX, dir=root)
+    trash = Trash(
+        directory,
+        concurrent.futures.ThreadPoolExecutor(workers),
+        [],
+        itertools.count(),
+        lock_trash(directory)
+    )
+
+    for name in os.listdir(root):
+        path = os.path.join(root, name)
+
+        if name.startswith(TRASH_PREFIX) and path != trash.directory \
+                and is_stale(path):
+            trash.futures.append((path, trash.pool.submit(purge, path)))
+
+    return trash
+
+
+def lock_trash(directory: str) -> Optional[IO[Any]]:
+    """
+    Create and lock the lock file of the trash. The lock is released when
+    the file is closed, or when the process ends.
+    """
+    if fcntl is None:
+        return None
+
+    lock = open(os.path.join(directory, TRASH_LOCK), "w")
+    fcntl.flock(lock.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    return lock
+
+
+def is_stale(path: str) -> bool:
+    """
+    Return True for the trash left by an interrupted run, its lock file is
+    not locked by any process. The trash without the lock is stale if it
+    was not changed for 'STALE_TRASH_AGE' seconds.
+    """
+    try:
+        lock = open(os.path.join(path, TRASH_LOCK)) \
+            if fcntl is not None else None
+    except FileNotFoundError:
+        lock = None
+
+    if lock is None:
+        try:
+            return os.stat(path).st_mtime < time.time() - STALE_TRASH_AGE
+        except FileNotFoundError:
+            return False
+
+    with lock:
+        try:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            return False
+    return True
+
+
+def discard(trash: Trash, path: str) -> None:
+    """
+    Move the folder into the trash and purge it in the background. The
+    folder on another filesystem is removed at once.
+
+    :param trash: an object with the trash folder, see 'open_trash'.
+    :type trash: Trash
+    :param path: a path of the removed folder.
+    :type path: str
+    """
+    target = os.path.join(
+        trash.directory, f"{next(trash.names)}-{os.path.basename(path)}"
+    )
+
+    try:
+        with stage("trash.discard", 1):
+            os.rename(path, target)
+
+    except OSError as error:
+        logging.warning(f"Cannot move {path} to the trash: {error}")
+        shutil.rmtree(path)
+    else:
+        trash.futures.append((target, trash.pool.submit(purge, target)))
+
+
+def purge(path: str) -> None:
+    """
+    Remove the folder from the trash.
+    """
+    with stage("trash.purge", 1):
+        shutil.rmtree(path)
+
+
+def get_status(trash: Trash) -> PurgeStatus:
+    """
+    Return the state of the purging.
+
+    :param trash: an object with the trash folder, see 'open_trash'.
+    :type trash: Trash
+    :return: an object with the numbers of the purged and pending folders.
+    :rtype: PurgeStatus
+    """
+    status = PurgeStatus(0, 0, [])
+
+    for path, future in list(trash.futures):
+        if not future.done():
+            status = status._replace(pending=status.pending + 1)
+        elif future.exception() is not None:
+            error = future.exception()
+            status.errors.append((path, f"{type(error).__name__}: {error}"))
+        else:
+            status = status._replace(purged=status.purged + 1)
+
+    return status
+
+
+def close_trash(trash: Trash, wait: bool = True) -> PurgeStatus:
+    """
+    Stop the purging pool and remove the empty trash folder.
+
+    :param trash: an object with the trash folder, see 'open_trash'.
+    :type trash: Trash
+    :param wait: wait until all the folders are purged. Otherwise the pool
+        finishes the pending ones in the background.
+    :type wait: bool
+    :return: an object with the numbers of the purged and pending folders.
+    :rtype: PurgeStatus
+
+    :Example:
+    >>> trash = open_trash(".")
+    >>> os.makedirs("unused/L02")
+    >>> discard(trash, "unused")
+    >>> close_trash(trash)
+    PurgeStatus(purged=1, pending=0, errors=[])
+    >>> os.path.exists("unused") or os.path.exists(trash.directory)
+    False
+    """
+    trash.pool.shutdown(wait=wait)
+    status = get_status(trash)
+
+    if not status.pending:
+        try:
+            if trash.lock is not None:
+                os.remove(trash.lock.name)
+                trash.lock.close()
+            os.rmdir(trash.directory)
+        except OSError as error:
+            logging.warning(f"Cannot remove the trash: {error}")
+
+    return status
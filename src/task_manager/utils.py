@@ -1,62 +1,18 @@
-lessons = {
-    "L01": "lesson01",
-    "L02": "lesson02",
-    "L03": "lesson03",
-    "L04": "lesson04",
-    "L05": "lesson05",
-    "L06": "lesson06",
-    "L07": "lesson07",
-    "L08": "lesson08",
-    "L09": "lesson09",
-    "L10": "lesson10",
-    "L11": "lesson11",
-    "L12": "lesson12"
-}
+"""
+The compatibility module for the code that used the name mapping of the
+lessons before it was moved into 'data/lessons.json'. The new code calls
+'lessons.get_table' instead, the mapping is read when this module is
+imported.
+"""
+from typing import Dict
 
-lesson01 = {
-    "slicing_string": "rozdeleni_stringu",
-    "string_operations": "spojovani_stringu",
-    "unit_converter": "prevadec_jednotek",
-    "buying_cars": "nakupujeme_auto",
-    "destinatio_1_cz": "destinatio_1",
-    "string_length": "delka_stringu"
-}
+from task_manager.lessons import get_table
 
-lesson02 = {
-    'list_operations_2': "list_indexovani",
-    'palindrom': "palindrom",
-    'bmi_calculator': "bmi_kalkulacka",
-    'zjisteni_delky_stringu': "delka_stringu",
-    'convert_time': "prevod_casu",
-    'create_list_add_elements': "list_pridavani_hodnot",
-    'list_operations_1': "list_odstranovani_hodnot",
-    'first_letter': "prvni_pismeno",
-    'destinatio_2_cz': "destinatio_2"
-}
 
-lesson03 = {
-    'metody_slovniku_1': "rozsir_slovnik_slovnikem",
-    'metody_slovniku_2': "nahledy_slovniku",
-    'update': "slovnik_ve_slovniku",
-    'overeni_hesla_slovnik': "overeni_hesla",
-    'set_combinations': "sjednoceni_setu"
-}
+lessons: Dict[str, str] = get_table().folders
 
-lesson04 = {
-    'count_numbers': "pocty_cisel",
-    'string_to_list': "ze_stringu_seznam",
-    'vowels': "samohlasky_a_souhlasky",
-    'odd_even_diff': "suda_vs_licha",
-    'fizzbuzz': "fizz_buzz",
-    'divisor': "delitel",
-    'sort': "skript_na_serazeni",
-    'chessboard': "sachovnice",
-    'counter': "pocitadlo"
-}
-
-lesson05 = {
-    'calculator': "kalkulacka",
-    'break': "prerus_vyber",
-    'nejdelsi_slovo': "ukladej_slova",
-    'shopping_cart': "nakupni_kosik"
-}
+lesson01: Dict[str, str] = get_table().tasks.get("lesson01", {})
+lesson02: Dict[str, str] = get_table().tasks.get("lesson02", {})
+lesson03: Dict[str, str] = get_table().tasks.get("lesson03", {})
+lesson04: Dict[str, str] = get_table().tasks.get("lesson04", {})
+lesson05: Dict[str, str] = get_table().tasks.get("lesson05", {})
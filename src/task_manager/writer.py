@@ -0,0 +1,276 @@
+import io
+import os
+import contextlib
+import xml.etree.ElementTree
+from typing import IO, Any, Callable, Iterator, List, NamedTuple, Optional
+from typing import Union
+
+from task_manager.instrument import stage
+from task_manager.parser import iterparse_xml, release_element
+
+
+Sink = Union[str, "os.PathLike[str]", int, IO[Any]]
+
+
+class Frame(NamedTuple):
+    """
+    An element around the streamed ones, whether its start tag was written
+    and its last finished child, whose tail is written with the next event.
+    """
+    element: xml.etree.ElementTree.Element
+    opened: bool = False
+    last: Optional[xml.etree.ElementTree.Element] = None
+
+
+@contextlib.contextmanager
+def open_sink(sink: Sink) -> Iterator[IO[str]]:
+    """
+    Open the output for writing the XML text in UTF-8.
+
+    The sink is a path, a file descriptor, a binary file object (file opened
+    in 'wb' mode, BytesIO) or a text file object (StringIO). Only the file
+    opened from the path is closed at the end, the file descriptors and the
+    file objects stay open for the caller.
+
+    :param sink: an output of the serialized XML.
+    :type sink: str, os.PathLike, int or file object
+    :return: a text stream writing into the sink.
+    :rtype: file object
+
+    :Example:
+    >>> buffer = io.BytesIO()
+    >>> with open_sink(buffer) as out:
+    ...     _ = out.write("<a>ř</a>")
+    >>> buffer.getvalue()
+    b'<a>\\xc5\\x99</a>'
+    """
+    if isinstance(sink, (str, os.PathLike)):
+        with open(
+            sink, "w", encoding="utf-8", errors="xmlcharrefreplace"
+        ) as out:
+            yield out
+
+    elif isinstance(sink, int):
+        with open(
+            sink, "w", encoding="utf-8", errors="xmlcharrefreplace",
+            closefd=False
+        ) as out:
+            yield out
+
+    elif isinstance(sink, io.TextIOBase):
+        yield sink  # type: ignore
+
+    else:
+        out = io.TextIOWrapper(
+            sink, encoding="utf-8", errors="xmlcharrefreplace", newline="\n"
+        )
+        try:
+            yield out
+        finally:
+            out.flush()
+            out.detach()
+
+
+def write_tree(
+        tree: xml.etree.ElementTree.ElementTree,
+        output: Sink
+        ) -> None:
+    """
+    Write the whole tree into the output file. The standard library trees
+    are written by its serializer, the trees parsed by lxml by
+    'write_element', so both backends give the same bytes.
+
+    :param tree: an object that represents XML content.
+    :type tree: xml.etree.ElementTree.ElementTree
+    :param output: a path, a file descriptor or a file object.
+    :type output: str, os.PathLike, int or file object
+    """
+    with stage("write"), open_sink(output) as out:
+        if isinstance(tree, xml.etree.ElementTree.ElementTree):
+            tree.write(out, encoding="unicode")
+        else:
+            write_element(out, tree.getroot())
+
+
+def stream_xml(
+        filename: str,
+        tag: str,
+        handler: Callable[[xml.etree.ElementTree.Element], None],
+        output: Sink,
+        backend: Optional[str] = None
+        ) -> int:
+    """
+    Parse the XML file incrementally, pass every element with the given tag
+    to the handler and write the result into the output file right away.
+
+    The elements around the selected ones (course, lesson, chapter) are
+    written as they are opened and closed. Processed elements are cleared and
+    detached from the tree, so only the currently processed element is held
+    in the memory. The output is the same as from the 'tree.write' call.
+
+    :param filename: a name of the xml file.
+    :type filename: str
+    :param tag: a name of the processed elements.
+    :type tag: str
+    :param handler: a function that modifies a single element in place.
+    :type handler: callable
+    :param output: a path, a file descriptor or a file object, see
+        'open_sink'.
+    :type output: str, os.PathLike, int or file object
+    :param backend: a name of the backend, see 'parser.get_backend'.
+    :type backend: str
+    :return: a number of processed elements.
+    :rtype: int
+    """
+    processed = 0
+    depth = 0
+    stack: List[Frame] = []
+
+    with stage("stream") as current, open_sink(output) as out:
+        for event, element in iterparse_xml(filename, backend):
+            if depth:
+                depth += 1 if event == "start" else -1
+                if depth:
+                    continue
+                handler(element)
+                processed += 1
+                out.write(serialize_element(element))
+                finish_child(stack, element)
+                release_element(element)
+
+            elif event == "start":
+                open_parent(out, stack)
+                if element.tag == tag:
+                    depth = 1
+                else:
+                    stack.append(Frame(element))
+
+            else:
+                close_element(out, stack.pop())
+                finish_child(stack, element)
+
+        current.add(processed)
+
+    return processed
+
+
+def open_parent(out, stack: List[Frame]) -> None:
+    """
+    Before a new child is written, write the start tag and the text of its
+    parent or the tail of the previous sibling.
+    """
+    if not stack:
+        return
+    parent, opened, last = stack[-1]
+
+    if not opened:
+        out.write(start_tag(parent) + escape_text(parent.text))
+        stack[-1] = Frame(parent, True)
+    elif last is not None:
+        out.write(escape_text(last.tail))
+        parent.remove(last)
+        stack[-1] = Frame(parent, True)
+
+
+def close_element(out, frame: Frame) -> None:
+    """
+    Write the end of the element from the given frame of the stack.
+    """
+    element, opened, last = frame
+
+    if opened:
+        if last is not None:
+            out.write(escape_text(last.tail))
+            element.remove(last)
+        out.write(f"</{element.tag}>")
+    elif element.text:
+        out.write(
+            start_tag(element) + escape_text(element.text)
+            + f"</{element.tag}>"
+        )
+    else:
+        out.write(start_tag(element)[:-1] + " />")
+
+
+def finish_child(
+        stack: List[Frame], element: xml.etree.ElementTree.Element
+        ) -> None:
+    """
+    Remember the finished element, its tail is written with the next event.
+    """
+    if stack:
+        stack[-1] = stack[-1]._replace(last=element)
+
+
+def serialize_element(element: xml.etree.ElementTree.Element) -> str:
+    """
+    Return the element with its whole subtree as a string (without the tail).
+
+    :Example:
+    >>> elem = xml.etree.ElementTree.fromstring('<a x="1">b<c/></a>')
+    >>> serialize_element(elem)
+    '<a x="1">b<c /></a>'
+    """
+    out = io.StringIO()
+    write_element(out, element)
+    return out.getvalue()
+
+
+def write_element(out, element: xml.etree.ElementTree.Element) -> None:
+    """
+    Write the element with its whole subtree (without the tail) in the same
+    format as the standard library does, it is used for the streamed
+    elements of both backends.
+    """
+    text = element.text
+
+    if text or len(element):
+        out.write(start_tag(element) + escape_text(text))
+        for child in element:
+            write_element(out, child)
+            out.write(escape_text(child.tail))
+        out.write(f"</{element.tag}>")
+    else:
+        out.write(start_tag(element)[:-1] + " />")
+
+
+def start_tag(element: xml.etree.ElementTree.Element) -> str:
+    """
+    Return the start tag of the element with all its attributes.
+
+    :Example:
+    >>> start_tag(xml.etree.ElementTree.Element("a", {"b": '"c"'}))
+    '<a b="&quot;c&quot;">'
+    """
+    attrs = "".join(
+        f' {key}="{escape_attr(value)}"'
+        for key, value in element.attrib.items()
+    )
+    return f"<{element.tag}{attrs}>"
+
+
+def escape_text(text: Optional[str]) -> str:
+    """
+    Return the text escaped the same way as in the serialized XML.
+
+    :Example:
+    >>> escape_text("a < b & c")
+    'a &lt; b &amp; c'
+    """
+    if not text:
+        return ""
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def escape_attr(value: str) -> str:
+    """
+    Return the attribute value escaped the same way as in the serialized XML.
+
+    :Example:
+    >>> escape_attr('say "hi"')
+    'say &quot;hi&quot;'
+    """
+    return (
+        escape_text(value).replace('"', "&quot;").replace("\r", "&#13;")
+        .replace("\n", "&#10;").replace("\t", "&#09;")
+    )
@@ -0,0 +1,32 @@
+import json
+import pytest
+
+
+@pytest.fixture
+def make_files(tmp_path):
+    """
+    Return a function that creates the files in the temporary folder, every
+    file contains its own relative path.
+    """
+    def create(*paths):
+        for path in paths:
+            (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / path).write_text(path)
+
+    return create
+
+
+@pytest.fixture
+def set_lessons(tmp_path, monkeypatch):
+    """
+    Return a function that writes the lesson mapping into the temporary
+    'lessons.json' and uses it instead of the bundled one.
+    """
+    def write(lessons, tasks):
+        mapping = tmp_path / "lessons.json"
+        mapping.write_text(json.dumps({
+            "format": 1, "lessons": lessons, "tasks": tasks
+        }))
+        monkeypatch.setenv("TASK_MANAGER_LESSONS", str(mapping))
+
+    return write
@@ -1,6 +1,7 @@
 import xml.etree.ElementTree as te
 
 import task_manager.attributes as ta
+from task_manager.index import build_index, get_exercises
 
 
 def test_update_exercise_with_proper_elements():
@@ -120,3 +121,62 @@ def test_if_replace_values_returns_expected_data_type():
     }
     result = ta.replace_values(out)
     assert isinstance(result, dict)
+
+
+def test_replace_values_keeps_paths_with_other_depths():
+    out = {
+        'Rozdělení stringu':
+        {
+            'perex': 'exercises/L01',
+            'skeleton': 'exercises/L01/slicing_string',
+            'solution': 'exercises/L01/slicing_string/solution/main.py',
+            'description': 'exercises/L01/slicing_string/skeleton'
+        }
+    }
+    assert ta.replace_values(out)['Rozdělení stringu'] == {
+        'perex': 'exercises/L01',
+        'skeleton': 'exercises/L01/rozdeleni_stringu',
+        'solution': 'exercises/L01/rozdeleni_stringu/solution/main.py',
+        'description': 'exercises/L01/rozdeleni_stringu/skeleton'
+    }
+
+
+def test_rewrite_path_returns_expected_result():
+    names = {('L01', 'slicing_string'): 'rozdeleni_stringu'}
+    cache = {}
+    ta.rewrite_path('exercises/L01/slicing_string/skeleton', names, cache)
+    assert cache == {
+        'exercises/L01/slicing_string': 'exercises/L01/rozdeleni_stringu'
+    }
+    assert ta.rewrite_path(
+        'exercises/L01/slicing_string/solution/main.py', names, cache
+    ) == 'exercises/L01/rozdeleni_stringu/solution/main.py'
+    assert ta.rewrite_path(
+        'exercises/L01/unknown/skeleton', names, cache
+    ) == 'exercises/L01/unknown/skeleton'
+
+
+def test_rewrite_path_returns_expected_data_type():
+    result = ta.rewrite_path('exercises/L01/task/skeleton', {}, {})
+    assert isinstance(result, str)
+
+
+def test_rewrite_exercise_returns_expected_result():
+    tree = te.parse('src/tests/bar.xml')
+    root = tree.getroot()
+    exercises = [exercise for exercise in root.iter('exercise')]
+    ta.rewrite_exercise(exercises[1])
+    assert exercises[1].find(
+        'solution'
+    ).attrib['sourceDir'] == 'exercises/L01/spojovani_stringu/solution'
+
+
+def test_update_all_with_index_returns_expected_result():
+    tree = te.parse('src/tests/bar.xml')
+    index = build_index(tree.getroot())
+    exercises = get_exercises(index)
+    new_path = ta.replace_values(ta.collect_data(exercises))
+    ta.update_all(exercises, new_path, index)
+    assert exercises[0].find(
+        'skeleton'
+    ).attrib['sourceDir'] == 'exercises/L01/rozdeleni_stringu/skeleton'
@@ -0,0 +1,36 @@
+import shutil
+
+import task_manager.batch as tb
+
+
+def test_batch_processor_returns_expected_result(tmp_path):
+    for name in "first", "second":
+        (tmp_path / name).mkdir()
+        shutil.copyfile(
+            "src/tests/exercise.xml", tmp_path / name / f"course_{name}.xml"
+        )
+    results = tb.batch_processor(
+        [str(tmp_path / "first"), str(tmp_path / "second"),
+         str(tmp_path / "missing")],
+        str(tmp_path / "package"), str(tmp_path / "output"), 2
+    )
+    assert [result.course for result in results] == \
+        ['first', 'second', 'missing']
+    assert [result.error is None for result in results] == \
+        [True, True, False]
+    assert (tmp_path / "output" / "second" / "output_attr.xml").exists()
+
+
+def test_if_batch_processor_returns_expected_data_type(tmp_path):
+    results = tb.batch_processor(
+        [str(tmp_path / "missing")], str(tmp_path), str(tmp_path / "output")
+    )
+    assert isinstance(results[0], tb.CourseResult)
+
+
+def test_format_summary_returns_expected_result():
+    result = tb.CourseResult(
+        "course", "out", "Traceback\nValueError: boom\n", {"total": 1.0}, {}
+    )
+    assert tb.format_summary([result]).splitlines()[1].split() == \
+        ['course', '-', '-', '1.00s', 'ValueError:', 'boom']
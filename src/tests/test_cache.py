@@ -0,0 +1,87 @@
+import os
+import xml.etree.ElementTree as te
+
+import task_manager.cache as tc
+from task_manager.digest import get_digest
+from task_manager.writer import serialize_element
+
+
+def get_names(course):
+    return [
+        entry.element.get("name") for entry in course.exercise_index.entries
+    ]
+
+
+def test_load_course_returns_expected_result(tmp_path):
+    first = tc.load_course("src/tests/bar.xml", str(tmp_path))
+    second = tc.load_course("src/tests/bar.xml", str(tmp_path))
+    assert serialize_element(second.tree.getroot()) == \
+        serialize_element(first.tree.getroot())
+    assert second.task_data == first.task_data
+    assert second.attr_data == first.attr_data
+
+
+def test_if_load_course_returns_expected_data_type(tmp_path):
+    result = tc.load_course("src/tests/bar.xml", str(tmp_path))
+    assert isinstance(result, tc.CourseData)
+
+
+def test_if_load_course_reuses_cache_entry(tmp_path, monkeypatch):
+    tc.load_course("src/tests/bar.xml", str(tmp_path))
+    monkeypatch.setattr(tc, "parse_course", None)
+    result = tc.load_course("src/tests/bar.xml", str(tmp_path))
+    assert len(result.exercise_index.entries) == 2
+
+
+def test_if_load_course_rebuilds_changed_file(tmp_path):
+    source = tmp_path / "course.xml"
+    source.write_text("<course><exercise name='a'/></course>")
+    tc.load_course(str(source), str(tmp_path / "cache"))
+    source.write_text("<course><exercise name='bb'/></course>")
+    result = tc.load_course(str(source), str(tmp_path / "cache"))
+    assert get_names(result) == ['bb']
+
+
+def test_if_load_course_hashes_changed_file_once(tmp_path, monkeypatch):
+    source = tmp_path / "course.xml"
+    source.write_text("<course><exercise name='a'/></course>")
+    tc.load_course(str(source), str(tmp_path / "cache"))
+    source.write_text("<course><exercise name='b'/></course>")
+    os.utime(source, (1, 1))
+    digests = []
+    monkeypatch.setattr(
+        "task_manager.cache.get_digest",
+        lambda name: digests.append(name) or get_digest(name)
+    )
+    result = tc.load_course(str(source), str(tmp_path / "cache"))
+    assert (get_names(result), len(digests)) == (['b'], 1)
+
+
+def test_evict_entries_returns_expected_result(tmp_path):
+    for name, mtime in ("old.course", 100), ("new.course", 200):
+        (tmp_path / name).write_bytes(b"x" * 10)
+        os.utime(tmp_path / name, (mtime, mtime))
+    tc.evict_entries(str(tmp_path), 15)
+    assert os.listdir(tmp_path) == ['new.course']
+
+
+def test_evict_entries_removes_stale_temporary_files(tmp_path):
+    for name, mtime in ("stale.tmp", 100), ("writing.tmp", None):
+        (tmp_path / name).write_bytes(b"x")
+        if mtime:
+            os.utime(tmp_path / name, (mtime, mtime))
+    tc.evict_entries(str(tmp_path), 1000)
+    assert os.listdir(tmp_path) == ['writing.tmp']
+
+
+def test_flatten_elements_returns_expected_result():
+    root = te.fromstring("<a>x<b c='d'/>y</a>")
+    assert tc.flatten_elements(root) == (
+        ['a', 'b'], [{}, {'c': 'd'}], ['x', None], [None, 'y'], [1, 0]
+    )
+
+
+def test_rebuild_elements_returns_expected_result():
+    root = te.parse("src/tests/bar.xml").getroot()
+    elements = tc.rebuild_elements(tc.flatten_elements(root))
+    assert serialize_element(elements[0]) == serialize_element(root)
@@ -1,5 +1,9 @@
+import os
 import xml.etree.ElementTree as te
 import task_manager.cleaner as tc
+from task_manager.copier import CopyJob
+from task_manager.fsindex import take_snapshot
+from task_manager.trash import open_trash, close_trash
 
 
 def test_if_select_names_returns_expected_result():
@@ -15,3 +19,159 @@ def test_if_select_names_returns_expected_data_type():
     exercise = [exe for exe in root.iter("exercise")]
     result = tc.select_names(exercise)
     assert isinstance(result, set)
+
+
+def test_split_name_returns_expected_result():
+    assert tc.split_name("exercises/L01/palindrom/solution") == "palindrom"
+
+
+def test_if_split_name_returns_expected_data_type():
+    assert isinstance(tc.split_name("exercises/L01"), str)
+
+
+def test_remove_unused_lessons_returns_expected_result(tmp_path, make_files):
+    make_files("L01/a/main.py", "L02/b/main.py", "L03/c/main.py")
+    tc.remove_unused_lessons(["L01", "L02", "L03"], "L02", str(tmp_path))
+    assert sorted(os.listdir(tmp_path)) == ["L02"]
+
+
+def test_remove_unused_lessons_with_trash_returns_expected_result(
+        tmp_path, make_files
+):
+    make_files("L01/a/main.py", "L02/b/main.py")
+    trash = open_trash(str(tmp_path))
+    tc.remove_unused_lessons(["L01", "L02"], "L02", str(tmp_path), trash)
+    assert close_trash(trash).purged == 1
+    assert sorted(os.listdir(tmp_path)) == ["L02"]
+
+
+def test_rename_dirs_returns_expected_result(tmp_path, make_files):
+    make_files("slicing_string/main.py", "unknown_task/main.py")
+    tc.rename_dirs(
+        ("slicing_string", "unknown_task", "string_length"), "lesson01",
+        str(tmp_path)
+    )
+    assert sorted(os.listdir(tmp_path)) == ["rozdeleni_stringu"]
+    assert (tmp_path / "rozdeleni_stringu" / "main.py").read_text() == \
+        "slicing_string/main.py"
+
+
+def test_move_content_returns_expected_result(tmp_path, make_files):
+    make_files(
+        "repo/exercises/L01/palindrom/solution/main.py",
+        "package/palindrom/palindrom.py", "package/novy/novy.py",
+        "package/__init__.py"
+    )
+    tc.move_content(
+        str(tmp_path / "repo" / "exercises" / "L01"),
+        str(tmp_path / "repo"), str(tmp_path / "package")
+    )
+    lesson = tmp_path / "repo" / "exercises" / "L01"
+    assert (lesson / "palindrom" / "solution" / "main.py").read_text() == \
+        "package/palindrom/palindrom.py"
+    assert sorted(os.listdir(lesson)) == ["novy", "palindrom"]
+
+
+def test_move_tests_returns_expected_result(tmp_path, make_files):
+    make_files(
+        "repo/exercises/L01/palindrom/tests.py",
+        "package/palindrom/test_palindrom.py"
+    )
+    tc.move_tests(
+        str(tmp_path / "repo" / "exercises" / "L01"),
+        str(tmp_path / "repo"), str(tmp_path / "package")
+    )
+    assert (
+        tmp_path / "repo" / "exercises" / "L01" / "palindrom" / "tests.py"
+    ).read_text() == "package/palindrom/test_palindrom.py"
+
+
+def test_add_missing_tasks_returns_expected_result(tmp_path, make_files):
+    make_files(
+        "repo/palindrom/solution/main.py",
+        "package/palindrom/palindrom.py", "package/novy/novy.py",
+        "package/__init__.py"
+    )
+    tc.add_missing_tasks(str(tmp_path / "repo"), str(tmp_path / "package"))
+    assert sorted(os.listdir(tmp_path / "repo")) == ["novy", "palindrom"]
+
+
+def test_create_task_folder_returns_expected_result(tmp_path, make_files):
+    make_files("package/novy/novy.py")
+    (tmp_path / "repo").mkdir()
+    tc.create_task_folder(
+        "novy", str(tmp_path / "package" / "novy"), str(tmp_path / "repo")
+    )
+    assert (tmp_path / "repo" / "novy" / "skeleton" / "main.py").exists()
+    assert (
+        tmp_path / "repo" / "novy" / "solution" / "main.py"
+    ).read_text() == "package/novy/novy.py"
+
+
+def test_collect_jobs_returns_expected_result(tmp_path, make_files):
+    make_files(
+        "repo/exercises/L01/palindrom/solution/main.py",
+        "repo/exercises/L01/stary/solution/main.py",
+        "package/palindrom/palindrom.py"
+    )
+    result = tc.collect_jobs(
+        str(tmp_path / "repo" / "exercises" / "L01"),
+        str(tmp_path / "repo"), str(tmp_path / "package"), "{}.py",
+        "solution/main.py"
+    )
+    assert result == [
+        CopyJob(
+            str(tmp_path / "package" / "palindrom" / "palindrom.py"),
+            str(
+                tmp_path / "repo" / "exercises" / "L01" / "palindrom"
+                / "solution" / "main.py"
+            ),
+            "palindrom", "L01"
+        )
+    ]
+
+
+def test_collect_jobs_returns_expected_data_type(tmp_path, make_files):
+    make_files("repo/exercises/L01/palindrom/tests.py")
+    result = tc.collect_jobs(
+        str(tmp_path / "repo" / "exercises" / "L01"),
+        str(tmp_path / "repo"), str(tmp_path / "package"), "test_{}.py",
+        "tests.py"
+    )
+    assert isinstance(result, list)
+
+
+def test_move_tests_sync_returns_expected_result(tmp_path, make_files):
+    make_files(
+        "repo/exercises/L01/palindrom/tests.py",
+        "package/palindrom/test_palindrom.py"
+    )
+    args = (
+        str(tmp_path / "repo" / "exercises" / "L01"),
+        str(tmp_path / "repo"), str(tmp_path / "package")
+    )
+    first = tc.move_tests(*args, sync=True)
+    second = tc.move_tests(*args, sync=True)
+    assert (first.files, first.skipped) == (1, 0)
+    assert (second.files, second.skipped) == (0, 1)
+
+
+def test_move_content_with_snapshot_returns_expected_result(
+        tmp_path, make_files
+):
+    make_files(
+        "repo/exercises/L01/palindrom/solution/main.py",
+        "package/palindrom/palindrom.py", "package/novy/novy.py",
+        "package/novy/test_novy.py"
+    )
+    args = (
+        str(tmp_path / "repo" / "exercises" / "L01"),
+        str(tmp_path / "repo"), str(tmp_path / "package")
+    )
+    snapshot = take_snapshot(args[0], args[2], depth=2)
+    content = tc.move_content(*args, snapshot=snapshot)
+    tests = tc.move_tests(*args, snapshot=snapshot)
+    assert (content.files, tests.files) == (2, 1)
+    assert (
+        tmp_path / "repo" / "exercises" / "L01" / "novy" / "tests.py"
+    ).read_text() == "package/novy/test_novy.py"
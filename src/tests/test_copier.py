@@ -0,0 +1,135 @@
+import errno
+import pytest
+import task_manager.copier as tcp
+
+
+def make_jobs(tmp_path, count):
+    jobs = []
+    for number in range(count):
+        source = tmp_path / f"source_{number}.py"
+        source.write_text("x" * number)
+        jobs.append(
+            tcp.CopyJob(
+                str(source), str(tmp_path / f"target_{number}.py"),
+                f"task_{number}", "L01"
+            )
+        )
+    return jobs
+
+
+def test_copy_files_returns_expected_result(tmp_path):
+    jobs = make_jobs(tmp_path, 5)
+    missing = tcp.CopyJob(
+        str(tmp_path / "missing.py"), str(tmp_path / "target.py"), "a", "L01"
+    )
+    result = tcp.copy_files(jobs + [missing], workers=3)
+    assert (result.files, result.bytes) == (5, 10)
+    assert [job for job, _ in result.errors] == [missing]
+    assert (tmp_path / "target_4.py").read_text() == "xxxx"
+
+
+def test_copy_files_returns_expected_data_type(tmp_path):
+    result = tcp.copy_files(make_jobs(tmp_path, 2), workers=1)
+    assert isinstance(result, tcp.CopySummary)
+
+
+def test_copy_files_sync_returns_expected_result(tmp_path):
+    jobs = make_jobs(tmp_path, 4)
+    tcp.copy_files(jobs[:2], workers=1)
+    (tmp_path / "target_1.py").write_text("y")
+    result = tcp.copy_files(jobs, workers=2, sync=True)
+    assert (result.files, result.skipped) == (3, 1)
+    assert tcp.copy_files(jobs, sync=True) == tcp.CopySummary(0, 0, [], 4, {})
+
+
+def test_merge_summaries_returns_expected_result():
+    result = tcp.merge_summaries(
+        tcp.CopySummary(1, 2, [], 3), tcp.CopySummary(4, 5, [("a", "b")])
+    )
+    assert result == tcp.CopySummary(5, 7, [("a", "b")], 3, {})
+
+
+def test_merge_summaries_returns_expected_data_type():
+    assert isinstance(tcp.merge_summaries(), tcp.CopySummary)
+
+
+def test_is_unchanged_returns_expected_result(tmp_path):
+    (tmp_path / "a.py").write_text("print('a')")
+    (tmp_path / "b.py").write_text("print('a')")
+    (tmp_path / "c.py").write_text("print('c')")
+    assert tcp.is_unchanged(str(tmp_path / "a.py"), str(tmp_path / "b.py"))
+    assert not tcp.is_unchanged(
+        str(tmp_path / "a.py"), str(tmp_path / "c.py")
+    )
+
+
+def test_is_unchanged_returns_expected_data_type(tmp_path):
+    (tmp_path / "a.py").write_text("print('a')")
+    result = tcp.is_unchanged(str(tmp_path / "a.py"), str(tmp_path / "b.py"))
+    assert isinstance(result, bool)
+
+
+def test_copy_file_returns_expected_result(tmp_path):
+    source = tmp_path / "source.py"
+    source.write_text("print('ahoj')\n" * 100)
+    for strategies in (
+            tcp.DEFAULT_STRATEGIES, ["sendfile"], ["copy"], ["hardlink"]
+    ):
+        target = tmp_path / f"{strategies[0]}.py"
+        target.write_text("old content that is longer than the source" * 99)
+        result = tcp.copy_file(str(source), str(target), strategies)
+        assert result in strategies
+        assert target.read_text() == source.read_text()
+
+
+def test_copy_file_returns_expected_data_type(tmp_path):
+    (tmp_path / "source.py").write_text("print('ahoj')")
+    result = tcp.copy_file(
+        str(tmp_path / "source.py"), str(tmp_path / "target.py")
+    )
+    assert isinstance(result, str)
+
+
+def test_copy_file_after_hardlink_keeps_the_source(tmp_path):
+    source = tmp_path / "source.py"
+    target = tmp_path / "target.py"
+    source.write_text("print('ahoj')\n")
+    tcp.copy_files(
+        [tcp.CopyJob(str(source), str(target), "task", "L01")],
+        strategies=tcp.LINK_STRATEGIES
+    )
+    assert source.stat().st_ino == target.stat().st_ino
+    result = tcp.copy_files(
+        [tcp.CopyJob(str(source), str(target), "task", "L01")]
+    )
+    assert (result.files, result.bytes) == (1, 14)
+    assert source.read_text() == target.read_text() == "print('ahoj')\n"
+    assert source.stat().st_ino != target.stat().st_ino
+
+
+@pytest.mark.parametrize("strategy", ["copy_file_range", "sendfile"])
+def test_copy_strategy_raises_for_short_copy(tmp_path, strategy: str):
+    (tmp_path / "source.py").write_text("print('ahoj')")
+    with open(tmp_path / "source.py", "rb") as src, \
+            open(tmp_path / "target.py", "wb") as dst:
+        with pytest.raises(OSError):
+            tcp.STRATEGIES[strategy](src.fileno(), dst.fileno(), 100)
+
+
+def test_copy_file_falls_back_to_the_next_strategy(tmp_path, monkeypatch):
+    def unsupported(src, dst, size):
+        raise OSError(errno.EOPNOTSUPP, "Not supported")
+
+    monkeypatch.setitem(tcp.STRATEGIES, "reflink", unsupported)
+    (tmp_path / "source.py").write_text("print('ahoj')")
+    result = tcp.copy_file(
+        str(tmp_path / "source.py"), str(tmp_path / "target.py"),
+        ["reflink", "copy"]
+    )
+    assert result == "copy"
+    assert (tmp_path / "target.py").read_text() == "print('ahoj')"
+
+
+def test_copy_files_reports_strategies(tmp_path):
+    result = tcp.copy_files(make_jobs(tmp_path, 3), strategies=["copy"])
+    assert result.strategies == {"copy": 3}
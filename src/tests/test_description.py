@@ -2,6 +2,8 @@ import pytest
 import xml.etree.ElementTree as te
 
 import task_manager.description as td
+from task_manager.fsindex import take_snapshot
+from task_manager.processor import task_desc_processor
 
 
 exerc_1 = (
@@ -67,3 +69,117 @@ def test_if_write_description_returns_expected_data_type():
     exercise = [exe for exe in root.iter("exercise")]
     result = td.write_description('test text', exercise[0], 'perex')
     assert isinstance(result, str)
+
+
+def test_if_describe_exercise_removes_solution():
+    tree = te.parse("src/tests/exercise.xml")
+    root = tree.getroot()
+    exercise = [exe for exe in root.iter("exercise")]
+    td.describe_exercise(exercise[0], '../engeto_tasks')
+    assert exercise[0].find('solution').text == ''
+
+
+task_data = ('palindrom', {'folder': 'exercises', 'lesson': 'L02'})
+
+
+def test_process_description_with_manifest_returns_expected_result(tmp_path):
+    readme = tmp_path / "tasks" / "lesson02" / "palindrom" / "README.md"
+    readme.parent.mkdir(parents=True)
+    readme.write_text("# Palindrom\n---\ntext\n---\n")
+    manifest = {}
+    stats = {"hits": 0, "misses": 0}
+    for _ in range(2):
+        assert td.process_description(
+            task_data, str(tmp_path), manifest, stats
+        ) == 'text'
+    assert stats == {"hits": 1, "misses": 1}
+
+
+def test_prefetch_descriptions_returns_expected_result(tmp_path):
+    readme = tmp_path / "tasks" / "lesson02" / "palindrom" / "README.md"
+    readme.parent.mkdir(parents=True)
+    readme.write_text("# Palindrom\n---\ntext\n---\n")
+    result = td.prefetch_descriptions(
+        [task_data, ('unknown', {'lesson': 'L02'}), task_data], str(tmp_path)
+    )
+    assert [content.lines for content in result] == [
+        ['---\n', 'text\n', '---\n'], [], ['---\n', 'text\n', '---\n']
+    ]
+
+
+def test_prefetch_descriptions_with_snapshot_returns_expected_result(
+        tmp_path
+):
+    readme = tmp_path / "tasks" / "lesson02" / "palindrom" / "README.md"
+    readme.parent.mkdir(parents=True)
+    snapshot = take_snapshot(str(tmp_path / "tasks"))
+    readme.write_text("# Palindrom\n---\ntext\n---\n")
+    result = td.prefetch_descriptions(
+        [task_data], str(tmp_path), workers=1, snapshot=snapshot
+    )
+    assert result[0].lines == []
+
+
+def test_if_prefetch_descriptions_returns_expected_data_type(tmp_path):
+    result = td.prefetch_descriptions([task_data], str(tmp_path))
+    assert isinstance(result[0], td.ReadmeContent)
+
+
+def test_if_process_content_returns_expected_data_type():
+    result = td.process_content([])
+    assert isinstance(result, str)
+
+
+@pytest.mark.parametrize("content", [
+    "# Palindrom\n---\n```\ntext\n```\n---\nfooter\n",
+    "# Palindrom\r\n---\r\ntext\r\n---\r\n",
+    "---\nřádek\n---",
+    ""
+])
+def test_map_description_returns_expected_result(tmp_path, content: str):
+    readme = tmp_path / "tasks" / "lesson02" / "palindrom" / "README.md"
+    readme.parent.mkdir(parents=True)
+    readme.write_bytes(content.encode())
+    assert td.process_content(
+        td.map_description(str(tmp_path), "palindrom", "lesson02")
+    ) == td.process_content(
+        td.read_description(str(tmp_path), "palindrom", "lesson02")
+    )
+
+
+def test_if_map_description_returns_expected_data_type(tmp_path):
+    result = td.map_description(str(tmp_path), "palindrom", "lesson02")
+    assert isinstance(result, list)
+
+
+def test_task_desc_processor_stream_returns_same_result(tmp_path):
+    exercise = (
+        '<exercise name="{0}"><solution sourceDir="exercises/{0}/palindrom/'
+        'solution">print("{0}")</solution></exercise>'
+    )
+    (tmp_path / "course").mkdir()
+    (tmp_path / "course" / "course_course.xml").write_text(
+        "<course>" + "".join(
+            f'<lesson name="{code}">{exercise.format(code)}</lesson>'
+            for code in ("L01", "L02", "L03")
+        ) + "</course>"
+    )
+    for stream in (False, True):
+        task_desc_processor(
+            str(tmp_path / "course"), str(tmp_path), stream=stream,
+            output=str(tmp_path / f"output_{stream}.xml")
+        )
+    result = (tmp_path / "output_False.xml").read_text()
+    assert result == (tmp_path / "output_True.xml").read_text()
+    assert "print" not in result
+
+
+def test_map_description_returns_same_text_as_read_description(tmp_path):
+    readme = tmp_path / "tasks" / "lesson01" / "ukol" / "README.md"
+    readme.parent.mkdir(parents=True)
+    readme.write_bytes("# Úkol\n---\nřádek ž\n---\nkonec\n".encode("utf-8"))
+    assert td.process_content(
+        td.read_description(str(tmp_path), "ukol", "lesson01")
+    ) == td.process_content(
+        td.map_description(str(tmp_path), "ukol", "lesson01")
+    ) == "řádek ž"
@@ -0,0 +1,13 @@
+import hashlib
+import task_manager.digest as tg
+
+
+def test_get_digest_returns_expected_result(tmp_path):
+    (tmp_path / "a.py").write_bytes(b"print('a')")
+    assert tg.get_digest(str(tmp_path / "a.py")) == \
+        hashlib.sha256(b"print('a')").hexdigest()
+
+
+def test_if_get_digest_returns_expected_data_type(tmp_path):
+    (tmp_path / "a.py").write_bytes(b"")
+    assert isinstance(tg.get_digest(str(tmp_path / "a.py")), str)
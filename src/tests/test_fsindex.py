@@ -0,0 +1,58 @@
+import os
+import task_manager.fsindex as tf
+
+
+def test_take_snapshot_returns_expected_result(tmp_path, make_files):
+    make_files("L01/a/solution/main.py", "L01/b/tests.py")
+    result = tf.take_snapshot(str(tmp_path / "L01"), str(tmp_path / "none"))
+    assert sorted(result.directories) == [
+        str(tmp_path / "L01"), str(tmp_path / "L01" / "a"),
+        str(tmp_path / "L01" / "a" / "solution"), str(tmp_path / "L01" / "b")
+    ]
+
+
+def test_take_snapshot_returns_expected_data_type(tmp_path):
+    assert isinstance(tf.take_snapshot(str(tmp_path)), tf.Snapshot)
+
+
+def test_listdir_returns_expected_result(tmp_path, make_files):
+    make_files("L01/a/main.py", "L01/b/main.py")
+    snapshot = tf.take_snapshot(str(tmp_path / "L01"))
+    (tmp_path / "L01" / "c").mkdir()
+    assert sorted(tf.listdir(snapshot, str(tmp_path / "L01"))) == ["a", "b"]
+    assert sorted(tf.listdir(None, str(tmp_path / "L01"))) == ["a", "b", "c"]
+
+
+def test_listdir_returns_expected_data_type(tmp_path):
+    snapshot = tf.take_snapshot(str(tmp_path))
+    assert isinstance(tf.listdir(snapshot, str(tmp_path)), list)
+
+
+def test_exists_returns_expected_result(tmp_path, make_files):
+    make_files("L01/a/solution/main.py", "L01/b/main.py")
+    snapshot = tf.take_snapshot(str(tmp_path / "L01"), depth=1)
+    assert tf.exists(snapshot, str(tmp_path / "L01" / "a"))
+    assert tf.exists(snapshot, str(tmp_path / "L01" / "a" / "solution"))
+    assert not tf.exists(snapshot, str(tmp_path / "L01" / "c" / "main.py"))
+    assert not tf.exists(
+        snapshot, str(tmp_path / "L01" / "b" / "main.py" / "x")
+    )
+    assert tf.exists(snapshot, str(tmp_path))
+
+
+def test_exists_returns_expected_data_type(tmp_path):
+    snapshot = tf.take_snapshot(str(tmp_path))
+    assert isinstance(tf.exists(snapshot, str(tmp_path / "a")), bool)
+
+
+def test_refresh_snapshot_returns_expected_result(tmp_path, make_files):
+    make_files("L01/a/main.py")
+    snapshot = tf.take_snapshot(str(tmp_path / "L01"))
+    make_files("L01/b/solution/main.py")
+    os.remove(tmp_path / "L01" / "a" / "main.py")
+    os.rmdir(tmp_path / "L01" / "a")
+    for name in "a", "b":
+        tf.refresh_snapshot(snapshot, str(tmp_path / "L01" / name))
+    assert tf.listdir(snapshot, str(tmp_path / "L01")) == ["b"]
+    assert tf.exists(snapshot, str(tmp_path / "L01/b/solution/main.py"))
+    assert not tf.exists(snapshot, str(tmp_path / "L01/a/main.py"))
@@ -0,0 +1,46 @@
+import xml.etree.ElementTree as te
+
+import task_manager.index as ti
+
+
+def test_build_index_returns_expected_result_len():
+    root = te.parse("src/tests/bar.xml").getroot()
+    assert len(ti.build_index(root).entries) == 2
+
+
+def test_if_build_index_returns_expected_data_type():
+    root = te.parse("src/tests/bar.xml").getroot()
+    assert isinstance(ti.build_index(root), ti.ExerciseIndex)
+
+
+def test_build_index_returns_expected_solutions():
+    root = te.parse("src/tests/bar.xml").getroot()
+    assert [
+        entry.element.get("name")
+        for entry in ti.build_index(root).solutions.values()
+    ] == ['Rozdělení stringu', 'Spojování stringů']
+
+
+def test_index_exercise_returns_expected_result():
+    root = te.parse("src/tests/exercise.xml").getroot()
+    entry = ti.index_exercise(root.find("exercise"))
+    assert entry.children["tests"].attrib["srcTests"] == \
+        'exercises/L01/unit_converter/tests.py'
+
+
+def test_get_exercises_returns_expected_result_len():
+    root = te.parse("src/tests/exercise.xml").getroot()
+    assert len(ti.get_exercises(ti.build_index(root))) == 1
+
+
+def test_get_solution_paths_returns_expected_result():
+    root = te.parse("src/tests/exercise.xml").getroot()
+    assert ti.get_solution_paths(
+        ti.build_index(root), "exercises/"
+    ) == ['exercises/L01/unit_converter/solution']
+
+
+def test_if_get_solution_paths_returns_expected_data_type():
+    root = te.parse("src/tests/exercise.xml").getroot()
+    result = ti.get_solution_paths(ti.build_index(root), "exercises/")
+    assert isinstance(result, list)
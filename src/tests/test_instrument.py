@@ -0,0 +1,105 @@
+import json
+import threading
+import task_manager.instrument as ti
+import task_manager.processor as tp
+
+
+def test_stage_returns_expected_result():
+    with ti.recording() as stages:
+        for _ in range(2):
+            with ti.stage("parse", 2) as current:
+                current.add()
+    assert (stages["parse"]["calls"], stages["parse"]["items"]) == (2, 6)
+
+
+def test_if_stage_returns_expected_data_type():
+    assert ti.stage("parse") is ti.NULL_STAGE
+
+
+def test_measured_returns_expected_result():
+    function = ti.measured("double")(lambda value: value * 2)
+    with ti.recording() as stages:
+        assert function(2) == 4
+    assert stages["double"]["calls"] == 1
+
+
+def test_recording_writes_report(tmp_path):
+    with ti.recording(str(tmp_path / "report.json")):
+        tp.task_attr_processor(
+            "src/tests/bar.xml", output=str(tmp_path / "output_attr.xml")
+        )
+    stages = json.loads((tmp_path / "report.json").read_text())["stages"]
+    assert {"task_attr_processor", "parse", "attributes.rewrite", "write"} \
+        <= set(stages)
+    assert stages["attributes.rewrite"]["items"] == 2
+
+
+def test_if_get_report_returns_expected_data_type():
+    assert isinstance(ti.get_report(), dict)
+
+
+def test_tracing_returns_expected_result(tmp_path):
+    with ti.tracing(str(tmp_path / "trace.json")):
+        with ti.stage("readme.read", task="palindrom", lesson="lesson02"):
+            pass
+    events = json.loads((tmp_path / "trace.json").read_text())["traceEvents"]
+    span = [event for event in events if event["ph"] == "X"][0]
+    assert (span["name"], span["args"]) == \
+        ("readme.read", {"task": "palindrom", "lesson": "lesson02"})
+
+
+def test_if_tracing_returns_expected_data_type(tmp_path):
+    with ti.tracing(str(tmp_path / "trace.json")) as events:
+        assert isinstance(events, list)
+
+
+def test_capture_returns_expected_result():
+    with ti.capture((True, True)) as events:
+        with ti.stage("copy", task="palindrom"):
+            pass
+    assert [event["name"] for event in events] == ["thread_name", "copy"]
+    assert ti.get_state() == (False, False)
+
+
+def test_profiling_returns_expected_result(tmp_path):
+    with ti.profiling(str(tmp_path / "report.json"), top=2, sites=("parse",)):
+        tp.task_attr_processor(
+            "src/tests/bar.xml", output=str(tmp_path / "output_attr.xml")
+        )
+    report = json.loads((tmp_path / "report.json").read_text())
+    assert report["stages"]["parse"]["peak"] > 0
+    assert len(report["sites"]["parse"]) <= 2
+    assert "parser.py" in report["sites"]["parse"][0]["site"]
+
+
+def test_if_profiling_returns_expected_data_type():
+    with ti.profiling() as stages:
+        with ti.stage("outer"):
+            with ti.stage("inner"):
+                data = [0] * 100000
+            del data
+    assert isinstance(stages["outer"]["peak"], int)
+    assert stages["outer"]["peak"] >= stages["inner"]["peak"] > 0
+
+
+def test_recording_keeps_threads_separate():
+    results = {}
+
+    def record(name):
+        with ti.recording() as stages:
+            for _ in range(50):
+                with ti.stage(name):
+                    pass
+        results[name] = stages
+
+    threads = [
+        threading.Thread(target=record, args=(name,))
+        for name in ("first", "second")
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert {name: list(stages) for name, stages in results.items()} == \
+        {"first": ["first"], "second": ["second"]}
+    assert results["first"]["first"]["calls"] == 50
@@ -0,0 +1,36 @@
+import json
+import task_manager.lessons as tl
+import task_manager.utils as tu
+
+
+def test_get_table_returns_expected_result():
+    assert tl.get_table().names[("L02", "palindrom")] == "palindrom"
+
+
+def test_if_get_table_returns_expected_data_type():
+    assert isinstance(tl.get_table(), tl.LessonTable)
+
+
+def test_if_get_table_reads_file_from_variable(tmp_path, monkeypatch):
+    mapping = tmp_path / "lessons.json"
+    mapping.write_text(json.dumps({
+        "format": 1,
+        "lessons": {"L13": "lesson13"},
+        "tasks": {"lesson13": {"files": "soubory"}}
+    }))
+    monkeypatch.setenv(tl.LESSONS_ENV, str(mapping))
+    assert tl.get_table().names == {("L13", "files"): "soubory"}
+
+
+def test_compile_table_returns_expected_result():
+    table = tl.compile_table({"L01": "lesson01"}, {"lesson01": {"a": "b"}})
+    assert table.names == {("L01", "a"): "b"}
+
+
+def test_if_compile_table_returns_expected_data_type():
+    assert isinstance(tl.compile_table({}, {}), tl.LessonTable)
+
+
+def test_utils_returns_expected_result():
+    assert (tu.lessons["L01"], tu.lesson01["slicing_string"]) == \
+        ("lesson01", "rozdeleni_stringu")
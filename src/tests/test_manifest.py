@@ -0,0 +1,80 @@
+import os
+
+import task_manager.manifest as tm
+from task_manager.text_processor import TEXT_VERSION
+
+
+def test_fetch_cached_returns_expected_result(tmp_path):
+    readme = tmp_path / "README.md"
+    readme.write_text("text\n")
+    entries = {}
+    text, lines, record = tm.fetch_cached(entries, "README.md", str(readme))
+    assert (text, lines) == (None, ['text\n'])
+    entries["README.md"] = dict(record, text="TEXT")
+    assert tm.fetch_cached(entries, "README.md", str(readme)) == \
+        ('TEXT', [], None)
+
+
+def test_if_fetch_cached_returns_expected_data_type(tmp_path):
+    readme = tmp_path / "README.md"
+    readme.write_text("text\n")
+    result = tm.fetch_cached({}, "README.md", str(readme))
+    assert isinstance(result, tuple)
+
+
+def test_if_fetch_cached_reuses_touched_file(tmp_path):
+    readme = tmp_path / "README.md"
+    readme.write_text("text\n")
+    entries = {}
+    record = tm.fetch_cached(entries, "README.md", str(readme))[2]
+    entries["README.md"] = dict(record, text="TEXT")
+    os.utime(readme, (1, 1))
+    assert tm.fetch_cached(entries, "README.md", str(readme))[0] == 'TEXT'
+
+
+def test_if_fetch_cached_reads_changed_file(tmp_path):
+    readme = tmp_path / "README.md"
+    readme.write_text("text\n")
+    entries = {}
+    record = tm.fetch_cached(entries, "README.md", str(readme))[2]
+    entries["README.md"] = dict(record, text="TEXT")
+    readme.write_text("other\n")
+    assert tm.fetch_cached(entries, "README.md", str(readme))[:2] == \
+        (None, ['other\n'])
+
+
+def test_save_manifest_returns_expected_result(tmp_path):
+    entries = {"README.md": {"text": "Převaděč"}}
+    tm.save_manifest(str(tmp_path / "manifest.json"), entries)
+    assert tm.load_manifest(str(tmp_path / "manifest.json")) == entries
+
+
+def test_load_manifest_returns_empty_for_missing_file(tmp_path):
+    assert tm.load_manifest(str(tmp_path / "manifest.json")) == {}
+
+
+def test_decode_lines_returns_expected_result():
+    assert tm.decode_lines(b"first\r\nsecond") == ['first\n', 'second']
+
+
+def test_using_manifest_returns_expected_result(tmp_path):
+    (tmp_path / "README.md").write_text("text\n")
+    manifest = str(tmp_path / "manifest.json")
+    tm.save_manifest(manifest, {"README.md": {}, "removed/README.md": {}})
+    with tm.using_manifest(manifest, str(tmp_path)) as (entries, stats):
+        assert set(entries) == {"README.md", "removed/README.md"}
+        stats["hits"] += 1
+    assert tm.load_manifest(manifest) == {"README.md": {}}
+
+
+def test_if_using_manifest_returns_expected_data_type(tmp_path):
+    with tm.using_manifest(None, str(tmp_path)) as (entries, stats):
+        assert entries is None
+        assert isinstance(stats, dict)
+
+
+def test_load_manifest_drops_other_text_version(tmp_path, monkeypatch):
+    manifest = str(tmp_path / "manifest.json")
+    tm.save_manifest(manifest, {"README.md": {"text": "old"}})
+    monkeypatch.setattr(tm, "TEXT_VERSION", TEXT_VERSION + 1)
+    assert tm.load_manifest(manifest) == {}
@@ -1,5 +1,8 @@
+import pytest
+import shutil
 import xml.etree.ElementTree as te
 import task_manager.parser as tp
+from task_manager.processor import task_attr_processor, task_desc_processor
 
 
 def test_if_get_xml_root_returns_expected_data_type():
@@ -14,3 +17,47 @@ def test_if_set_xml_attr_returns_expected_result():
 
 def test_if_set_xml_attr_expected_data_type():
     assert isinstance(tp.set_xml_attr(name="Destinatio 1", lesson='L01'), dict)
+
+
+def test_iter_xml_elements_returns_expected_result_len():
+    assert len(
+        [element for element in tp.iter_xml_elements(
+            "src/tests/bar.xml", "exercise"
+        )]
+    ) == 2
+
+
+def test_if_iter_xml_elements_clears_processed_elements():
+    elements = [
+        element
+        for element in tp.iter_xml_elements("src/tests/bar.xml", "exercise")
+    ]
+    assert len(elements[0]) == 0
+
+
+def test_get_backend_returns_expected_result():
+    assert tp.get_backend("stdlib") is te
+    assert tp.get_backend() is te
+
+
+def test_if_get_backend_raises_for_unknown_backend():
+    with pytest.raises(ValueError):
+        tp.get_backend("unknown")
+
+
+@pytest.mark.skipif(not tp.LXML_AVAILABLE, reason="lxml is not installed")
+def test_processors_write_same_output_on_both_backends(tmp_path):
+    (tmp_path / "course").mkdir()
+    shutil.copy("src/tests/bar.xml", tmp_path / "course" / "course_course.xml")
+    for backend in ("stdlib", "lxml"):
+        task_desc_processor(
+            str(tmp_path / "course"), str(tmp_path), backend=backend,
+            output=str(tmp_path / f"desc_{backend}.xml")
+        )
+        task_attr_processor(
+            "src/tests/bar.xml", backend=backend,
+            output=str(tmp_path / f"attr_{backend}.xml")
+        )
+    for name in ("desc", "attr"):
+        assert (tmp_path / f"{name}_lxml.xml").read_bytes() == \
+            (tmp_path / f"{name}_stdlib.xml").read_bytes()
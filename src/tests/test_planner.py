@@ -0,0 +1,136 @@
+import os
+import pytest
+import task_manager.planner as tpl
+
+
+@pytest.fixture
+def paths(tmp_path, make_files, set_lessons):
+    make_files(
+        "repo/exercises/L01/stary/solution/main.py",
+        "repo/exercises/L01/stary/tests.py",
+        "repo/exercises/L01/novy/skeleton/main.py",
+        "repo/exercises/L01/smazany/tests.py",
+        "repo/exercises/L02/jiny/tests.py",
+        "package/palindrom/palindrom.py", "package/palindrom/test_palindrom.py",
+        "package/novy/test_novy.py", "package/pridany/pridany.py",
+        "package/__init__.py"
+    )
+    set_lessons({"L01": "lesson01"}, {"lesson01": {"stary": "palindrom"}})
+    return str(tmp_path / "repo"), str(tmp_path / "package")
+
+
+def list_tree(root):
+    return sorted(
+        (os.path.relpath(os.path.join(folder, name), root),
+         open(os.path.join(folder, name)).read())
+        for folder, _, files in os.walk(root) for name in files
+    )
+
+
+def test_plan_lesson_returns_expected_result(tmp_path, paths):
+    repo, package = paths
+    result = tpl.plan_lesson(repo, "lesson01", package, str(tmp_path))
+    lesson = os.path.join(repo, "exercises", "L01")
+    assert [
+        (operation.kind, os.path.relpath(operation.target, lesson))
+        for operation in result if operation.kind != "remove"
+    ] == [
+        ("rename", "palindrom"), ("mkdir", "pridany"),
+        ("mkdir", "pridany/skeleton"), ("mkdir", "pridany/solution"),
+        ("copy", "palindrom/solution/main.py"),
+        ("touch", "pridany/skeleton/main.py"),
+        ("copy", "pridany/solution/main.py"), ("copy", "novy/tests.py"),
+        ("copy", "palindrom/tests.py")
+    ]
+    assert sorted(
+        os.path.basename(operation.source)
+        for operation in result if operation.kind == "remove"
+    ) == ["L02", "smazany"]
+
+
+def test_plan_lesson_returns_expected_data_type(tmp_path, paths):
+    repo, package = paths
+    result = tpl.plan_lesson(repo, "lesson01", package, str(tmp_path))
+    assert all(isinstance(operation, tpl.Operation) for operation in result)
+
+
+def test_run_journaled_returns_expected_result(tmp_path, paths):
+    repo, package = paths
+    journal = str(tmp_path / "plan.journal")
+    result = tpl.run_journaled(repo, "lesson01", package, journal)
+    assert (result.applied, result.resumed, result.errors) == (11, 0, [])
+    assert list_tree(repo) == [
+        ("exercises/L01/novy/skeleton/main.py",
+         "repo/exercises/L01/novy/skeleton/main.py"),
+        ("exercises/L01/novy/tests.py", "package/novy/test_novy.py"),
+        ("exercises/L01/palindrom/solution/main.py",
+         "package/palindrom/palindrom.py"),
+        ("exercises/L01/palindrom/tests.py",
+         "package/palindrom/test_palindrom.py"),
+        ("exercises/L01/pridany/skeleton/main.py", ""),
+        ("exercises/L01/pridany/solution/main.py",
+         "package/pridany/pridany.py")
+    ]
+    assert not os.path.exists(journal)
+    assert os.listdir(repo) == ["exercises"]
+
+
+def test_run_journaled_returns_expected_data_type(tmp_path, paths):
+    repo, package = paths
+    result = tpl.run_journaled(
+        repo, "lesson01", package, str(tmp_path / "plan.journal")
+    )
+    assert isinstance(result, tpl.PlanSummary)
+
+
+def interrupt(monkeypatch):
+    apply_operation = tpl.apply_operation
+
+    def failing(operation, strategies):
+        if operation.target.endswith("tests.py"):
+            raise PermissionError("Interrupted")
+        apply_operation(operation, strategies)
+
+    monkeypatch.setattr(tpl, "apply_operation", failing)
+
+
+def test_run_plan_can_be_resumed(tmp_path, monkeypatch, paths):
+    repo, package = paths
+    journal = str(tmp_path / "plan.journal")
+    apply_operation = tpl.apply_operation
+    interrupt(monkeypatch)
+    failed = tpl.run_journaled(repo, "lesson01", package, journal)
+    assert (failed.applied, len(failed.errors)) == (9, 2)
+    monkeypatch.setattr(tpl, "apply_operation", apply_operation)
+    result = tpl.run_journaled(repo, "lesson01", package, journal)
+    assert (result.applied, result.resumed, result.errors) == (2, 9, [])
+    assert (
+        tmp_path / "repo" / "exercises" / "L01" / "palindrom" / "tests.py"
+    ).read_text() == "package/palindrom/test_palindrom.py"
+
+
+def test_rollback_plan_returns_expected_result(tmp_path, monkeypatch, paths):
+    repo, package = paths
+    journal = str(tmp_path / "plan.journal")
+    before = list_tree(repo)
+    interrupt(monkeypatch)
+    tpl.run_journaled(repo, "lesson01", package, journal)
+    tpl.rollback_plan(tpl.load_journal(journal))
+    assert list_tree(repo) == before
+    assert not os.path.exists(journal)
+    assert os.listdir(repo) == ["exercises"]
+
+
+def test_run_journaled_keeps_the_stash_of_another_plan(
+        tmp_path, monkeypatch, paths
+):
+    repo, package = paths
+    journal = str(tmp_path / "plan.journal")
+    before = list_tree(repo)
+    interrupt(monkeypatch)
+    tpl.run_journaled(repo, "lesson01", package, journal)
+    with pytest.raises(FileExistsError):
+        tpl.run_journaled(repo, "lesson01", package, str(tmp_path / "other"))
+    assert not os.path.exists(tmp_path / "other")
+    tpl.rollback_plan(tpl.load_journal(journal))
+    assert list_tree(repo) == before
@@ -0,0 +1,44 @@
+import os
+import pytest
+
+import task_manager.processor as tp
+
+
+@pytest.fixture
+def lessons(make_files, set_lessons):
+    make_files(
+        "repo/exercises/L01/stary/solution/main.py",
+        "repo/exercises/L02/palindrom/solution/main.py",
+        "repo/exercises/L09/jiny/tests.py",
+        "tasks/lesson01/palindrom/palindrom.py",
+        "tasks/lesson02/palindrom/palindrom.py",
+        "tasks/lesson02/palindrom/test_palindrom.py"
+    )
+    set_lessons(
+        {"L01": "lesson01", "L02": "lesson02"},
+        {"lesson01": {"stary": "palindrom"}, "lesson02": {}}
+    )
+
+
+def test_lessons_processor_returns_expected_result(tmp_path, lessons):
+    results = tp.lessons_processor(
+        str(tmp_path / "repo"), str(tmp_path / "tasks"), 2
+    )
+    assert [
+        (result.lesson, result.error, result.content.files, result.tests.files)
+        for result in results
+    ] == [("lesson01", None, 1, 0), ("lesson02", None, 1, 1)]
+    assert sorted(os.listdir(tmp_path / "repo" / "exercises")) == \
+        ["L01", "L02", "L09"]
+    assert (
+        tmp_path / "repo/exercises/L01/palindrom/solution/main.py"
+    ).read_text() == "tasks/lesson01/palindrom/palindrom.py"
+
+
+def test_if_lessons_processor_returns_expected_data_type(
+        tmp_path, lessons
+):
+    results = tp.lessons_processor(
+        str(tmp_path / "repo"), str(tmp_path / "tasks"), background=True
+    )
+    assert isinstance(results[0], tp.LessonResult)
@@ -1,3 +1,6 @@
+import io
+import random
+import pytest
 import task_manager.text_processor as ttp
 
 
@@ -60,3 +63,64 @@ def test_if_replace_empty_strs_returns_expected_result():
 def test_if_replace_empty_strs_expected_data_type():
     result = ttp.replace_empty_strs(["", ""])
     assert isinstance(result, list)
+
+
+texts = {
+    f"task_{number}": [
+        "# Title\n", "---\n", "```\n", f"line {number}\n", "```\n", "\n",
+        "---\n", "footer\n"
+    ]
+    for number in range(20)
+}
+
+
+def test_process_texts_returns_expected_result():
+    assert ttp.process_texts(texts, processes=2, chunksize=3) == {
+        name: ttp.process_text(list(text)) for name, text in texts.items()
+    }
+
+
+def test_if_process_texts_returns_expected_data_type():
+    result = ttp.process_texts(texts, processes=1)
+    assert isinstance(result, dict)
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_extract_description_returns_expected_result(seed: int):
+    generator = random.Random(seed)
+    lines = [
+        generator.choice(["---\n", "```\n", "\n", " \n", "a\n", "---", "b"])
+        for _ in range(generator.randrange(1, 30))
+    ] + ["---\n"]
+    assert ttp.extract_description(iter(lines)) == \
+        ttp.join_text(ttp.replace_empty_strs(ttp.remove_backticks(
+            ttp.clean_newlines(lines[slice(*ttp.modify_indexes(
+                ttp.select_boundaries(lines, "---\n")
+            ))]), 2
+        )))
+
+
+def test_if_extract_description_returns_expected_data_type(tmp_path):
+    (tmp_path / "README.md").write_text("# Title\n---\ntext\n---\n")
+    with open(tmp_path / "README.md") as source:
+        assert isinstance(ttp.extract_description(source), str)
+
+
+def test_if_extract_description_raises_without_delimiter():
+    with pytest.raises(IndexError):
+        ttp.extract_description(["text\n"])
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_slice_section_returns_expected_result(seed: int):
+    generator = random.Random(seed)
+    raw = "".join(
+        generator.choice(["---\n", "```\n", "\n", "ř\n", "---", "b"])
+        for _ in range(generator.randrange(1, 30))
+    ) + "\n---\n"
+    assert ttp.process_text(ttp.slice_section(raw.encode())) == \
+        ttp.process_text(io.StringIO(raw).readlines())
+
+
+def test_if_slice_section_returns_expected_data_type():
+    assert isinstance(ttp.slice_section(b"a\n---\nb\n---\n"), list)
@@ -0,0 +1,64 @@
+import os
+import task_manager.trash as tt
+
+
+def test_open_trash_returns_expected_result(tmp_path):
+    (tmp_path / f"{tt.TRASH_PREFIX}old" / "L01").mkdir(parents=True)
+    os.utime(tmp_path / f"{tt.TRASH_PREFIX}old", (1, 1))
+    trash = tt.open_trash(str(tmp_path))
+    status = tt.close_trash(trash)
+    assert (status.purged, status.pending) == (1, 0)
+    assert os.listdir(tmp_path) == []
+
+
+def test_open_trash_keeps_trash_of_running_process(tmp_path):
+    running = tt.open_trash(str(tmp_path))
+    (tmp_path / "L01").mkdir()
+    tt.discard(running, str(tmp_path / "L01"))
+    running.pool.shutdown()
+    (tmp_path / f"{tt.TRASH_PREFIX}new").mkdir()
+    trash = tt.open_trash(str(tmp_path))
+    assert tt.close_trash(trash) == tt.PurgeStatus(0, 0, [])
+    assert tt.close_trash(running) == tt.PurgeStatus(1, 0, [])
+    assert os.listdir(tmp_path) == [f"{tt.TRASH_PREFIX}new"]
+
+
+def test_open_trash_purges_unlocked_trash(tmp_path):
+    interrupted = tt.open_trash(str(tmp_path))
+    interrupted.pool.shutdown()
+    interrupted.lock.close()
+    trash = tt.open_trash(str(tmp_path))
+    assert tt.close_trash(trash) == tt.PurgeStatus(1, 0, [])
+    assert os.listdir(tmp_path) == []
+
+
+def test_open_trash_returns_expected_data_type(tmp_path):
+    trash = tt.open_trash(str(tmp_path))
+    tt.close_trash(trash)
+    assert isinstance(trash, tt.Trash)
+
+
+def test_discard_returns_expected_result(tmp_path):
+    for lesson in "L01", "L02":
+        (tmp_path / "exercises" / lesson / "task").mkdir(parents=True)
+    trash = tt.open_trash(str(tmp_path))
+    tt.discard(trash, str(tmp_path / "exercises" / "L01"))
+    assert os.listdir(tmp_path / "exercises") == ["L02"]
+    assert tt.close_trash(trash) == tt.PurgeStatus(1, 0, [])
+    assert os.listdir(tmp_path) == ["exercises"]
+
+
+def test_get_status_returns_expected_result(tmp_path):
+    trash = tt.open_trash(str(tmp_path))
+    trash.futures.append(
+        (str(tmp_path / "missing"), trash.pool.submit(tt.purge, "missing"))
+    )
+    trash.pool.shutdown()
+    status = tt.get_status(trash)
+    assert (status.purged, status.pending) == (0, 0)
+    assert status.errors[0][1].startswith("FileNotFoundError")
+
+
+def test_get_status_returns_expected_data_type(tmp_path):
+    trash = tt.open_trash(str(tmp_path))
+    assert isinstance(tt.close_trash(trash), tt.PurgeStatus)
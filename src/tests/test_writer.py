@@ -0,0 +1,73 @@
+import io
+import os
+import pytest
+import xml.etree.ElementTree as te
+import task_manager.writer as tw
+from task_manager.parser import LXML_AVAILABLE, get_xml_root
+
+
+def test_stream_xml_returns_expected_result(tmp_path):
+    tree = te.parse("src/tests/bar.xml")
+    tree.write(tmp_path / "expected.xml", encoding="utf-8")
+    tw.stream_xml(
+        "src/tests/bar.xml", "exercise", lambda exercise: None,
+        tmp_path / "output.xml"
+    )
+    assert (tmp_path / "output.xml").read_bytes() == \
+        (tmp_path / "expected.xml").read_bytes()
+
+
+def test_if_stream_xml_returns_expected_data_type(tmp_path):
+    result = tw.stream_xml(
+        "src/tests/exercise.xml", "exercise", lambda exercise: None,
+        tmp_path / "output.xml"
+    )
+    assert isinstance(result, int)
+
+
+def test_stream_xml_writes_into_binary_buffer(tmp_path):
+    te.parse("src/tests/bar.xml").write(
+        tmp_path / "expected.xml", encoding="utf-8"
+    )
+    buffer = io.BytesIO()
+    tw.stream_xml(
+        "src/tests/bar.xml", "exercise", lambda exercise: None, buffer
+    )
+    assert buffer.getvalue() == (tmp_path / "expected.xml").read_bytes()
+
+
+@pytest.mark.parametrize(
+    "backend", ["stdlib"] + (["lxml"] if LXML_AVAILABLE else [])
+)
+def test_write_tree_returns_expected_result(tmp_path, backend: str):
+    te.parse("src/tests/bar.xml").write(
+        tmp_path / "expected.xml", encoding="utf-8"
+    )
+    tw.write_tree(
+        get_xml_root("src/tests/bar.xml", backend), tmp_path / "output.xml"
+    )
+    assert (tmp_path / "output.xml").read_bytes() == \
+        (tmp_path / "expected.xml").read_bytes()
+
+
+def test_write_tree_writes_into_file_descriptor(tmp_path):
+    handle = os.open(tmp_path / "output.xml", os.O_WRONLY | os.O_CREAT)
+    try:
+        tw.write_tree(te.ElementTree(te.fromstring("<a>ř</a>")), handle)
+    finally:
+        os.close(handle)
+    assert (tmp_path / "output.xml").read_bytes() == "<a>ř</a>".encode()
+
+
+def test_write_tree_keeps_sinks_separate():
+    first, second = io.BytesIO(), io.StringIO()
+    tw.write_tree(te.ElementTree(te.fromstring("<a />")), first)
+    tw.write_tree(te.ElementTree(te.fromstring("<b />")), second)
+    assert (first.getvalue(), second.getvalue()) == (b"<a />", "<b />")
+
+
+def test_if_open_sink_leaves_file_object_open():
+    buffer = io.BytesIO()
+    with tw.open_sink(buffer) as out:
+        out.write("<a />")
+    assert not buffer.closed